@@ -0,0 +1,79 @@
+"""
+Benchmark cold import time of the project's entry modules.
+
+Each module is imported in a fresh interpreter several times and the
+median wall time is reported, together with any heavy optional
+dependencies the import pulled in. Exits with status 1 if a module is
+slower than --budget seconds or loads a heavy dependency, so it can guard
+against regressions in CI.
+
+Usage:
+    python benchmarks/bench_import_time.py --repeat 5 --budget 2.0
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+MODULES = ['nodes', 'llm', 'workflows.basic', 'workflows.web_search_workflow', 'main']
+
+# Dependencies that must only be imported when the tool or client using them runs
+HEAVY_MODULES = [
+    'e2b',
+    'tavily',
+    'langchain_community',
+    'langchain_openai',
+    'langchain_google_genai',
+    'unstructured',
+    'pandas',
+    'pypdf',
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+def measure(module: str, repeat: int) -> dict:
+    """Median import time of a module over fresh interpreters."""
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        'seconds': statistics.median(run['seconds'] for run in runs),
+        'heavy': sorted({name for run in runs for name in run['heavy']})
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument('--budget', type=float, default=None, help="Maximum median import time in seconds")
+    parser.add_argument('modules', nargs='*', default=MODULES, help="Modules to import")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':<34} {'median':>8}  heavy dependencies")
+    for module in args.modules:
+        result = measure(module, args.repeat)
+        over_budget = args.budget is not None and result['seconds'] > args.budget
+        failed = failed or over_budget or bool(result['heavy'])
+        flag = "  OVER BUDGET" if over_budget else ""
+        print(f"{module:<34} {result['seconds']:>7.3f}s  {', '.join(result['heavy']) or '-'}{flag}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark the columnar CSV/Excel fast path against the LangChain loaders.
+
+Generates a CSV and an Excel file, then times loading them with
+FileLoaderTool's default loaders and with each fast path mode.
+
+Usage:
+    python benchmarks/bench_tabular_loader.py --rows 200000 --excel-rows 20000 --memory
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from nodes.file_loader_tool import FileLoaderTool
+
+def generate_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'id': np.arange(rows),
+        'region': rng.choice(['EU', 'US', 'APAC', 'LATAM'], rows),
+        'product': rng.choice([f"product-{i}" for i in range(200)], rows),
+        'price': rng.gamma(2.0, 20.0, rows).round(2),
+        'quantity': rng.integers(1, 100, rows),
+        'note': rng.choice(['', 'priority', 'backorder', 'returned'], rows)
+    })
+
+def measure(label: str, load, memory: bool) -> None:
+    start = time.perf_counter()
+    try:
+        documents = sum(1 for _ in load())
+        status = f"{documents} documents"
+    except Exception as e:
+        status = f"failed: {type(e).__name__}: {e}"
+    elapsed = time.perf_counter() - start
+
+    peak = ""
+    if memory and not status.startswith("failed"):
+        # Separate pass: tracing slows pure-Python loaders down a lot
+        tracemalloc.start()
+        sum(1 for _ in load())
+        peak = f"{tracemalloc.get_traced_memory()[1] / 2**20:.1f} MiB"
+        tracemalloc.stop()
+    print(f"{label:<36} {elapsed:>8.2f}s {peak:>12}  {status}")
+
+def run(path: Path, tool: FileLoaderTool, legacy: bool, memory: bool) -> None:
+    print(f"\n{path.name} ({path.stat().st_size / 2**20:.1f} MiB)")
+    print(f"{'loader':<36} {'time':>9} {'peak mem':>12}")
+    if legacy:
+        measure("langchain loader", lambda: tool._load_documents(str(path)), memory)
+    for mode in ('rows', 'summary', 'sample'):
+        measure(f"fast path ({mode})", lambda: tool._load_documents(str(path), mode=mode), memory)
+    measure(
+        "fast path (rows, projected+filter)",
+        lambda: tool._load_documents(
+            str(path), mode='rows', columns=['region', 'price'], row_filter="region == 'EU' and price > 50"
+        ),
+        memory
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200_000, help="Rows in the generated CSV file")
+    parser.add_argument('--excel-rows', type=int, default=20_000, help="Rows in the generated Excel file")
+    parser.add_argument('--skip-legacy', action='store_true', help="Only time the fast path")
+    parser.add_argument('--memory', action='store_true', help="Also measure peak traced memory")
+    args = parser.parse_args()
+
+    tool = FileLoaderTool()
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / 'bench.csv'
+        generate_frame(args.rows).to_csv(csv_path, index=False)
+        run(csv_path, tool, not args.skip_legacy, args.memory)
+
+        if args.excel_rows:
+            excel_path = Path(tmp) / 'bench.xlsx'
+            generate_frame(args.excel_rows, seed=1).to_excel(excel_path, index=False)
+            run(excel_path, tool, not args.skip_legacy, args.memory)
+
+if __name__ == "__main__":
+    main()
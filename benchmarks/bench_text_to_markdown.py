@@ -0,0 +1,109 @@
+"""
+Benchmark text to markdown conversion throughput.
+
+Generates plain text documents mixing paragraphs, headings, lists, tables,
+code blocks and links, then reports MB/s of the single-pass converter on
+the whole string, streaming from a file, and of the previous paragraph
+split implementation.
+
+Usage:
+    python benchmarks/bench_text_to_markdown.py --sizes 1 8 32 --repeat 3
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from nodes.markdown_converter import convert_to_markdown, iter_markdown
+
+WORDS = (
+    "model data training results latency throughput research network layer token "
+    "embedding retrieval evaluation baseline accuracy dataset benchmark memory cache"
+).split()
+
+def generate_text(size_bytes: int, seed: int = 0) -> str:
+    """Generate a plain text document of about size_bytes."""
+    rng = random.Random(seed)
+    sentence = lambda: " ".join(rng.choices(WORDS, k=rng.randint(6, 16))).capitalize() + "."
+    blocks = []
+    size = 0
+    section = 0
+    while size < size_bytes:
+        kind = rng.random()
+        if kind < 0.05:
+            section += 1
+            block = f"SECTION {section} {rng.choice(WORDS).upper()}"
+        elif kind < 0.1:
+            block = f"Subsection {section}.{rng.randint(1, 9)}\n" + "-" * 20
+        elif kind < 0.25:
+            block = "\n".join(f"• {sentence()}" for _ in range(rng.randint(2, 6)))
+        elif kind < 0.3:
+            block = "\n".join(f"{i}) {sentence()}" for i in range(1, rng.randint(3, 6)))
+        elif kind < 0.35:
+            rows = ["name\tvalue\tunit"] + [
+                f"{rng.choice(WORDS)}\t{rng.random():.4f}\tms" for _ in range(rng.randint(3, 12))
+            ]
+            block = "\n".join(rows)
+        elif kind < 0.38:
+            block = "```\n" + "\n".join(f"x_{i} = compute({i})" for i in range(rng.randint(2, 8))) + "\n```"
+        else:
+            lines = [sentence() for _ in range(rng.randint(2, 8))]
+            if rng.random() < 0.3:
+                lines.append(f"See https://example.com/{rng.choice(WORDS)}/{rng.randint(1, 10**6)} for details.")
+            block = "\n".join(lines)
+        blocks.append(block)
+        size += len(block) + 2
+    return "\n\n".join(blocks)
+
+def legacy_convert(text: str) -> str:
+    """The paragraph split implementation the converter replaced."""
+    paragraphs = text.split('\n\n')
+    markdown_paragraphs = []
+    for para in paragraphs:
+        if para.startswith('#'):
+            markdown_paragraphs.append(para)
+        elif para.startswith('- ') or para.startswith('* '):
+            markdown_paragraphs.append(para)
+        else:
+            markdown_paragraphs.append(para)
+    return '\n\n'.join(markdown_paragraphs)
+
+def measure(label: str, convert, size_mb: float, repeat: int) -> None:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        convert()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<28} {best:>8.3f}s {size_mb / best:>10.1f} MB/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1, 8, 32], help="Document sizes in MB")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per measurement, best is reported")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        text = generate_text(int(size * 2**20))
+        size_mb = len(text.encode('utf-8')) / 2**20
+        print(f"\n{size_mb:.1f} MB document")
+        print(f"{'converter':<28} {'time':>9} {'throughput':>15}")
+        measure("legacy (split only)", lambda: legacy_convert(text), size_mb, args.repeat)
+        measure("single pass (string)", lambda: convert_to_markdown(text), size_mb, args.repeat)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'document.txt'
+            path.write_text(text, encoding='utf-8')
+
+            def stream():
+                with open(path, encoding='utf-8') as f:
+                    for _ in iter_markdown(f):
+                        pass
+
+            measure("single pass (file stream)", stream, size_mb, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Generators for benchmark input files of a given size.
+"""
+import json
+import random
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks.pdf_support import write_pdf
+
+WORDS = (
+    "model data training results latency throughput research network layer token "
+    "embedding retrieval evaluation baseline accuracy dataset benchmark memory cache"
+).split()
+
+def sentences(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choices(WORDS, k=rng.randint(6, 16))).capitalize() + "."
+        for _ in range(count)
+    ]
+
+def _paragraphs(size_bytes: int) -> List[str]:
+    """Paragraphs of about 600 bytes adding up to size_bytes."""
+    lines = sentences(max(1, size_bytes // 90))
+    return [" ".join(lines[i:i + 6]) for i in range(0, len(lines), 6)]
+
+def write_text(path: Path, size_bytes: int) -> None:
+    path.write_text("\n\n".join(_paragraphs(size_bytes)), encoding='utf-8')
+
+def write_markdown(path: Path, size_bytes: int) -> None:
+    blocks = []
+    for i, paragraph in enumerate(_paragraphs(size_bytes)):
+        if i % 8 == 0:
+            blocks.append(f"## Section {i // 8}")
+        blocks.append(paragraph)
+    path.write_text("\n\n".join(blocks), encoding='utf-8')
+
+def write_csv(path: Path, size_bytes: int) -> None:
+    rng = random.Random(0)
+    rows = ["id,region,product,price,quantity"]
+    size = len(rows[0])
+    while size < size_bytes:
+        rows.append(
+            f"{len(rows)},{rng.choice(['EU', 'US', 'APAC'])},{rng.choice(WORDS)},"
+            f"{rng.random() * 100:.2f},{rng.randint(1, 99)}"
+        )
+        size += len(rows[-1]) + 1
+    path.write_text("\n".join(rows), encoding='utf-8')
+
+def write_excel(path: Path, size_bytes: int) -> None:
+    import pandas as pd
+
+    csv_path = path.with_name(path.stem + '_source.csv')
+    write_csv(csv_path, size_bytes)
+    pd.read_csv(csv_path).to_excel(path, index=False)
+    csv_path.unlink()
+
+def write_json(path: Path, size_bytes: int) -> None:
+    records = [{'id': i, 'text': paragraph} for i, paragraph in enumerate(_paragraphs(size_bytes))]
+    path.write_text(json.dumps({'records': records}), encoding='utf-8')
+
+def write_html(path: Path, size_bytes: int) -> None:
+    body = "\n".join(f"<h2>Section {i}</h2><p>{p}</p>" for i, p in enumerate(_paragraphs(size_bytes)))
+    path.write_text(f"<html><head><title>Benchmark</title></head><body>{body}</body></html>", encoding='utf-8')
+
+def write_xml(path: Path, size_bytes: int) -> None:
+    items = "\n".join(f"<item id=\"{i}\">{p}</item>" for i, p in enumerate(_paragraphs(size_bytes)))
+    path.write_text(f"<?xml version=\"1.0\"?>\n<items>\n{items}\n</items>", encoding='utf-8')
+
+def write_word(path: Path, size_bytes: int) -> None:
+    import docx
+
+    document = docx.Document()
+    for paragraph in _paragraphs(size_bytes):
+        document.add_paragraph(paragraph)
+    document.save(path)
+
+def write_powerpoint(path: Path, size_bytes: int) -> None:
+    import pptx
+
+    presentation = pptx.Presentation()
+    for i, paragraph in enumerate(_paragraphs(size_bytes)):
+        slide = presentation.slides.add_slide(presentation.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {i}"
+        slide.placeholders[1].text = paragraph
+    presentation.save(path)
+
+def write_pdf_file(path: Path, size_bytes: int) -> None:
+    # Short lines: each page holds one line of text
+    write_pdf(path, [line[:80] for line in sentences(max(1, size_bytes // 500))])
+
+# File writers by extension, one per FileLoaderTool loader
+WRITERS: Dict[str, Callable[[Path, int], None]] = {
+    '.csv': write_csv,
+    '.xlsx': write_excel,
+    '.pdf': write_pdf_file,
+    '.txt': write_text,
+    '.md': write_markdown,
+    '.json': write_json,
+    '.html': write_html,
+    '.xml': write_xml,
+    '.pptx': write_powerpoint,
+    '.docx': write_word,
+}
@@ -0,0 +1,112 @@
+"""
+Deterministic stand-ins for the LLM, search providers and sandboxes.
+
+Each fake replays latencies recorded from the real service, cycling
+through them in order, so benchmarks run offline with realistic timing
+and produce the same timings on every run.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from nodes.sandbox_pool import Sandbox
+from nodes.search_providers import SearchProvider
+
+RECORDED_LATENCIES_PATH = Path(__file__).parent / 'recorded_latencies.json'
+
+def load_latencies(path: Path = RECORDED_LATENCIES_PATH) -> Dict[str, List[float]]:
+    """Recorded latencies in seconds, by service: 'llm', 'search', 'sandbox'."""
+    with open(path) as f:
+        return json.load(f)['latencies']
+
+class LatencyReplay:
+    """
+    Thread-safe cycle through recorded latencies.
+    """
+
+    def __init__(self, latencies: List[float], scale: float = 1.0):
+        """
+        Args:
+            latencies (List[float]): Recorded latencies in seconds
+            scale (float): Factor applied to every latency, e.g. 0.01 to
+                           run a hundred times faster than recorded
+        """
+        self.latencies = latencies
+        self.scale = scale
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            latency = self.latencies[self._next % len(self.latencies)]
+            self._next += 1
+        time.sleep(latency * self.scale)
+
+class ReplayChatModel(FakeListChatModel):
+    """
+    Chat model that answers with fixed responses after a replayed latency.
+    """
+    replay: Any = None
+
+    def _call(self, *args, **kwargs) -> str:
+        if self.replay is not None:
+            self.replay.wait()
+        return super()._call(*args, **kwargs)
+
+class ReplaySearchProvider(SearchProvider):
+    """
+    Search provider returning generated results after a replayed latency.
+    """
+    name = "replay"
+
+    def __init__(self, replay: LatencyReplay, max_results: int = 5):
+        self.replay = replay
+        self.max_results = max_results
+
+    def search(self, query: str) -> List[dict]:
+        self.replay.wait()
+        return [
+            {
+                'title': f"Result {i} for {query}",
+                'url': f"https://example.com/{i}",
+                'content': f"Content of result {i} about {query}. " * 20
+            }
+            for i in range(self.max_results)
+        ]
+
+    def settings(self) -> dict:
+        return {'max_results': self.max_results}
+
+class ReplaySandbox(Sandbox):
+    """
+    Sandbox that echoes code after a replayed latency instead of running it.
+    """
+
+    def __init__(self, replay: LatencyReplay):
+        self.replay = replay
+
+    def run(self, code: str) -> str:
+        self.replay.wait()
+        return f"Executed {len(code)} characters"
+
+    def reset(self) -> None:
+        pass
+
+@contextmanager
+def fake_llm(model: FakeListChatModel) -> Iterator[FakeListChatModel]:
+    """Make the workflows use model instead of building a provider client."""
+    import workflows.basic as basic
+    import workflows.web_search_workflow as web_search_workflow
+
+    original = basic.get_llm, web_search_workflow.get_openai_llm
+    basic.get_llm = lambda llm_type='openai': model
+    web_search_workflow.get_openai_llm = lambda *args, **kwargs: model
+    try:
+        yield model
+    finally:
+        basic.get_llm, web_search_workflow.get_openai_llm = original
@@ -0,0 +1,368 @@
+"""
+Offline benchmark suite for the workflows, the file loaders and startup.
+
+Workflows run against the fakes in benchmarks/fakes.py, which replay
+recorded LLM, search and sandbox latencies, and the file loaders run on
+generated files of increasing size. Every case runs in a fresh
+interpreter and reports throughput, p50/p99 latency and peak RSS.
+
+Results are compared with a stored baseline; a metric that is worse than
+its baseline by more than the tolerance fails the run with status 1.
+Cases that cannot run here, such as loaders whose optional dependencies
+are not installed, are reported as skipped and left out of the baseline.
+
+Usage:
+    python benchmarks/run_suite.py                      # run and compare
+    python benchmarks/run_suite.py --update-baseline    # record the baseline
+    python benchmarks/run_suite.py --cases generic_workflow loader_pdf_1024kb
+"""
+import argparse
+import json
+import math
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+
+DEFAULT_ITERATIONS = 20
+DEFAULT_LOADER_REPEAT = 3
+DEFAULT_IMPORT_REPEAT = 5
+DEFAULT_SIZES_KB = [64, 256, 1024]
+# Replay recorded latencies this many times faster than recorded
+DEFAULT_LATENCY_SCALE = 0.01
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_CASE_TIMEOUT = 900
+
+# Metric -> whether higher values are better
+METRICS = {'throughput': True, 'p50_ms': False, 'p99_ms': False, 'peak_rss_mb': False}
+# Absolute differences below these are treated as noise
+NOISE_FLOOR = {'p50_ms': 5.0, 'p99_ms': 10.0, 'peak_rss_mb': 16.0}
+# Loader errors caused by a missing optional dependency rather than a bug
+MISSING_DEPENDENCY_ERRORS = ("No module named", "package not found", "Failed to download")
+
+GENERIC_INPUT = "Summarize recent results on retrieval augmented generation."
+GENERIC_RESPONSE = """Retrieval augmented generation combines a retriever with a generator.
+
+```json
+{"tool_calls": [
+  {"id": "search", "tool": "web_search", "input": "retrieval augmented generation benchmarks"},
+  {"id": "format", "tool": "text_to_markdown", "input_from": "search"},
+  {"id": "check", "tool": "python_executor", "input": "print(sum(range(10)))"}
+]}
+```"""
+WEB_SEARCH_INPUT = "What are the latest developments in small language models?"
+WEB_SEARCH_RESPONSE = "This needs current information, so web_search should be used."
+
+class CaseUnavailable(Exception):
+    """Raised by a case that cannot run in this environment."""
+
+def _replay(service: str, args: argparse.Namespace):
+    from benchmarks.fakes import LatencyReplay, load_latencies
+
+    return LatencyReplay(load_latencies()[service], args.latency_scale)
+
+def _web_search_tool(args: argparse.Namespace):
+    from benchmarks.fakes import ReplaySearchProvider
+    from nodes.search_cache import SearchCache
+    from nodes.web_search import WebSearchTool
+
+    # A zero TTL disables caching, so every run reaches the provider
+    return WebSearchTool(cache=SearchCache(ttl=0), providers=[ReplaySearchProvider(_replay('search', args))])
+
+def bench_generic_workflow(args: argparse.Namespace) -> dict:
+    from benchmarks.fakes import ReplayChatModel, ReplaySandbox, fake_llm
+    from nodes import ToolRegistry
+    from nodes.python_executor import PythonExecutorTool
+    from nodes.sandbox_pool import SandboxPool
+    from nodes.text_to_markdown_tool import TextToMarkdownTool
+    from workflows.basic import create_workflow
+
+    sandbox_replay = _replay('sandbox', args)
+    registry = ToolRegistry([
+        {'id': 'text_to_markdown', 'tool': TextToMarkdownTool},
+        {'id': 'web_search', 'tool': lambda: _web_search_tool(args)},
+        {
+            'id': 'python_executor',
+            'tool': lambda: PythonExecutorTool(
+                backend='local', pool=SandboxPool(lambda: ReplaySandbox(sandbox_replay))
+            )
+        }
+    ])
+    model = ReplayChatModel(responses=[GENERIC_RESPONSE], replay=_replay('llm', args))
+    with fake_llm(model):
+        workflow = create_workflow(GENERIC_INPUT, registry=registry)
+
+    def run():
+        output = workflow.run()
+        if "Result 0" not in output or "Executed" not in output:
+            raise RuntimeError(f"Unexpected workflow output: {output[:200]!r}")
+
+    try:
+        return _time_runs(run, args.iterations, 1.0, 'runs')
+    finally:
+        registry.close()
+
+def bench_web_search_workflow(args: argparse.Namespace) -> dict:
+    from benchmarks.fakes import ReplayChatModel, fake_llm
+    from workflows.web_search_workflow import create_workflow
+
+    model = ReplayChatModel(responses=[WEB_SEARCH_RESPONSE], replay=_replay('llm', args))
+    with fake_llm(model):
+        workflow = create_workflow(WEB_SEARCH_INPUT, tools=[_web_search_tool(args)])
+
+    def run():
+        output = workflow.run()
+        if "Result 0" not in output:
+            raise RuntimeError(f"Unexpected workflow output: {output[:200]!r}")
+
+    return _time_runs(run, args.iterations, 1.0, 'runs')
+
+def bench_import_main(args: argparse.Namespace) -> dict:
+    from benchmarks.bench_import_time import HEAVY_MODULES, PROBE
+
+    latencies = []
+    for _ in range(args.import_repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module='main', heavy=HEAVY_MODULES)],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if result['heavy']:
+            raise RuntimeError(f"Importing main loaded {', '.join(result['heavy'])}")
+        latencies.append(result['seconds'])
+    return _summarize(latencies, len(latencies), 'imports')
+
+def bench_loader(args: argparse.Namespace, extension: str, size_kb: int) -> dict:
+    from nodes.file_loader_tool import FileLoaderTool
+
+    path = Path(args.data_dir) / _data_file_name(extension, size_kb)
+    if not path.exists():
+        raise CaseUnavailable(f"No generated {extension} file")
+    size_mb = path.stat().st_size / 2**20
+    tool = FileLoaderTool()
+
+    def run():
+        output = tool._run(file_path=str(path))
+        if output.startswith(("Error loading file", "Unsupported file format")):
+            message = output.splitlines()[0][:200]
+            if any(error in output for error in MISSING_DEPENDENCY_ERRORS):
+                raise CaseUnavailable(message)
+            raise RuntimeError(message)
+
+    return _time_runs(run, args.loader_repeat, size_mb, 'MB')
+
+def _time_runs(run: Callable[[], None], iterations: int, units_per_run: float, unit: str) -> dict:
+    # Untimed first run: lazy imports and client setup are measured by import_main
+    run()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        run()
+        latencies.append(time.perf_counter() - start)
+    return _summarize(latencies, units_per_run * iterations, unit)
+
+def _summarize(latencies: List[float], units: float, unit: str) -> dict:
+    return {
+        'throughput': units / sum(latencies),
+        'unit': f"{unit}/s",
+        'p50_ms': percentile(latencies, 0.5) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'samples': len(latencies)
+    }
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+def _data_file_name(extension: str, size_kb: int) -> str:
+    return f"bench_{size_kb}kb{extension}"
+
+def build_cases(sizes_kb: List[int]) -> Dict[str, Callable[[argparse.Namespace], dict]]:
+    """Benchmark cases by name."""
+    from benchmarks.datagen import WRITERS
+
+    cases = {
+        'generic_workflow': bench_generic_workflow,
+        'web_search_workflow': bench_web_search_workflow,
+        'import_main': bench_import_main,
+    }
+    for extension in WRITERS:
+        for size_kb in sizes_kb:
+            cases[f"loader_{extension[1:]}_{size_kb}kb"] = (
+                lambda args, extension=extension, size_kb=size_kb: bench_loader(args, extension, size_kb)
+            )
+    return cases
+
+def generate_data(data_dir: Path, sizes_kb: List[int]) -> None:
+    from benchmarks.datagen import WRITERS
+
+    for extension, write in WRITERS.items():
+        for size_kb in sizes_kb:
+            try:
+                write(data_dir / _data_file_name(extension, size_kb), size_kb * 1024)
+            except ImportError as e:
+                print(f"Skipping {extension} files: {e}")
+                break
+
+def run_case(name: str, args: argparse.Namespace) -> dict:
+    """Run one case in this process and add its peak RSS."""
+    try:
+        result = build_cases(args.sizes)[name](args)
+    except CaseUnavailable as e:
+        return {'skipped': str(e)}
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process, or of its largest child, in MiB."""
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    unit = 2**20 if sys.platform == 'darwin' else 2**10
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit
+    try:
+        # Unlike ru_maxrss, VmHWM does not carry over the parent's peak across fork/exec
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return max(int(line.split()[1]) / 2**10, children)
+    except OSError:
+        pass
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit, children)
+
+def spawn_case(name: str, args: argparse.Namespace, data_dir: str) -> dict:
+    """Run one case in a fresh interpreter."""
+    command = [
+        sys.executable, __file__, '--run-case', name, '--data-dir', data_dir,
+        '--iterations', str(args.iterations),
+        '--loader-repeat', str(args.loader_repeat),
+        '--import-repeat', str(args.import_repeat),
+        '--latency-scale', str(args.latency_scale),
+        '--sizes', *map(str, args.sizes)
+    ]
+    try:
+        process = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=args.timeout)
+    except subprocess.TimeoutExpired:
+        return {'error': f"timed out after {args.timeout}s"}
+    lines = process.stdout.strip().splitlines()
+    if process.returncode != 0 or not lines:
+        stderr = process.stderr.strip().splitlines()
+        return {'error': stderr[-1] if stderr else f"exit status {process.returncode}"}
+    return json.loads(lines[-1])
+
+def compare(result: dict, baseline: Optional[dict], tolerance: float) -> List[str]:
+    """Metrics of a case that regressed against its baseline."""
+    if baseline is None or 'skipped' in result:
+        return []
+    if 'error' in result:
+        return ['failed']
+    regressions = []
+    for metric, higher_is_better in METRICS.items():
+        value, base = result[metric], baseline[metric]
+        if higher_is_better:
+            # Throughput of short runs is noise unless their latency also moved
+            slower = result['p50_ms'] - baseline['p50_ms'] > NOISE_FLOOR['p50_ms']
+            if value < base * (1 - tolerance) and slower:
+                regressions.append(metric)
+        elif value > base * (1 + tolerance) + NOISE_FLOOR[metric]:
+            regressions.append(metric)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cases', nargs='+', default=None, help="Cases to run, defaults to all")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES_KB, help="Loader file sizes in KiB")
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS, help="Runs per workflow case")
+    parser.add_argument('--loader-repeat', type=int, default=DEFAULT_LOADER_REPEAT, help="Loads per file")
+    parser.add_argument('--import-repeat', type=int, default=DEFAULT_IMPORT_REPEAT, help="Fresh imports of main")
+    parser.add_argument('--latency-scale', type=float, default=DEFAULT_LATENCY_SCALE,
+                        help="Factor applied to the recorded latencies")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative regression against the baseline")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_CASE_TIMEOUT, help="Seconds per case")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument('--update-baseline', action='store_true', help="Store the results as the new baseline")
+    parser.add_argument('--output', type=Path, default=None, help="Also write the results to this JSON file")
+    parser.add_argument('--run-case', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--data-dir', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case, args)))
+        return
+
+    cases = build_cases(args.sizes)
+    names = args.cases or list(cases)
+    unknown = [name for name in names if name not in cases]
+    if unknown:
+        parser.error(f"Unknown cases: {', '.join(unknown)}")
+
+    baseline = {}
+    if args.baseline.exists() and not args.update_baseline:
+        baseline = json.loads(args.baseline.read_text())['cases']
+
+    results = {}
+    failed = False
+    print(f"{'case':<26} {'throughput':>16} {'p50':>10} {'p99':>10} {'peak RSS':>10}  verdict")
+    with tempfile.TemporaryDirectory() as data_dir:
+        if any(name.startswith('loader_') for name in names):
+            generate_data(Path(data_dir), args.sizes)
+        for name in names:
+            result = results[name] = spawn_case(name, args, data_dir)
+            regressions = compare(result, baseline.get(name), args.tolerance)
+            failed = failed or bool(regressions)
+            if 'skipped' in result:
+                print(f"{name:<26} skipped: {result['skipped']}")
+                continue
+            if 'error' in result:
+                verdict = "FAILED" if regressions else "error"
+                print(f"{name:<26} {verdict}: {result['error']}")
+                continue
+            verdict = "REGRESSED: " + ", ".join(regressions) if regressions else (
+                "ok" if name in baseline else "new"
+            )
+            print(
+                f"{name:<26} {result['throughput']:>9.2f} {result['unit']:<6} "
+                f"{result['p50_ms']:>8.1f}ms {result['p99_ms']:>8.1f}ms "
+                f"{result['peak_rss_mb']:>7.0f}MiB  {verdict}"
+            )
+
+    report = {
+        'settings': {
+            'iterations': args.iterations,
+            'loader_repeat': args.loader_repeat,
+            'import_repeat': args.import_repeat,
+            'latency_scale': args.latency_scale
+        },
+        'cases': results
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.update_baseline:
+        # Only measurements go in the baseline, not skipped or failed cases
+        measured = {name: result for name, result in results.items() if 'throughput' in result}
+        report['cases'] = measured
+        if args.baseline.exists() and args.cases:
+            # Keep the baseline of cases that were not rerun
+            previous = json.loads(args.baseline.read_text())['cases']
+            rerun = set(results)
+            report['cases'] = {
+                **{name: result for name, result in previous.items() if name not in rerun},
+                **measured
+            }
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Incremental chunk-and-embed pipeline feeding the vector store.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from pydantic import BaseModel, Field
+
+from nodes.file_loader_tool import FileLoaderTool
+from vectorstore import VectorStore
+
+# Chunking defaults, in characters
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_CHUNK_OVERLAP = 100
+# Chunks embedded per embedder call
+DEFAULT_EMBED_BATCH_SIZE = 128
+# Compact the store before saving once this share of rows is deleted
+COMPACT_THRESHOLD = 0.25
+
+MANIFEST_FILE = 'manifest.json'
+STORE_DIR = 'vectors'
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+class IngestStats(BaseModel):
+    added: int = Field(description="New files ingested", default=0)
+    updated: int = Field(description="Changed files re-ingested", default=0)
+    unchanged: int = Field(description="Files skipped because they did not change", default=0)
+    removed: int = Field(description="Files dropped because they no longer exist", default=0)
+    failed: Dict[str, str] = Field(description="Errors by file path", default_factory=dict)
+    chunks: int = Field(description="Chunks embedded in this run", default=0)
+
+class IngestPipeline:
+    """
+    Chunk files loaded by FileLoaderTool, embed them and persist the vectors.
+
+    A manifest records the size, modification time, content hash and chunk
+    ids of every ingested file. On later runs a file whose size and mtime
+    are unchanged is skipped without being read; one whose content hash is
+    unchanged is skipped without being parsed. Only new or changed files are
+    chunked and embedded, and their old chunks are replaced. Embedding calls
+    are batched across files.
+    """
+
+    def __init__(
+        self,
+        index_dir: str,
+        embedder: Embeddings,
+        loader: Optional[FileLoaderTool] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+        batch_size: int = DEFAULT_EMBED_BATCH_SIZE
+    ):
+        """
+        Initialize the pipeline, loading any existing index.
+
+        Args:
+            index_dir (str): Directory holding the manifest and vector store
+            embedder (Embeddings): Embeddings model for chunks and queries
+            loader (Optional[FileLoaderTool]): Loader used to parse files
+            chunk_size (int): Maximum chunk size in characters
+            chunk_overlap (int): Characters shared by consecutive chunks
+            batch_size (int): Chunks embedded per embedder call
+        """
+        self.index_dir = Path(index_dir)
+        self.embedder = embedder
+        self.loader = loader or FileLoaderTool()
+        self.batch_size = batch_size
+        self.splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+        manifest_path = self.index_dir / MANIFEST_FILE
+        self.manifest: Dict[str, dict] = {}
+        if manifest_path.exists():
+            with open(manifest_path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        store_path = self.index_dir / STORE_DIR
+        if (store_path / 'meta.json').exists():
+            self.store = VectorStore.load(str(store_path), embedder=embedder)
+        else:
+            self.store = VectorStore(embedder=embedder)
+
+    def ingest(self, path: str, prune: bool = True) -> IngestStats:
+        """
+        Bring the index up to date with a file, directory or glob.
+
+        Args:
+            path (str): File, directory (searched recursively) or glob pattern
+            prune (bool): Drop indexed files under path that no longer exist
+
+        Returns:
+            IngestStats: What changed in this run
+        """
+        stats = IngestStats()
+        if Path(path).is_file():
+            files = [str(Path(path).resolve())]
+        else:
+            files = [str(Path(p).resolve()) for p in self.loader._expand_batch_path(path)]
+
+        pending: List[Document] = []
+        pending_ids: List[str] = []
+        for file_path in files:
+            stat = os.stat(file_path)
+            entry = self.manifest.get(file_path)
+            if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+                stats.unchanged += 1
+                continue
+            digest = _file_digest(file_path)
+            if entry and entry['hash'] == digest:
+                entry['mtime'] = stat.st_mtime_ns
+                stats.unchanged += 1
+                continue
+
+            try:
+                chunks = self._chunk(file_path)
+            except Exception as e:
+                stats.failed[file_path] = f"{type(e).__name__}: {e}"
+                continue
+            if entry:
+                self.store.delete(entry['ids'])
+                stats.updated += 1
+            else:
+                stats.added += 1
+            ids = [f"{file_path}#{index}" for index in range(len(chunks))]
+            self.manifest[file_path] = {
+                'size': stat.st_size,
+                'mtime': stat.st_mtime_ns,
+                'hash': digest,
+                'ids': ids
+            }
+            pending.extend(chunks)
+            pending_ids.extend(ids)
+            if len(pending) >= self.batch_size:
+                stats.chunks += self._embed(pending, pending_ids)
+        stats.chunks += self._embed(pending, pending_ids)
+
+        if prune:
+            stats.removed = self._prune(path, set(files))
+        self.save()
+        return stats
+
+    def search(self, query: str, k: int = 4) -> List[Document]:
+        """Return the k chunks most similar to a text query."""
+        return [doc for doc, _ in self.store.similarity_search(query, k)]
+
+    def save(self) -> None:
+        """Persist the manifest and the vector store."""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        if self.store.deleted_ratio > COMPACT_THRESHOLD:
+            self.store.compact()
+        self.store.save(str(self.index_dir / STORE_DIR))
+        # Write the manifest last so a crash never records unsaved vectors;
+        # chunk ids are stable, so re-ingesting replaces any orphans
+        tmp_path = self.index_dir / (MANIFEST_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, self.index_dir / MANIFEST_FILE)
+
+    def _chunk(self, file_path: str) -> List[Document]:
+        documents = self.loader.load_documents(file_path)
+        chunks = self.splitter.split_documents(documents)
+        for index, chunk in enumerate(chunks):
+            chunk.metadata = {**chunk.metadata, 'file_path': file_path, 'chunk': index}
+        return chunks
+
+    def _embed(self, documents: List[Document], ids: List[str]) -> int:
+        """Embed and store the pending chunks, emptying both lists."""
+        count = len(documents)
+        if count:
+            self.store.add_documents(documents, self.embedder, ids=ids, batch_size=self.batch_size)
+        documents.clear()
+        ids.clear()
+        return count
+
+    def _prune(self, path: str, present: Iterable[str]) -> int:
+        root = Path(path).resolve()
+        if not root.is_dir():
+            return 0
+        removed = 0
+        for file_path in list(self.manifest):
+            if file_path not in present and Path(file_path).is_relative_to(root):
+                self.store.delete(self.manifest.pop(file_path)['ids'])
+                removed += 1
+        return removed
+
+def _file_digest(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
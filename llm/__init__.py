@@ -1,5 +1,6 @@
-from typing import Union
-from langchain_core.language_models import BaseChatModel
+"""
+LLM clients. Provider SDKs are imported only when their client is built.
+"""
 from .openai import get_openai_llm
 from .gemini import get_gemini_llm
 
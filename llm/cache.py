@@ -0,0 +1,285 @@
+"""
+Two-tier on-disk cache for LLM responses.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+import tracing
+
+# Default location and size bound of the response cache
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'ai_agents_tools' / 'llm_cache.db'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Minimum cosine similarity for a semantic hit
+DEFAULT_SIMILARITY_THRESHOLD = 0.95
+# Embeddings of missed prompts kept for the update() that usually follows
+MAX_PENDING_EMBEDDINGS = 256
+
+class LLMResponseCache(BaseCache):
+    """
+    LangChain cache with an exact tier and an optional semantic tier.
+
+    The exact tier matches the rendered prompt plus the model parameters
+    (LangChain's llm_string). When an embeddings model is given, a miss
+    falls through to the semantic tier, which returns the response of the
+    most similar cached prompt for the same model parameters and system
+    messages if its cosine similarity reaches the threshold. Entries live in a SQLite file and the
+    least recently used ones are evicted once the stored responses exceed
+    max_bytes.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        embeddings: Optional[Embeddings] = None,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            path (Optional[str]): SQLite file holding the cache
+            max_bytes (int): Upper bound on the size of stored responses
+            embeddings (Optional[Embeddings]): Enables the semantic tier
+            similarity_threshold (float): Minimum cosine similarity for a
+                                          semantic hit
+        """
+        self.path = Path(path) if path else DEFAULT_CACHE_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        # Normalized embedding matrices per semantic scope, loaded on demand
+        self._vectors: Dict[str, tuple] = {}
+        # Query embeddings of missed prompts by key, reused by update()
+        self._pending_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, llm_string TEXT NOT NULL, value BLOB NOT NULL, "
+            "embedding BLOB, size INTEGER NOT NULL, last_access REAL NOT NULL, scope TEXT)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(llm_cache)")}
+        if 'scope' not in columns:
+            # Caches from before scopes keep their exact entries only
+            self._db.execute("ALTER TABLE llm_cache ADD COLUMN scope TEXT")
+        self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_scope ON llm_cache (scope)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_access ON llm_cache (last_access)")
+        self._db.commit()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            row = self._db.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._touch(key)
+                self.hits += 1
+                tracing.incr('cache_lookups_total', cache='llm', result='hit')
+                return self._decode(row[0])
+
+        if self.embeddings is not None:
+            text, scope = self._semantic_input(prompt, llm_string)
+            query = self._embed(text)
+            match = self._similar_key(query, scope)
+            if match is None:
+                self._remember_embedding(key, query)
+            else:
+                with self._lock:
+                    row = self._db.execute("SELECT value FROM llm_cache WHERE key = ?", (match,)).fetchone()
+                    if row is not None:
+                        self._touch(match)
+                        self.semantic_hits += 1
+                        tracing.incr('cache_lookups_total', cache='llm', result='semantic_hit')
+                        return self._decode(row[0])
+
+        with self._lock:
+            self.misses += 1
+        tracing.incr('cache_lookups_total', cache='llm', result='miss')
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self._key(prompt, llm_string)
+        value = self._encode(return_val)
+        embedding = scope = None
+        if self.embeddings is not None:
+            text, scope = self._semantic_input(prompt, llm_string)
+            with self._lock:
+                vector = self._pending_embeddings.pop(key, None)
+            if vector is None:
+                vector = self._embed(text)
+            embedding = vector.tobytes()
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, llm_string, value, embedding, size, last_access, scope) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, llm_string, value, embedding, len(value), time.time(), scope)
+            )
+            self._evict()
+            self._db.commit()
+            self._vectors.pop(scope, None)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM llm_cache")
+            self._db.commit()
+            self._vectors.clear()
+            self._pending_embeddings.clear()
+            self.hits = self.semantic_hits = self.misses = 0
+
+    @property
+    def stats(self) -> dict:
+        """Hit/miss counters, hit rate and current size of the cache."""
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+            lookups = self.hits + self.semantic_hits + self.misses
+            return {
+                'hits': self.hits,
+                'semantic_hits': self.semantic_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.semantic_hits) / lookups if lookups else 0.0,
+                'entries': entries,
+                'bytes': size,
+            }
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _encode(generations: RETURN_VAL_TYPE) -> bytes:
+        records = []
+        for generation in generations:
+            if isinstance(generation, ChatGeneration):
+                records.append({'message': message_to_dict(generation.message), 'info': generation.generation_info})
+            else:
+                records.append({'text': generation.text, 'info': generation.generation_info})
+        return zlib.compress(json.dumps(records, separators=(',', ':'), default=str).encode('utf-8'))
+
+    @staticmethod
+    def _decode(value: bytes) -> RETURN_VAL_TYPE:
+        generations = []
+        for record in json.loads(zlib.decompress(value)):
+            if 'message' in record:
+                message = messages_from_dict([record['message']])[0]
+                generations.append(ChatGeneration(message=message, generation_info=record['info']))
+            else:
+                generations.append(Generation(text=record['text'], generation_info=record['info']))
+        return generations
+
+    @staticmethod
+    def _semantic_input(prompt: str, llm_string: str) -> Tuple[str, str]:
+        """
+        Text to embed for a prompt, and the scope its vector is compared in.
+
+        Chat models pass the prompt as serialized messages. Only the human
+        messages are embedded: the system message holds the workflow's fixed
+        instructions, which would otherwise dominate the vector and make
+        unrelated inputs look alike. The other messages go into the scope
+        instead, with the model parameters, so workflows with different
+        instructions never serve each other's responses.
+        """
+        text, context = prompt, ""
+        try:
+            messages = json.loads(prompt)
+        except ValueError:
+            messages = None
+        if isinstance(messages, list):
+            human_contents = []
+            other_contents = []
+            for message in messages:
+                kwargs = message.get('kwargs', {}) if isinstance(message, dict) else {}
+                content = kwargs.get('content')
+                if not isinstance(content, str):
+                    continue
+                if kwargs.get('type') == 'human':
+                    human_contents.append(content)
+                else:
+                    other_contents.append(f"{kwargs.get('type')}\x00{content}")
+            if human_contents:
+                text = "\n".join(human_contents)
+                context = "\x00".join(other_contents)
+        scope = hashlib.sha256(f"{llm_string}\x00{context}".encode('utf-8')).hexdigest()
+        return text, scope
+
+    def _embed(self, text: str) -> np.ndarray:
+        return np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+
+    def _remember_embedding(self, key: str, vector: np.ndarray) -> None:
+        with self._lock:
+            self._pending_embeddings[key] = vector
+            while len(self._pending_embeddings) > MAX_PENDING_EMBEDDINGS:
+                self._pending_embeddings.popitem(last=False)
+
+    def _touch(self, key: str) -> None:
+        self._db.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (time.time(), key))
+        self._db.commit()
+
+    def _similar_key(self, query: np.ndarray, scope: str) -> Optional[str]:
+        """Key of the most similar cached prompt in the scope above the threshold, if any."""
+        with self._lock:
+            if scope not in self._vectors:
+                rows = self._db.execute(
+                    "SELECT key, embedding FROM llm_cache WHERE scope = ? AND embedding IS NOT NULL",
+                    (scope,)
+                ).fetchall()
+                self._vectors[scope] = self._build_matrix(rows)
+            keys, matrix = self._vectors[scope]
+        if not keys:
+            return None
+
+        norm = np.linalg.norm(query)
+        if norm == 0 or query.shape[0] != matrix.shape[1]:
+            return None
+        scores = matrix @ (query / norm)
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+        return keys[best]
+
+    @staticmethod
+    def _build_matrix(rows: Sequence[tuple]) -> tuple:
+        if not rows:
+            return [], np.zeros((0, 0), dtype=np.float32)
+        keys = [key for key, _ in rows]
+        matrix = np.vstack([np.frombuffer(blob, dtype=np.float32) for _, blob in rows])
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return keys, np.ascontiguousarray(matrix / norms)
+
+    def _evict(self) -> None:
+        """Drop least recently used entries beyond max_bytes. Lock must be held."""
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        if total <= self.max_bytes:
+            return
+        evicted = False
+        for key, size in self._db.execute(
+            "SELECT key, size FROM llm_cache ORDER BY last_access"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            total -= size
+            evicted = True
+        if evicted:
+            self._vectors.clear()
@@ -1,13 +1,20 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from dotenv import load_dotenv
 import os
 
-load_dotenv()
+from .registry import get_client, load_env
 
 def get_gemini_llm():
-    return ChatGoogleGenerativeAI(
-        model="gemini-pro",
-        google_api_key=os.getenv("GOOGLE_API_KEY"),
-        temperature=0.7,
-        max_output_tokens=2048
-    )
\ No newline at end of file
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    load_env()
+    return get_client(
+        'gemini',
+        'gemini-pro',
+        0.7,
+        2048,
+        lambda: ChatGoogleGenerativeAI(
+            model="gemini-pro",
+            google_api_key=os.getenv("GOOGLE_API_KEY"),
+            temperature=0.7,
+            max_output_tokens=2048
+        )
+    )
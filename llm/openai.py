@@ -1,17 +1,22 @@
 import os
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from typing import TYPE_CHECKING
 
-# Load environment variables
-load_dotenv(dotenv_path='.env')
+from .registry import get_async_http_client, get_client, get_http_client, load_env
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
 
 def get_openai_llm(
     model: str = None, 
     temperature: float = None, 
     max_tokens: int = None
-) -> ChatOpenAI:
+) -> "ChatOpenAI":
     """
-    Create and return an OpenAI Language Model
+    Return the shared OpenAI Language Model for the given settings
+    
+    Clients are memoized by (model, temperature, max_tokens) and share
+    keep-alive HTTP connection pools, one for sync and one for async calls,
+    so repeated calls are cheap.
     
     Args:
         model (str, optional): OpenAI model name
@@ -21,14 +26,29 @@ def get_openai_llm(
     Returns:
         ChatOpenAI: Configured OpenAI Language Model
     """
+    # Imported here so that importing llm does not load every provider SDK
+    from langchain_openai import ChatOpenAI
+
+    # Load environment variables
+    load_env()
+    
     # Use environment variables with fallback values
     model = model or os.getenv('DEFAULT_MODEL', 'gpt-3.5-turbo')
-    temperature = temperature or float(os.getenv('WORKFLOW_TEMPERATURE', 0.3))
+    if temperature is None:
+        temperature = float(os.getenv('WORKFLOW_TEMPERATURE', 0.3))
     max_tokens = max_tokens or int(os.getenv('WORKFLOW_MAX_TOKENS', 1000))
     
-    return ChatOpenAI(
-        api_key=os.getenv('OPENAI_API_KEY'),
-        model=model, 
-        temperature=temperature, 
-        max_tokens=max_tokens
+    return get_client(
+        'openai',
+        model,
+        temperature,
+        max_tokens,
+        lambda: ChatOpenAI(
+            api_key=os.getenv('OPENAI_API_KEY'),
+            model=model, 
+            temperature=temperature, 
+            max_tokens=max_tokens,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client()
+        )
     )
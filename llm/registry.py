@@ -0,0 +1,99 @@
+"""
+Process-wide registry of shared LLM clients.
+"""
+import os
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, Tuple
+
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    import httpx
+    from langchain_core.language_models import BaseChatModel
+
+# Connection pool tuning for the shared HTTP clients
+HTTP_MAX_CONNECTIONS = int(os.getenv('LLM_HTTP_MAX_CONNECTIONS', 100))
+HTTP_MAX_KEEPALIVE = int(os.getenv('LLM_HTTP_MAX_KEEPALIVE', 20))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv('LLM_HTTP_KEEPALIVE_EXPIRY', 60))
+HTTP_TIMEOUT = float(os.getenv('LLM_HTTP_TIMEOUT', 120))
+
+_clients: Dict[Tuple[Hashable, ...], "BaseChatModel"] = {}
+_clients_lock = threading.Lock()
+
+@lru_cache(maxsize=None)
+def load_env() -> None:
+    """Load the .env file once per process."""
+    load_dotenv(dotenv_path='.env')
+    load_dotenv()
+
+@lru_cache(maxsize=None)
+def get_http_client() -> "httpx.Client":
+    """
+    Return the keep-alive HTTP client shared by all synchronous LLM calls.
+
+    Reusing one connection pool means TLS handshakes happen once per host
+    instead of once per workflow.
+    """
+    import httpx
+
+    return httpx.Client(**_http_settings())
+
+@lru_cache(maxsize=None)
+def get_async_http_client() -> "httpx.AsyncClient":
+    """
+    Return the keep-alive HTTP client shared by all async LLM calls, such as
+    the workflows' arun() and astream(), tuned like get_http_client().
+    """
+    import httpx
+
+    return httpx.AsyncClient(**_http_settings())
+
+def _http_settings() -> dict:
+    import httpx
+
+    return {
+        'limits': httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        ),
+        'timeout': HTTP_TIMEOUT
+    }
+
+def get_client(
+    provider: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    factory: Callable[[], "BaseChatModel"]
+) -> "BaseChatModel":
+    """
+    Return the shared client for a configuration, building it on first use.
+
+    Args:
+        provider (str): Provider name, e.g. 'openai'
+        model (str): Model name
+        temperature (float): Sampling temperature
+        max_tokens (int): Maximum number of tokens to generate
+        factory (Callable[[], BaseChatModel]): Builds the client on a miss
+
+    Returns:
+        BaseChatModel: Client shared by every caller with the same settings.
+                       Treat it as read-only; use model_copy() to customise.
+    """
+    key = (provider, model, temperature, max_tokens)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _clients_lock:
+        # Another thread may have built it while we waited
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = factory()
+        return client
+
+def clear_clients() -> None:
+    """Drop all cached clients, e.g. after rotating API keys."""
+    with _clients_lock:
+        _clients.clear()
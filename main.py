@@ -1,7 +1,15 @@
+import os
 import random
+
+import tracing
 from workflows.web_search_workflow import create_workflow
 
 def main():
+    # The metrics server is started here rather than on import, so only
+    # this process binds the port
+    if os.getenv('METRICS_PORT'):
+        tracing.configure(trace_path=os.getenv('TRACE_PATH'), metrics_port=int(os.environ['METRICS_PORT']))
+
     # List of potential web search scenarios
     scenarios = [
         {
@@ -1,40 +1,100 @@
 """
 Initialize and manage available tools for the workflow.
+
+Tool classes are imported on first use rather than with the package, so
+importing nodes does not pull in the search, sandbox and document loader
+dependencies of every tool.
 """
-from .text_to_markdown_tool import TextToMarkdownTool
-from .web_search import WebSearchTool
-from .python_executor import PythonExecutorTool
-from .file_loader_tool import FileLoaderTool
+import atexit
+import importlib
+from functools import lru_cache
+from typing import Any
+
+from .registry import ToolRegistry
+
+class LazyTool:
+    """
+    Reference to a tool class that is imported when first used.
+
+    Calling it constructs the tool, so it can stand in for the class
+    wherever a tool factory is expected.
+    """
+
+    def __init__(self, module: str, name: str):
+        """
+        Args:
+            module (str): Module within this package defining the tool
+            name (str): Name of the tool class
+        """
+        self.module = module
+        self.name = name
+        self._cls = None
+
+    def resolve(self) -> type:
+        """Import and return the tool class."""
+        if self._cls is None:
+            self._cls = getattr(importlib.import_module(f".{self.module}", __name__), self.name)
+        return self._cls
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"LazyTool({__name__}.{self.module}.{self.name})"
 
 AVAILABLE_TOOLS = [
     {
         'id': 'text_to_markdown',
-        'tool': TextToMarkdownTool,
+        'tool': LazyTool('text_to_markdown_tool', 'TextToMarkdownTool'),
         'description': 'Converts plain text into markdown format'
     },
     {
         'id': 'web_search',
-        'tool': WebSearchTool,
+        'tool': LazyTool('web_search', 'WebSearchTool'),
         'description': 'Search the web for information'
     },
     {
         'id': 'python_executor',
-        'tool': PythonExecutorTool,
+        'tool': LazyTool('python_executor', 'PythonExecutorTool'),
         'description': 'Execute Python code in a sandboxed environment'
     },
     {
         'id': 'file_loader',
-        'tool': FileLoaderTool,
+        'tool': LazyTool('file_loader_tool', 'FileLoaderTool'),
         'description': 'Load and process CSV and Excel files'
     }
 ]
 
-def get_tool_by_id(tool_id: str):
-    for tool_config in AVAILABLE_TOOLS:
-        if tool_config['id'] == tool_id:
-            return tool_config['tool']()
-    return None
+# Beginnings of the messages tools return instead of raising on failure
+TOOL_ERROR_PREFIXES = (
+    "Error loading file:",
+    "Unsupported file format:",
+    "Error executing Python code:",
+    "Error converting text to markdown:",
+    "Error performing web search:",
+    "Error: Empty search query provided",
+    "No search provider available",
+)
 
+_TOOL_CLASSES = {tool_config['tool'].name: tool_config['tool'] for tool_config in AVAILABLE_TOOLS}
 
+def __getattr__(name: str):
+    # Keep `from nodes import WebSearchTool` working without eager imports
+    if name in _TOOL_CLASSES:
+        return _TOOL_CLASSES[name].resolve()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
+@lru_cache(maxsize=None)
+def get_tool_registry() -> ToolRegistry:
+    """Return the process-wide registry of the available tools."""
+    registry = ToolRegistry(AVAILABLE_TOOLS)
+    atexit.register(registry.close)
+    return registry
+
+def is_tool_error(output: str) -> bool:
+    """Whether a tool output is an error message rather than a result."""
+    return output.startswith(TOOL_ERROR_PREFIXES)
+
+def get_tool_by_id(tool_id: str):
+    return get_tool_registry().get(tool_id)
 
@@ -0,0 +1,196 @@
+"""
+On-disk cache of parsed documents for the file loader tool.
+"""
+import hashlib
+import json
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from langchain_core.documents import Document
+
+import tracing
+
+# Default location and size bound of the parse cache
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'ai_agents_tools' / 'documents'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_HASH_BLOCK_SIZE = 1024 * 1024
+_ENTRY_SUFFIX = '.json.z'
+
+
+class DocumentCache:
+    """
+    Content-addressed cache of parsed documents with LRU eviction.
+
+    Entries are keyed by the SHA-256 of the file contents plus the loader
+    arguments, so an unchanged file is never re-parsed, wherever it lives.
+    Metadata naming the path the documents were parsed from is rewritten to
+    the path they are requested for. Documents are stored as zlib-compressed JSON. The total size on disk is
+    kept under max_bytes by evicting the least recently used entries, using
+    the entry file's modification time as the access clock.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the document cache.
+
+        Args:
+            cache_dir (Optional[str]): Directory holding cache entries
+            max_bytes (int): Upper bound on the total size of stored entries
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def make_key(self, file_path: str, **loader_args) -> str:
+        """
+        Build the cache key for a file and the arguments it is loaded with.
+
+        Args:
+            file_path (str): Path to the file
+            **loader_args: Loader arguments that affect the parsed output
+
+        Returns:
+            str: Hex digest identifying the parsed result
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        digest.update(Path(file_path).suffix.lower().encode('utf-8'))
+        digest.update(json.dumps(loader_args, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str, file_path: Optional[str] = None) -> Optional[List[Document]]:
+        """
+        Return the cached documents for a key, or None on a miss.
+
+        Args:
+            key (str): Key from make_key()
+            file_path (Optional[str]): Path the documents are loaded for;
+                                       metadata values derived from the path
+                                       they were cached from are rewritten
+                                       to it
+
+        Returns:
+            Optional[List[Document]]: The documents, or None on a miss
+        """
+        path = self._entry_path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            tracing.incr('cache_lookups_total', cache='document', result='miss')
+            return None
+
+        try:
+            entry = json.loads(zlib.decompress(data))
+        except (zlib.error, ValueError):
+            # Corrupt or partially written entry: drop it and treat as a miss
+            path.unlink(missing_ok=True)
+            with self._lock:
+                self.misses += 1
+            tracing.incr('cache_lookups_total', cache='document', result='miss')
+            return None
+
+        # Touch the entry so it counts as recently used
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self.hits += 1
+        tracing.incr('cache_lookups_total', cache='document', result='hit')
+        # Entries written before paths were stored are a bare list of records
+        records = entry['documents'] if isinstance(entry, dict) else entry
+        cached_path = entry.get('path') if isinstance(entry, dict) else None
+        replacements = _path_replacements(cached_path, file_path)
+        return [
+            Document(
+                page_content=content,
+                metadata={
+                    name: replacements.get(value, value) if isinstance(value, str) else value
+                    for name, value in metadata.items()
+                }
+            )
+            for content, metadata in records
+        ]
+
+    def put(self, key: str, documents: List[Document], file_path: Optional[str] = None) -> None:
+        """
+        Store parsed documents under a key and evict old entries if needed.
+
+        Args:
+            key (str): Key from make_key()
+            documents (List[Document]): Parsed documents
+            file_path (Optional[str]): Path the documents were parsed from
+        """
+        entry = {'path': file_path, 'documents': [[doc.page_content, doc.metadata] for doc in documents]}
+        data = zlib.compress(
+            json.dumps(entry, separators=(',', ':'), default=str).encode('utf-8')
+        )
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._entry_path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove every cache entry and reset the counters."""
+        for path in self.cache_dir.glob(f"*{_ENTRY_SUFFIX}"):
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def stats(self) -> dict:
+        """Hit/miss counters and current size of the cache."""
+        entries = list(self._entries())
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+        }
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{_ENTRY_SUFFIX}"
+
+    def _entries(self):
+        for path in self.cache_dir.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            yield path, stat.st_size, stat.st_mtime
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+def _path_replacements(cached_path: Optional[str], file_path: Optional[str]) -> Dict[str, str]:
+    """Metadata values derived from the cached path, mapped to those of the requested one."""
+    if not cached_path or not file_path or cached_path == file_path:
+        return {}
+    cached, requested = Path(cached_path), Path(file_path)
+    replacements = {str(cached.parent): str(requested.parent), cached.name: requested.name}
+    replacements[cached_path] = file_path
+    return replacements
@@ -1,158 +1,585 @@
 """
 Tool for loading and processing various file formats using local libraries.
 """
-from typing import Optional, Type, List
+from typing import Optional, Type, List, Iterable, Iterator, Tuple
 from pydantic import BaseModel, Field
 from langchain_core.tools import BaseTool
-from langchain_community.document_loaders import (
-    CSVLoader,
-    UnstructuredExcelLoader,
-    PyPDFLoader,
-    TextLoader,
-    UnstructuredMarkdownLoader,
-    JSONLoader,
-    BSHTMLLoader,
-    UnstructuredXMLLoader,
-    UnstructuredPowerPointLoader,
-    UnstructuredWordDocumentLoader
-)
+from langchain_core.documents import Document
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import glob
 import json
+import os
+import signal
+import time
 from pathlib import Path
 
+import tracing
+
+from .document_cache import DocumentCache
+
+# Default size of a streamed chunk, in bytes of UTF-8 encoded text
+DEFAULT_CHUNK_BYTES = 64 * 1024
+# Rough bytes-per-token ratio used to turn a token budget into a byte budget
+BYTES_PER_TOKEN = 4
+# Seconds a batch waits past a file's timeout before killing its worker,
+# for workers stuck where the in-process alarm cannot interrupt them
+BATCH_TIMEOUT_MARGIN = 5.0
+
 class FileLoaderInput(BaseModel):
     file_path: str = Field(description="Path to the file to load")
     source_column: Optional[str] = Field(description="Column to use as source for CSV files", default=None)
     encoding: Optional[str] = Field(description="File encoding", default="utf-8")
     jq_schema: Optional[str] = Field(description="JQ schema for JSON files", default=None)
+    mode: Optional[str] = Field(
+        description="Fast path for CSV/Excel files: 'rows' (row batches), 'summary' (column statistics) "
+                    "or 'sample' (first rows)",
+        default=None
+    )
+    columns: Optional[List[str]] = Field(description="Columns to load from CSV/Excel files", default=None)
+    row_filter: Optional[str] = Field(
+        description="Condition CSV/Excel rows must match: column/value comparisons joined by and/or, "
+                    "e.g. \"price > 10 and region == 'EU'\"",
+        default=None
+    )
+    pages: Optional[str] = Field(description="1-based pages to load from PDF files, e.g. \"40-60\"", default=None)
+
+class FileLoadResult(BaseModel):
+    file_path: str = Field(description="Path of the loaded file")
+    content: Optional[str] = Field(description="Formatted documents, if loading succeeded", default=None)
+    error: Optional[str] = Field(description="Error raised while loading, if any", default=None)
+
+# Document loaders and their parsing libraries are imported by the _load_*
+# methods on first use, so that importing this module stays cheap
 
 class FileLoaderTool(BaseTool):
     name: str = "file_loader"
     description: str = "Load and process files of various formats (CSV, Excel, PDF, Text, Markdown, JSON, HTML, XML, PPT, DOC)"
     args_schema: Type[BaseModel] = FileLoaderInput
 
+    # Optional parse cache; when set, unchanged files are not re-parsed
+    cache: Optional[DocumentCache] = None
+    # Worker processes for PDF extraction; None uses every CPU
+    pdf_workers: Optional[int] = None
+
     def _run(
         self, 
         file_path: str, 
         source_column: Optional[str] = None,
         encoding: Optional[str] = "utf-8",
-        jq_schema: Optional[str] = None
+        jq_schema: Optional[str] = None,
+        mode: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        row_filter: Optional[str] = None,
+        pages: Optional[str] = None
     ) -> str:
+        file_format = Path(file_path).suffix.lower()
+        with tracing.span('file_loader.load', format=file_format) as span:
+            try:
+                if self._get_loader_func(file_path) is None:
+                    return f"Unsupported file format: {file_format}"
+                if tracing.enabled():
+                    tracing.incr('file_loader_bytes_total', os.path.getsize(file_path), format=file_format)
+
+                documents = self._load_documents(
+                    file_path=file_path,
+                    source_column=source_column,
+                    encoding=encoding,
+                    jq_schema=jq_schema,
+                    mode=mode,
+                    columns=columns,
+                    row_filter=row_filter,
+                    pages=pages
+                )
+
+                return self._format_documents(documents)
+
+            except Exception as e:
+                span.set(error=str(e))
+                return f"Error loading file: {str(e)}"
+
+    def load_batch(
+        self,
+        path: str,
+        source_column: Optional[str] = None,
+        encoding: Optional[str] = "utf-8",
+        jq_schema: Optional[str] = None,
+        mode: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        row_filter: Optional[str] = None,
+        pages: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> List["FileLoadResult"]:
+        """
+        Load every supported file under a directory or matching a glob.
+
+        Files are parsed in a process pool, since the document loaders are
+        CPU-bound and hold the GIL. Results come back sorted by path, each
+        with either the formatted content or the error for that file.
+
+        Args:
+            path (str): Directory (searched recursively) or glob pattern
+            source_column (Optional[str]): Column to use as source for CSV files
+            encoding (Optional[str]): File encoding
+            jq_schema (Optional[str]): JQ schema for JSON files
+            mode (Optional[str]): Fast path mode for CSV/Excel files, one of
+                                  TABULAR_MODES; None uses the LangChain loaders
+            columns (Optional[List[str]]): Columns to load from CSV/Excel files
+            row_filter (Optional[str]): Condition CSV/Excel rows must match,
+                                        see tabular_loader.parse_row_filter()
+            pages (Optional[str]): 1-based pages to load from PDF files,
+                                   e.g. "40-60" or "1,3,10-12"
+            max_workers (Optional[int]): Number of worker processes,
+                                         defaults to the CPU count
+            timeout (Optional[float]): Per-file time limit in seconds; a worker
+                                       still busy BATCH_TIMEOUT_MARGIN seconds
+                                       later is killed
+
+        Returns:
+            List[FileLoadResult]: One result per file, in path order
+        """
+        file_paths = self._expand_batch_path(path)
+        loader_args = {
+            'source_column': source_column,
+            'encoding': encoding,
+            'jq_schema': jq_schema,
+            'mode': mode,
+            'columns': columns,
+            'row_filter': row_filter,
+            'pages': pages
+        }
+        cache_args = (
+            (str(self.cache.cache_dir), self.cache.max_bytes) if self.cache is not None else None
+        )
+
+        if not file_paths:
+            return []
+
+        max_workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+        results = {}
+        # Stack of files still to load; at most max_workers are in flight,
+        # so a file starts when it is submitted and its deadline holds
+        pending = list(reversed(file_paths))
+        while pending:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+            running = {}
+            stuck = False
+            try:
+                while pending or running:
+                    while pending and len(running) < max_workers:
+                        file_path = pending.pop()
+                        future = executor.submit(_load_file_worker, file_path, loader_args, cache_args, timeout)
+                        deadline = time.monotonic() + timeout + BATCH_TIMEOUT_MARGIN if timeout else None
+                        running[future] = (file_path, deadline)
+
+                    deadlines = [deadline for _, deadline in running.values() if deadline is not None]
+                    wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+                    done, _ = wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        file_path, _ = running.pop(future)
+                        results[file_path] = _batch_result(file_path, future)
+
+                    now = time.monotonic()
+                    expired = [
+                        future for future, (_, deadline) in running.items()
+                        if deadline is not None and deadline <= now
+                    ]
+                    if expired:
+                        for future in expired:
+                            file_path, _ = running.pop(future)
+                            results[file_path] = FileLoadResult(
+                                file_path=file_path,
+                                error=f"TimeoutError: Loading took longer than {timeout} seconds"
+                            )
+                        # The pool is killed; rerun the other files in flight on a new one
+                        pending.extend(file_path for file_path, _ in running.values())
+                        stuck = True
+                        break
+            finally:
+                if stuck:
+                    _terminate_pool(executor)
+                else:
+                    executor.shutdown()
+        return [results[file_path] for file_path in file_paths]
+
+    def _expand_batch_path(self, path: str) -> List[str]:
+        if Path(path).is_dir():
+            candidates = (str(p) for p in Path(path).rglob('*'))
+        else:
+            candidates = glob.glob(path, recursive=True)
+        return sorted(
+            p for p in candidates
+            if Path(p).is_file() and self._get_loader_func(p) is not None
+        )
+
+    def load_documents(
+        self,
+        file_path: str,
+        source_column: Optional[str] = None,
+        encoding: Optional[str] = "utf-8",
+        jq_schema: Optional[str] = None,
+        mode: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        row_filter: Optional[str] = None,
+        pages: Optional[str] = None
+    ) -> List[Document]:
+        """
+        Load a file as LangChain documents, e.g. for a vector store.
+
+        Args:
+            file_path (str): Path to the file to load
+            source_column (Optional[str]): Column to use as source for CSV files
+            encoding (Optional[str]): File encoding
+            jq_schema (Optional[str]): JQ schema for JSON files
+            mode (Optional[str]): Fast path mode for CSV/Excel files, one of
+                                  TABULAR_MODES; None uses the LangChain loaders
+            columns (Optional[List[str]]): Columns to load from CSV/Excel files
+            row_filter (Optional[str]): Condition CSV/Excel rows must match,
+                                        see tabular_loader.parse_row_filter()
+            pages (Optional[str]): 1-based pages to load from PDF files,
+                                   e.g. "40-60" or "1,3,10-12"
+
+        Returns:
+            List[Document]: Loaded documents with their metadata
+
+        Raises:
+            ValueError: If the file format is not supported
+        """
+        return list(self._load_documents(
+            file_path, source_column, encoding, jq_schema, mode, columns, row_filter, pages
+        ))
+
+    def _load_documents(
+        self,
+        file_path: str,
+        source_column: Optional[str] = None,
+        encoding: Optional[str] = "utf-8",
+        jq_schema: Optional[str] = None,
+        mode: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        row_filter: Optional[str] = None,
+        pages: Optional[str] = None
+    ) -> Iterable[Document]:
+        """
+        Load documents for a file, going through the parse cache if one is set.
+
+        Raises:
+            ValueError: If the file format is not supported
+        """
+        loader_func = self._get_loader_func(file_path)
+        if loader_func is None:
+            raise ValueError(f"Unsupported file format: {Path(file_path).suffix.lower()}")
+
+        loader_args = {
+            'source_column': source_column,
+            'encoding': encoding,
+            'jq_schema': jq_schema,
+            'mode': mode,
+            'columns': columns,
+            'row_filter': row_filter,
+            'pages': pages
+        }
+        if self.cache is None:
+            return loader_func(file_path=file_path, **loader_args)
+
+        key = self.cache.make_key(file_path, **loader_args)
+        documents = self.cache.get(key, file_path)
+        if documents is None:
+            documents = list(loader_func(file_path=file_path, **loader_args))
+            self.cache.put(key, documents, file_path)
+        return documents
+
+    def iter_chunks(
+        self,
+        file_path: str,
+        source_column: Optional[str] = None,
+        encoding: Optional[str] = "utf-8",
+        jq_schema: Optional[str] = None,
+        mode: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        row_filter: Optional[str] = None,
+        pages: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_tokens: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Stream a file as formatted chunks of bounded size.
+
+        Documents are pulled lazily from the loader, so the first chunk is
+        available as soon as the first pages/rows are parsed and memory stays
+        proportional to the chunk size rather than the file size.
+
+        Args:
+            file_path (str): Path to the file to load
+            source_column (Optional[str]): Column to use as source for CSV files
+            encoding (Optional[str]): File encoding
+            jq_schema (Optional[str]): JQ schema for JSON files
+            mode (Optional[str]): Fast path mode for CSV/Excel files, one of
+                                  TABULAR_MODES; None uses the LangChain loaders
+            columns (Optional[List[str]]): Columns to load from CSV/Excel files
+            row_filter (Optional[str]): Condition CSV/Excel rows must match,
+                                        see tabular_loader.parse_row_filter()
+            pages (Optional[str]): 1-based pages to load from PDF files,
+                                   e.g. "40-60" or "1,3,10-12"
+            max_bytes (Optional[int]): Maximum UTF-8 size of each chunk
+            max_tokens (Optional[int]): Approximate token budget per chunk,
+                                        used when max_bytes is not given
+
+        Yields:
+            str: Formatted chunks, each at most the configured budget
+        """
+        if max_bytes is None:
+            max_bytes = max_tokens * BYTES_PER_TOKEN if max_tokens else DEFAULT_CHUNK_BYTES
+        if max_bytes <= 0:
+            raise ValueError("Chunk budget must be positive")
+
+        loader_func = self._get_loader_func(file_path)
+        if loader_func is None:
+            yield f"Unsupported file format: {Path(file_path).suffix.lower()}"
+            return
+
         try:
-            file_extension = Path(file_path).suffix.lower()
-            
-            loaders = {
-                '.csv': self._load_csv,
-                '.xlsx': self._load_excel,
-                '.xls': self._load_excel,
-                '.pdf': self._load_pdf,
-                '.txt': self._load_text,
-                '.md': self._load_markdown,
-                '.json': self._load_json,
-                '.html': self._load_html,
-                '.htm': self._load_html,
-                '.xml': self._load_xml,
-                '.pptx': self._load_powerpoint,
-                '.ppt': self._load_powerpoint,
-                '.docx': self._load_word,
-                '.doc': self._load_word
+            loader_args = {
+                'source_column': source_column,
+                'encoding': encoding,
+                'jq_schema': jq_schema,
+                'mode': mode,
+                'columns': columns,
+                'row_filter': row_filter,
+                'pages': pages
             }
-            
-            if file_extension not in loaders:
-                return f"Unsupported file format: {file_extension}"
-            
-            loader_func = loaders[file_extension]
-            documents = loader_func(
-                file_path=file_path,
-                source_column=source_column,
-                encoding=encoding,
-                jq_schema=jq_schema
-            )
-            
-            return self._format_documents(documents)
-            
+            documents = None
+            if self.cache is not None:
+                # Serve hits from the cache, but stream misses straight from
+                # the loader rather than materialising them for storage
+                documents = self.cache.get(self.cache.make_key(file_path, **loader_args), file_path)
+            if documents is None:
+                documents = loader_func(file_path=file_path, **loader_args)
+            yield from self._chunk_documents(documents, max_bytes)
         except Exception as e:
-            return f"Error loading file: {str(e)}"
+            yield f"Error loading file: {str(e)}"
+
+    def _get_loader_func(self, file_path: str):
+        file_extension = Path(file_path).suffix.lower()
+        
+        loaders = {
+            '.csv': self._load_csv,
+            '.xlsx': self._load_excel,
+            '.xls': self._load_excel,
+            '.pdf': self._load_pdf,
+            '.txt': self._load_text,
+            '.md': self._load_markdown,
+            '.json': self._load_json,
+            '.html': self._load_html,
+            '.htm': self._load_html,
+            '.xml': self._load_xml,
+            '.pptx': self._load_powerpoint,
+            '.ppt': self._load_powerpoint,
+            '.docx': self._load_word,
+            '.doc': self._load_word
+        }
+        return loaders.get(file_extension)
+
+    def _load_csv(self, file_path: str, source_column: Optional[str] = None, **kwargs) -> Iterator[Document]:
+        if kwargs.get('mode') or kwargs.get('columns') or kwargs.get('row_filter'):
+            return self._load_tabular(file_path, **kwargs)
+        from langchain_community.document_loaders import CSVLoader
 
-    def _load_csv(self, file_path: str, source_column: Optional[str] = None, **kwargs) -> List:
         loader = CSVLoader(
             file_path=file_path,
             source_column=source_column,
+            encoding=kwargs.get('encoding') or 'utf-8',
             csv_args={
                 'delimiter': ',',
-                'quotechar': '"',
-                'encoding': kwargs.get('encoding', 'utf-8')
+                'quotechar': '"'
             }
         )
-        return loader.load()
+        return loader.lazy_load()
+
+    def _load_excel(self, file_path: str, **kwargs) -> Iterator[Document]:
+        if kwargs.get('mode') or kwargs.get('columns') or kwargs.get('row_filter'):
+            return self._load_tabular(file_path, **kwargs)
+        from langchain_community.document_loaders import UnstructuredExcelLoader
 
-    def _load_excel(self, file_path: str, **kwargs) -> List:
         loader = UnstructuredExcelLoader(
             file_path=file_path,
             mode="elements"
         )
-        return loader.load()
+        return loader.lazy_load()
 
-    def _load_pdf(self, file_path: str, **kwargs) -> List:
-        loader = PyPDFLoader(file_path)
-        return loader.load()
+    def _load_tabular(self, file_path: str, **kwargs) -> Iterator[Document]:
+        """Columnar pandas fast path, which batches rows instead of one Document per row."""
+        from .tabular_loader import load_tabular
+
+        return load_tabular(
+            file_path,
+            mode=kwargs.get('mode') or 'rows',
+            columns=kwargs.get('columns'),
+            row_filter=kwargs.get('row_filter'),
+            encoding=kwargs.get('encoding')
+        )
+
+    def _load_pdf(self, file_path: str, **kwargs) -> Iterator[Document]:
+        from .pdf_extract import iter_pdf_pages
+
+        return iter_pdf_pages(file_path, pages=kwargs.get('pages'), max_workers=self.pdf_workers)
+
+    def _load_text(self, file_path: str, **kwargs) -> Iterator[Document]:
+        from langchain_community.document_loaders import TextLoader
 
-    def _load_text(self, file_path: str, **kwargs) -> List:
         loader = TextLoader(
             file_path,
             encoding=kwargs.get('encoding', 'utf-8')
         )
-        return loader.load()
+        return loader.lazy_load()
+
+    def _load_markdown(self, file_path: str, **kwargs) -> Iterator[Document]:
+        from langchain_community.document_loaders import UnstructuredMarkdownLoader
 
-    def _load_markdown(self, file_path: str, **kwargs) -> List:
         loader = UnstructuredMarkdownLoader(
             file_path,
             mode="elements"
         )
-        return loader.load()
+        return loader.lazy_load()
+
+    def _load_json(self, file_path: str, **kwargs) -> Iterator[Document]:
+        from langchain_community.document_loaders import JSONLoader
 
-    def _load_json(self, file_path: str, **kwargs) -> List:
         jq_schema = kwargs.get('jq_schema', '.')
         loader = JSONLoader(
             file_path=file_path,
             jq_schema=jq_schema,
             text_content=False
         )
-        return loader.load()
+        return loader.lazy_load()
+
+    def _load_html(self, file_path: str, **kwargs) -> Iterator[Document]:
+        from langchain_community.document_loaders import BSHTMLLoader
 
-    def _load_html(self, file_path: str, **kwargs) -> List:
         loader = BSHTMLLoader(
             file_path,
             open_encoding=kwargs.get('encoding', 'utf-8')
         )
-        return loader.load()
+        return loader.lazy_load()
+
+    def _load_xml(self, file_path: str, **kwargs) -> Iterator[Document]:
+        from langchain_community.document_loaders import UnstructuredXMLLoader
 
-    def _load_xml(self, file_path: str, **kwargs) -> List:
         loader = UnstructuredXMLLoader(
             file_path,
             mode="elements"
         )
-        return loader.load()
+        return loader.lazy_load()
+
+    def _load_powerpoint(self, file_path: str, **kwargs) -> Iterator[Document]:
+        from langchain_community.document_loaders import UnstructuredPowerPointLoader
 
-    def _load_powerpoint(self, file_path: str, **kwargs) -> List:
         loader = UnstructuredPowerPointLoader(
             file_path,
             mode="elements"
         )
-        return loader.load()
+        return loader.lazy_load()
+
+    def _load_word(self, file_path: str, **kwargs) -> Iterator[Document]:
+        from langchain_community.document_loaders import UnstructuredWordDocumentLoader
 
-    def _load_word(self, file_path: str, **kwargs) -> List:
         loader = UnstructuredWordDocumentLoader(
             file_path,
             mode="elements"
         )
-        return loader.load()
+        return loader.lazy_load()
+
+    def _format_document(self, doc: Document) -> str:
+        content = doc.page_content.strip()
+        metadata = doc.metadata
+        return f"Content:\n{content}\n\nMetadata:\n{metadata}\n{'='*50}"
+
+    def _format_documents(self, documents: Iterable[Document]) -> str:
+        return "\n".join(self._format_document(doc) for doc in documents)
 
-    def _format_documents(self, documents: list) -> str:
-        formatted_output = []
+    def _chunk_documents(self, documents: Iterable[Document], max_bytes: int) -> Iterator[str]:
+        """
+        Pack formatted documents into chunks of at most max_bytes.
+
+        Documents that are larger than the budget on their own are split
+        across several chunks.
+        """
+        buffer = []
+        buffer_size = 0
         for doc in documents:
-            content = doc.page_content.strip()
-            metadata = doc.metadata
-            formatted_output.append(
-                f"Content:\n{content}\n\nMetadata:\n{metadata}\n{'='*50}"
-            )
-        return "\n".join(formatted_output) 
\ No newline at end of file
+            formatted = self._format_document(doc).encode('utf-8')
+            # Account for the newline separator used by _format_documents
+            size = len(formatted) + (1 if buffer else 0)
+
+            if buffer and buffer_size + size > max_bytes:
+                yield b"\n".join(buffer).decode('utf-8')
+                buffer, buffer_size = [], 0
+                size = len(formatted)
+
+            if size > max_bytes:
+                for piece in _split_utf8(formatted, max_bytes):
+                    yield piece
+                continue
+
+            buffer.append(formatted)
+            buffer_size += size
+
+        if buffer:
+            yield b"\n".join(buffer).decode('utf-8')
+
+
+def _load_file_worker(
+    file_path: str,
+    loader_args: dict,
+    cache_args: Optional[Tuple[str, int]] = None,
+    timeout: Optional[float] = None
+) -> str:
+    """Load and format a single file inside a batch worker process."""
+    cache = DocumentCache(*cache_args) if cache_args else None
+    # The batch already runs one process per file; extract PDFs in-process
+    tool = FileLoaderTool(cache=cache, pdf_workers=1)
+
+    # Enforce the per-file time limit inside the worker so a slow file
+    # cannot hold up the pool; SIGALRM is not available on every platform
+    use_alarm = bool(timeout) and hasattr(signal, 'setitimer')
+    if use_alarm:
+        def _on_timeout(signum, frame):
+            raise TimeoutError(f"Loading took longer than {timeout} seconds")
+        previous = signal.signal(signal.SIGALRM, _on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return tool._format_documents(tool._load_documents(file_path, **loader_args))
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def _batch_result(file_path: str, future) -> FileLoadResult:
+    try:
+        return FileLoadResult(file_path=file_path, content=future.result())
+    except Exception as e:
+        return FileLoadResult(file_path=file_path, error=f"{type(e).__name__}: {e}")
+
+def _terminate_pool(executor: ProcessPoolExecutor) -> None:
+    """Kill the workers of a process pool, including ones stuck in C code."""
+    # ProcessPoolExecutor has no public way to kill busy workers before 3.14
+    processes = list((getattr(executor, '_processes', None) or {}).values())
+    for process in processes:
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.join()
+
+def _split_utf8(data: bytes, max_bytes: int) -> Iterator[str]:
+    """Split encoded text into pieces of at most max_bytes without breaking characters."""
+    start = 0
+    while start < len(data):
+        end = min(start + max_bytes, len(data))
+        # Step back to a character boundary (UTF-8 continuation bytes are 0b10xxxxxx)
+        while end < len(data) and end > start and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        if end == start:
+            end = min(start + max_bytes, len(data))
+        yield data[start:end].decode('utf-8', errors='ignore')
+        start = end
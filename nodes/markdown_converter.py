@@ -0,0 +1,241 @@
+"""
+Single-pass conversion of plain text to markdown.
+
+The converter reads one line at a time and keeps at most one paragraph
+line and the current table in memory, so it runs in linear time and can
+emit output before the whole input has been read.
+"""
+import re
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+HTML_HEADING_PATTERN = re.compile(r"^\s*<h([1-6])[^>]*>(.*?)</h\1>\s*$", re.IGNORECASE)
+SETEXT_UNDERLINE_PATTERN = re.compile(r"^\s*(={3,}|-{3,})\s*$")
+# Short, standalone upper case lines such as "RESULTS AND DISCUSSION"
+CAPS_HEADING_PATTERN = re.compile(r"^[A-Z0-9][A-Z0-9 &/,.:'()\-]{2,78}$")
+BULLET_PATTERN = re.compile(r"^(\s*)[•◦▪‣●○■–·]\s*(.*)$")
+# "1)" and "(1)" style items, rewritten as "1."
+ORDERED_ITEM_PATTERN = re.compile(r"^(\s*)\(?(\d{1,3})\)\s+(.*)$")
+# Lines markdown already gives a meaning to, passed through unchanged
+MARKDOWN_BLOCK_PATTERN = re.compile(r"^\s*(?:#{1,6}\s|>|[-*+]\s|\d{1,3}\.\s|(?:[-*_]\s*){3,}$)")
+PIPE_ROW_PATTERN = re.compile(r"^\s*\|.*\|\s*$")
+TABLE_SEPARATOR_PATTERN = re.compile(r"^\s*\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*$")
+TAB_PATTERN = re.compile(r"\t+")
+# Bare URLs, not already inside <...>, [...] or a markdown link target
+URL_PATTERN = re.compile(r"(?<![<\[])(?<!\]\()\bhttps?://[^\s<>\"'`]*[^\s<>\"'`.,;:!?)\]}]")
+
+BULLET_CHARS = frozenset("•◦▪‣●○■–·")
+
+class MarkdownConverter:
+    """
+    Incremental plain text to markdown converter.
+
+    Detects headings (HTML, underlined and standalone upper case lines),
+    bullet and numbered lists, tab-separated and pipe tables, fenced code
+    blocks and bare links. Text that already is markdown is kept as is, and
+    runs of blank lines are collapsed into one.
+
+    Feed lines with feed() and call finish() at the end of the input; both
+    return the output lines that are complete.
+    """
+
+    def __init__(self):
+        self._fence: Optional[str] = None
+        # Paragraph line held back until the next line shows whether it is a heading
+        self._pending: Optional[str] = None
+        self._pending_isolated = False
+        self._table: List[Tuple[str, List[str]]] = []
+        self._table_kind: Optional[str] = None
+        self._prev_blank = True
+        self._need_blank = False
+        self._started = False
+
+    def feed(self, line: str) -> List[str]:
+        """
+        Convert the next input line.
+
+        Args:
+            line (str): Input line, with or without its line break
+
+        Returns:
+            List[str]: Output lines without line breaks
+        """
+        line = line.rstrip('\r\n')
+        out = []
+        if self._fence is not None:
+            out.append(line)
+            if line.lstrip().startswith(self._fence):
+                self._fence = None
+            return out
+
+        stripped = line.strip()
+        head = stripped[:1]
+        if self._pending is not None and head in ('=', '-') and SETEXT_UNDERLINE_PATTERN.match(line):
+            level = '#' if head == '=' else '##'
+            text = self._pending.strip()
+            self._pending = None
+            self._emit(out, f"{level} {_link_urls(text)}")
+            return out
+
+        kind, cells = self._table_row(line, head)
+        if self._table and (kind != self._table_kind or (kind == 'tab' and len(cells) != len(self._table[0][1]))):
+            self._flush_table(out)
+        if kind is not None:
+            self._flush_pending(out, next_blank=False)
+            self._table.append((line, cells))
+            self._table_kind = kind
+            self._prev_blank = False
+            return out
+
+        if not stripped:
+            self._flush_pending(out, next_blank=True)
+            self._need_blank = self._started
+            self._prev_blank = True
+            return out
+
+        self._flush_pending(out, next_blank=False)
+        isolated = self._prev_blank
+        self._prev_blank = False
+
+        if head in ('`', '~'):
+            fence = FENCE_PATTERN.match(line)
+            if fence:
+                self._fence = fence.group(1)
+                self._emit(out, line)
+                return out
+        if head == '<':
+            heading = HTML_HEADING_PATTERN.match(line)
+            if heading:
+                self._emit(out, f"{'#' * int(heading.group(1))} {_link_urls(heading.group(2).strip())}")
+                return out
+        if head in BULLET_CHARS:
+            bullet = BULLET_PATTERN.match(line)
+            self._emit(out, f"{bullet.group(1)}- {_link_urls(bullet.group(2))}")
+            return out
+        if head.isdigit() or head == '(':
+            item = ORDERED_ITEM_PATTERN.match(line)
+            if item:
+                self._emit(out, f"{item.group(1)}{item.group(2)}. {_link_urls(item.group(3))}")
+                return out
+        if head in '#>-*+_' or head.isdigit():
+            if MARKDOWN_BLOCK_PATTERN.match(line):
+                self._emit(out, _link_urls(line))
+                return out
+        if line.startswith(('    ', '\t')):
+            # Indented code
+            self._emit(out, line)
+            return out
+
+        self._pending = line
+        self._pending_isolated = isolated
+        return out
+
+    def finish(self) -> List[str]:
+        """
+        Flush the lines held back at the end of the input.
+
+        Returns:
+            List[str]: Remaining output lines
+        """
+        out = []
+        self._flush_pending(out, next_blank=True)
+        self._flush_table(out)
+        return out
+
+    def _emit(self, out: List[str], line: str) -> None:
+        if self._need_blank:
+            out.append('')
+            self._need_blank = False
+        out.append(line)
+        self._started = True
+
+    def _flush_pending(self, out: List[str], next_blank: bool) -> None:
+        if self._pending is None:
+            return
+        line, self._pending = self._pending, None
+        if next_blank and self._pending_isolated and _is_caps_heading(line):
+            self._emit(out, f"## {line.strip()}")
+        else:
+            self._emit(out, _link_urls(line))
+
+    def _table_row(self, line: str, head: str) -> Tuple[Optional[str], List[str]]:
+        if head == '|' and PIPE_ROW_PATTERN.match(line):
+            return 'pipe', line.strip().strip('|').split('|')
+        # Indented lines are code, whose tabs are not column separators
+        if '\t' in line and head and not line.startswith(('    ', '\t')):
+            cells = TAB_PATTERN.split(line.strip())
+            if len(cells) > 1:
+                return 'tab', cells
+        return None, []
+
+    def _flush_table(self, out: List[str]) -> None:
+        rows, self._table = self._table, []
+        if not rows:
+            return
+        if len(rows) == 1:
+            # A single row is not a table
+            self._emit(out, _link_urls(rows[0][0]))
+            return
+        # Tables need blank lines around them to not merge with adjacent blocks
+        self._need_blank = self._started
+        if self._table_kind == 'pipe':
+            self._emit(out, _link_urls(rows[0][0].strip()))
+            if not TABLE_SEPARATOR_PATTERN.match(rows[1][0]):
+                out.append('|' + ' --- |' * len(rows[0][1]))
+            for line, _ in rows[1:]:
+                out.append(_link_urls(line.strip()))
+        else:
+            header = rows[0][1]
+            self._emit(out, _table_line(header))
+            out.append('|' + ' --- |' * len(header))
+            for _, cells in rows[1:]:
+                out.append(_table_line(cells))
+        self._need_blank = True
+
+def iter_markdown(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Convert a stream of plain text lines to markdown.
+
+    Args:
+        lines (Iterable[str]): Input lines, e.g. an open text file
+
+    Yields:
+        str: Output lines without line breaks, as soon as they are complete
+    """
+    converter = MarkdownConverter()
+    for line in lines:
+        yield from converter.feed(line)
+    yield from converter.finish()
+
+def convert_to_markdown(text: str) -> str:
+    """
+    Convert plain text to markdown.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        str: Markdown text
+    """
+    return '\n'.join(iter_markdown(text.splitlines()))
+
+def _is_caps_heading(line: str) -> bool:
+    line = line.strip()
+    return (
+        CAPS_HEADING_PATTERN.match(line) is not None
+        and sum(char.isalpha() for char in line) >= 2
+    )
+
+def _table_line(cells: List[str]) -> str:
+    return '| ' + ' | '.join(_link_urls(cell.strip().replace('|', '\\|')) for cell in cells) + ' |'
+
+def _link_urls(text: str) -> str:
+    """Turn bare URLs into autolinks, leaving inline code alone."""
+    if '://' not in text:
+        return text
+    if '`' not in text:
+        return URL_PATTERN.sub(r"<\g<0>>", text)
+    parts = text.split('`')
+    for i in range(0, len(parts), 2):
+        parts[i] = URL_PATTERN.sub(r"<\g<0>>", parts[i])
+    return '`'.join(parts)
@@ -0,0 +1,142 @@
+"""
+Page-parallel text extraction from memory-mapped PDF files.
+"""
+import atexit
+import mmap
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+from langchain_core.documents import Document
+from pypdf import PdfReader
+
+# Pages extracted per worker task
+DEFAULT_PAGES_PER_TASK = 8
+# Selections smaller than this are extracted in the calling process
+MIN_PARALLEL_PAGES = 16
+
+PageSelection = Union[str, int, Sequence[int], None]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+def parse_page_selection(pages: PageSelection, page_count: int) -> List[int]:
+    """
+    Turn a page selection into sorted, zero-based page indices.
+
+    Args:
+        pages (PageSelection): 1-based pages, e.g. "40-60", "1,3,10-12", 7 or
+                               [1, 2, 3]; None selects every page
+        page_count (int): Number of pages in the document
+
+    Returns:
+        List[int]: Zero-based indices of the selected pages that exist
+
+    Raises:
+        ValueError: If the selection cannot be parsed
+    """
+    if pages is None:
+        return list(range(page_count))
+    if isinstance(pages, int):
+        pages = [pages]
+    if isinstance(pages, str):
+        numbers = []
+        for part in pages.replace(' ', '').split(','):
+            if not part:
+                continue
+            start, dash, end = part.partition('-')
+            try:
+                first = int(start) if start else 1
+                last = (int(end) if end else page_count) if dash else first
+            except ValueError:
+                raise ValueError(f"Invalid page selection: {pages!r}") from None
+            numbers.extend(range(first, last + 1))
+        pages = numbers
+    return sorted({page - 1 for page in pages if 1 <= page <= page_count})
+
+def iter_pdf_pages(
+    file_path: str,
+    pages: PageSelection = None,
+    max_workers: Optional[int] = None,
+    pages_per_task: int = DEFAULT_PAGES_PER_TASK
+) -> Iterator[Document]:
+    """
+    Extract the text of a PDF's pages, in page order.
+
+    The file is memory-mapped, so only the objects of the selected pages
+    are read from disk. Large selections are split into page ranges that
+    worker processes extract in parallel; pages are yielded in order as
+    soon as their range is done, with at most max_workers ranges in flight.
+
+    Args:
+        file_path (str): Path to the PDF file
+        pages (PageSelection): 1-based page selection, e.g. "40-60"
+        max_workers (Optional[int]): Ranges extracted at once, defaults to
+                                     the CPU count; 1 extracts in this
+                                     process
+        pages_per_task (int): Pages per worker task
+
+    Yields:
+        Document: One document per page with source, page (zero-based)
+                  and total_pages metadata
+    """
+    with _open_pdf(file_path) as reader:
+        total_pages = len(reader.pages)
+        indices = parse_page_selection(pages, total_pages)
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers == 1 or len(indices) < MIN_PARALLEL_PAGES:
+            for index in indices:
+                yield _page_document(file_path, index, reader.pages[index].extract_text(), total_pages)
+            return
+
+    tasks = deque(indices[start:start + pages_per_task] for start in range(0, len(indices), pages_per_task))
+    pool = _get_pool()
+    in_flight = deque()
+    while tasks or in_flight:
+        while tasks and len(in_flight) < max_workers:
+            in_flight.append(pool.submit(_extract_pages, file_path, tasks.popleft()))
+        for index, text in in_flight.popleft().result():
+            yield _page_document(file_path, index, text, total_pages)
+
+@contextmanager
+def _open_pdf(file_path: str) -> Iterator[PdfReader]:
+    """Open a PDF through a read-only memory map."""
+    with open(file_path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield PdfReader(mapped)
+    finally:
+        mapped.close()
+
+def _extract_pages(file_path: str, indices: List[int]) -> List[Tuple[int, str]]:
+    """Worker task: extract the text of a range of pages."""
+    with _open_pdf(file_path) as reader:
+        return [(index, reader.pages[index].extract_text()) for index in indices]
+
+def _page_document(file_path: str, index: int, text: str, total_pages: int) -> Document:
+    return Document(
+        page_content=text,
+        metadata={'source': file_path, 'page': index, 'total_pages': total_pages}
+    )
+
+def _get_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared extraction pool.
+
+    It has one process per CPU and is never resized, since other threads
+    may be submitting to it; callers bound their own tasks in flight.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        return _pool
+
+@atexit.register
+def _shutdown_pool() -> None:
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
@@ -2,66 +2,129 @@
 Tool for executing Python code in a sandboxed environment.
 """
 import os
-from typing import Optional, Type
+import threading
+from typing import Dict, Optional, Type
 from pydantic import BaseModel, Field
 from langchain_core.tools import BaseTool
-import e2b
+
+import tracing
+
+from .sandbox_pool import SANDBOX_BACKENDS, SandboxPool
+
+# Sandbox backend used when none is passed: 'e2b' or 'local'
+DEFAULT_BACKEND = os.getenv('PYTHON_EXECUTOR_BACKEND', 'e2b')
+
+# Process-wide sandbox pools, one per backend
+_pools: Dict[str, SandboxPool] = {}
+_pools_lock = threading.Lock()
+
+def get_sandbox_pool(backend: str) -> SandboxPool:
+    """
+    Return the shared sandbox pool for a backend, creating it on first use.
+
+    Args:
+        backend (str): Name of a registered sandbox backend
+
+    Returns:
+        SandboxPool: Pool shared by every tool using the backend
+    """
+    with _pools_lock:
+        if backend not in _pools:
+            _pools[backend] = SandboxPool(SANDBOX_BACKENDS[backend])
+        return _pools[backend]
 
 class PythonCodeInput(BaseModel):
     code: str = Field(description="Python code to execute")
+    session_id: Optional[str] = Field(
+        description="Executions with the same session id share interpreter state",
+        default=None
+    )
 
 class PythonExecutorTool(BaseTool):
     name: str = "python_executor"
     description: str = "Execute Python code in a sandboxed environment"
     args_schema: Type[BaseModel] = PythonCodeInput
 
-    def __init__(self, api_key: Optional[str] = None):
+    backend: str = DEFAULT_BACKEND
+    pool: Optional[SandboxPool] = None
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        backend: Optional[str] = None,
+        pool: Optional[SandboxPool] = None
+    ):
         """
         Initialize the Python executor tool.
-        
+
         Args:
-            api_key (Optional[str]): E2B API key. If not provided, 
+            api_key (Optional[str]): E2B API key. If not provided,
                                      tries to read from environment variable.
+            backend (Optional[str]): Sandbox backend, 'e2b' or 'local'.
+                                     Defaults to PYTHON_EXECUTOR_BACKEND.
+            pool (Optional[SandboxPool]): Sandbox pool to execute in. Defaults
+                                          to the shared pool of the backend.
         """
         super().__init__()
-        
-        # Get API key from parameter or environment
-        e2b_api_key = api_key or os.getenv('E2B_API_KEY')
-        
-        if not e2b_api_key:
-            raise ValueError("E2B API key is required. Set E2B_API_KEY environment variable.")
-        
-        # Set the API key for E2B
-        os.environ['E2B_API_KEY'] = e2b_api_key
-
-    def _run(self, code: str) -> str:
+
+        backend = backend or DEFAULT_BACKEND
+        if backend not in SANDBOX_BACKENDS:
+            raise ValueError(f"Unsupported sandbox backend: {backend}")
+        self.backend = backend
+        self.pool = pool
+
+        if backend == 'e2b':
+            # Get API key from parameter or environment
+            e2b_api_key = api_key or os.getenv('E2B_API_KEY')
+
+            if not e2b_api_key:
+                raise ValueError("E2B API key is required. Set E2B_API_KEY environment variable.")
+
+            # Set the API key for E2B
+            os.environ['E2B_API_KEY'] = e2b_api_key
+
+    def _run(self, code: str, session_id: Optional[str] = None) -> str:
         """
         Execute Python code in a sandboxed environment.
-        
+
         Args:
             code (str): Python code to execute
-        
+            session_id (Optional[str]): Reuse the sandbox, and its interpreter
+                                        state, of earlier executions with the
+                                        same id
+
         Returns:
             str: Output of the executed code
         """
         try:
-            # Create a new E2B data analysis sandbox
-            sandbox = e2b.DataAnalysisTool()
-            
-            # Execute the code
-            result = sandbox.run_python(code)
-            
-            # Close the sandbox
-            sandbox.close()
-            
-            return result
+            pool = self.pool or get_sandbox_pool(self.backend)
+            with pool.session(session_id) as sandbox:
+                with tracing.span('sandbox.run', backend=self.backend, code_bytes=len(code.encode('utf-8'))):
+                    return sandbox.run(code)
         except Exception as e:
             return f"Error executing Python code: {str(e)}"
 
+    def warmup(self) -> None:
+        """Start the pool's minimum number of sandboxes ahead of the first run."""
+        (self.pool or get_sandbox_pool(self.backend)).warmup()
+
+    def close(self) -> None:
+        """
+        Close the sandbox pool the tool executes in. A shared pool is
+        dropped, so the next tool on the backend starts a fresh one.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            return
+        with _pools_lock:
+            pool = _pools.pop(self.backend, None)
+        if pool is not None:
+            pool.close()
+
     def as_tool(self):
         """
         Convert the tool to a Langchain tool format.
-        
+
         Returns:
             dict: Tool configuration
         """
@@ -69,4 +132,4 @@ class PythonExecutorTool(BaseTool):
             "name": self.name,
             "description": self.description,
             "func": self._run
-        } 
\ No newline at end of file
+        }
\ No newline at end of file
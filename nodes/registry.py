@@ -0,0 +1,106 @@
+"""
+Registry of shared, configured tool instances.
+"""
+import threading
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+class ToolRegistry:
+    """
+    Process-wide cache of configured tool instances.
+
+    Each tool is built once, on first use or by warmup(), and the instance,
+    with the clients and connections it holds, is shared by every caller
+    afterwards. Tools must be safe to run from several threads at once, as
+    the workflow planner runs independent calls in parallel.
+
+    Tools may define warmup() and close() methods; the registry calls them
+    from its own warmup() and close().
+    """
+
+    def __init__(self, tool_configs: List[dict]):
+        """
+        Args:
+            tool_configs (List[dict]): Tool configs with 'id' and a 'tool'
+                                       factory, as in AVAILABLE_TOOLS
+        """
+        self._factories = {tool_config['id']: tool_config['tool'] for tool_config in tool_configs}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        # One lock per tool, so a slow constructor only blocks callers of that tool
+        self._build_locks = {tool_id: threading.Lock() for tool_id in self._factories}
+
+    def ids(self) -> List[str]:
+        return list(self._factories)
+
+    def __contains__(self, tool_id: str) -> bool:
+        return tool_id in self._factories
+
+    def get(self, tool_id: str) -> Optional[Any]:
+        """
+        Return the shared instance of a tool, building it on first use.
+
+        A constructor that raises is retried on the next call rather than
+        cached, so e.g. a missing API key can be fixed without a restart.
+
+        Args:
+            tool_id (str): Id of the tool
+
+        Returns:
+            Optional[Any]: The tool, or None if no tool has this id
+        """
+        if tool_id not in self._factories:
+            return None
+        tool = self._instances.get(tool_id)
+        if tool is not None:
+            return tool
+        with self._build_locks[tool_id]:
+            tool = self._instances.get(tool_id)
+            if tool is None:
+                tool = self._factories[tool_id]()
+                with self._lock:
+                    self._instances[tool_id] = tool
+            return tool
+
+    def factories(self) -> Dict[str, Callable[[], Any]]:
+        """Factories returning the shared instances, in the form the workflow planner takes."""
+        return {tool_id: partial(self.get, tool_id) for tool_id in self._factories}
+
+    def warmup(self, tool_ids: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """
+        Build tools ahead of the first request and run their warmup hooks.
+
+        Args:
+            tool_ids (Optional[Iterable[str]]): Tools to warm up, defaults to all
+
+        Returns:
+            Dict[str, str]: Error message by id of each tool that failed
+        """
+        errors = {}
+        for tool_id in tool_ids if tool_ids is not None else self.ids():
+            try:
+                tool = self.get(tool_id)
+                if tool is None:
+                    errors[tool_id] = f"Unknown tool: {tool_id}"
+                elif callable(getattr(tool, 'warmup', None)):
+                    tool.warmup()
+            except Exception as e:
+                errors[tool_id] = str(e)
+        return errors
+
+    def close(self) -> None:
+        """
+        Run the close hooks of the built tools and drop them.
+
+        The registry stays usable; tools are rebuilt on their next use.
+        """
+        with self._lock:
+            tools = list(self._instances.items())
+            self._instances.clear()
+        for tool_id, tool in tools:
+            close = getattr(tool, 'close', None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    print(f"Closing tool {tool_id} failed: {e}")
@@ -0,0 +1,623 @@
+"""
+Pool of reusable sandboxes for the Python executor tool.
+"""
+import json
+import os
+import selectors
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import tracing
+
+
+# Default pool sizing and lifetimes
+DEFAULT_MIN_SIZE = 1
+DEFAULT_MAX_SIZE = 4
+DEFAULT_IDLE_TIMEOUT = 300.0
+DEFAULT_EXECUTION_TIMEOUT = 60.0
+
+# Defaults for local sandboxes
+DEFAULT_CPU_TIME = 30.0
+DEFAULT_MEMORY_LIMIT = 2 * 1024 ** 3
+DEFAULT_PRELOAD = ('numpy', 'pandas', 'matplotlib.pyplot')
+
+_WORKER_SCRIPT = str(Path(__file__).with_name('sandbox_worker.py'))
+
+
+class SandboxError(RuntimeError):
+    """Raised when a sandbox cannot execute a request."""
+
+
+class Sandbox:
+    """
+    Interface for sandbox backends.
+
+    A sandbox keeps interpreter state between run() calls until reset()
+    is called or it is closed.
+    """
+
+    def run(self, code: str) -> str:
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """Clear interpreter state so the sandbox can be handed to a new user."""
+        raise NotImplementedError
+
+    def is_healthy(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class E2BSandbox(Sandbox):
+    """Sandbox backed by an E2B data analysis instance."""
+
+    def __init__(self):
+        import e2b
+
+        self.sandbox = e2b.DataAnalysisTool()
+        self.closed = False
+
+    def run(self, code: str) -> str:
+        return self.sandbox.run_python(code)
+
+    def reset(self) -> None:
+        self.sandbox.run_python(
+            "for _name in [n for n in globals() if not n.startswith('_')]:\n"
+            "    del globals()[_name]"
+        )
+
+    def is_healthy(self) -> bool:
+        return not self.closed
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.sandbox.close()
+
+
+def _read_line(fd: int, buffer: bytearray, deadline: float) -> Optional[bytes]:
+    """
+    Read one newline-terminated line from fd, keeping leftovers in buffer.
+
+    Returns None if the deadline passes first; raises EOFError if the other
+    end closes.
+    """
+    with selectors.DefaultSelector() as selector:
+        selector.register(fd, selectors.EVENT_READ)
+        while b'\n' not in buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not selector.select(remaining):
+                return None
+            data = os.read(fd, 65536)
+            if not data:
+                raise EOFError
+            buffer += data
+    index = buffer.index(b'\n')
+    line = bytes(buffer[:index])
+    del buffer[:index + 1]
+    return line
+
+
+class _WorkerSandbox(Sandbox):
+    """
+    Sandbox running in a local sandbox_worker.py process.
+
+    The worker keeps a persistent namespace, so consecutive snippets share
+    state like an interpreter session. Resource limits are enforced by the
+    worker itself; a snippet that exceeds the wall-clock timeout gets the
+    worker killed. Subclasses provide the channel to the worker.
+    """
+    timeout: float = DEFAULT_EXECUTION_TIMEOUT
+
+    def run(self, code: str) -> str:
+        return self._format_response(self.execute(code))
+
+    def execute(self, code: str) -> dict:
+        """
+        Run code and return the structured response.
+
+        Returns:
+            dict: 'stdout', 'stderr', 'error' (traceback or None), 'result'
+                  (repr of a trailing expression or None) and 'images'
+                  (base64 PNGs of matplotlib figures)
+        """
+        return self._request({'op': 'run', 'code': code})
+
+    def reset(self) -> None:
+        self._request({'op': 'reset'})
+
+    def _format_response(self, response: dict) -> str:
+        output = response.get('stdout', '')
+        if response.get('stderr'):
+            output += response['stderr']
+        if response.get('error'):
+            output += response['error']
+        if response.get('result') is not None:
+            output += response['result'] + '\n'
+        for image in response.get('images') or []:
+            output += f"[image/png, {len(image) * 3 // 4} bytes]\n"
+        return output
+
+    def _request(self, request: dict) -> dict:
+        if not self.is_healthy():
+            raise SandboxError("Sandbox process is not running")
+        try:
+            self._send((json.dumps(request) + '\n').encode('utf-8'))
+        except OSError:
+            self.close()
+            raise SandboxError("Sandbox process exited")
+        return self._receive(f"Execution timed out after {self.timeout} seconds")
+
+    def _receive(self, timeout_message: str) -> dict:
+        try:
+            line = _read_line(self._read_fd, self._buffer, time.monotonic() + self.timeout)
+        except (EOFError, OSError):
+            self.close()
+            raise SandboxError("Sandbox process exited")
+        if line is None:
+            self.close()
+            raise SandboxError(timeout_message)
+        return json.loads(line)
+
+    def _send(self, data: bytes) -> None:
+        raise NotImplementedError
+
+
+class SubprocessSandbox(_WorkerSandbox):
+    """
+    Local sandbox in a freshly spawned Python subprocess.
+
+    Start-up pays for interpreter start and any preloaded imports; prefer
+    LocalSandbox where fork() is available.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_EXECUTION_TIMEOUT,
+        python: Optional[str] = None,
+        **limits
+    ):
+        """
+        Initialize the sandbox.
+
+        Args:
+            timeout (float): Wall-clock seconds allowed per request
+            python (Optional[str]): Interpreter to run, defaults to this one
+            **limits: cpu_time, memory_limit and preload, see LocalSandbox
+        """
+        self.timeout = timeout
+        self.process = subprocess.Popen(
+            [python or sys.executable, '-u', _WORKER_SCRIPT, json.dumps(limits)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self._read_fd = self.process.stdout.fileno()
+        self._buffer = bytearray()
+        # The worker announces itself once it is ready for requests
+        self._receive("Sandbox did not start in time")
+
+    def is_healthy(self) -> bool:
+        return self.process.poll() is None
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            stream.close()
+
+    def _send(self, data: bytes) -> None:
+        self.process.stdin.write(data)
+        self.process.stdin.flush()
+
+
+class _ForkServer:
+    """
+    Client for a sandbox_worker.py fork server.
+
+    The server preloads modules once and forks a sandbox per request, so
+    new sandboxes start without paying for interpreter start-up or imports.
+    """
+
+    def __init__(self, config: dict, start_timeout: float = 120.0):
+        parent, child = socket.socketpair()
+        self.process = subprocess.Popen(
+            [sys.executable, '-u', _WORKER_SCRIPT, '--fork-server', str(child.fileno()), json.dumps(config)],
+            pass_fds=(child.fileno(),),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        child.close()
+        self._control = parent
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        if self._read(start_timeout) is None:
+            self.close()
+            raise SandboxError("Fork server did not start in time")
+
+    def fork(self, timeout: float) -> Tuple[int, socket.socket]:
+        """Fork a new sandbox and return its pid and connection."""
+        ours, theirs = socket.socketpair()
+        try:
+            with self._lock:
+                socket.send_fds(self._control, [b'f'], [theirs.fileno()])
+                reply = self._read(timeout)
+        except (EOFError, OSError):
+            ours.close()
+            raise SandboxError("Fork server exited")
+        finally:
+            theirs.close()
+        if reply is None:
+            ours.close()
+            raise SandboxError("Fork server did not respond in time")
+        return reply['pid'], ours
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def close(self) -> None:
+        self._control.close()
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+
+    def _read(self, timeout: float) -> Optional[dict]:
+        line = _read_line(self._control.fileno(), self._buffer, time.monotonic() + timeout)
+        return None if line is None else json.loads(line)
+
+
+_fork_servers: Dict[str, _ForkServer] = {}
+_fork_servers_lock = threading.Lock()
+
+
+def _get_fork_server(config: dict) -> _ForkServer:
+    """Return the running fork server for a worker configuration."""
+    key = json.dumps(config, sort_keys=True)
+    with _fork_servers_lock:
+        server = _fork_servers.get(key)
+        if server is None or not server.is_alive():
+            server = _fork_servers[key] = _ForkServer(config)
+        return server
+
+
+class LocalSandbox(_WorkerSandbox):
+    """
+    Local sandbox forked from a preloaded worker process.
+
+    Each sandbox is a separate process with its own CPU time and address
+    space limits, forked from a shared server that has already imported
+    the common data analysis libraries. Requires fork() and descriptor
+    passing over Unix sockets, i.e. a POSIX host.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_EXECUTION_TIMEOUT,
+        cpu_time: Optional[float] = DEFAULT_CPU_TIME,
+        memory_limit: Optional[int] = DEFAULT_MEMORY_LIMIT,
+        preload: Tuple[str, ...] = DEFAULT_PRELOAD
+    ):
+        """
+        Initialize the sandbox.
+
+        Args:
+            timeout (float): Wall-clock seconds allowed per request
+            cpu_time (Optional[float]): CPU seconds allowed per request
+            memory_limit (Optional[int]): Address space limit in bytes
+            preload (Tuple[str, ...]): Modules imported before forking
+        """
+        self.timeout = timeout
+        config = {'cpu_time': cpu_time, 'memory_limit': memory_limit, 'preload': list(preload)}
+        self.pid, self._connection = _get_fork_server(config).fork(timeout)
+        self._read_fd = self._connection.fileno()
+        self._buffer = bytearray()
+        self._closed = False
+        self._receive("Sandbox did not start in time")
+
+    def is_healthy(self) -> bool:
+        if self._closed:
+            return False
+        # The fork server's children are reaped automatically, so the pid
+        # may already belong to another process; the sandbox holds the other
+        # end of the connection, which reads EOF once it has exited
+        try:
+            data = self._connection.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        return bool(data)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        # Only signal the pid while the sandbox provably still runs
+        if self.is_healthy():
+            try:
+                os.kill(self.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        self._closed = True
+        self._connection.close()
+
+    def _send(self, data: bytes) -> None:
+        self._connection.sendall(data)
+
+
+def _local_sandbox() -> Sandbox:
+    if hasattr(os, 'fork') and hasattr(socket, 'send_fds'):
+        return LocalSandbox()
+    return SubprocessSandbox(
+        cpu_time=DEFAULT_CPU_TIME,
+        memory_limit=DEFAULT_MEMORY_LIMIT,
+        preload=list(DEFAULT_PRELOAD)
+    )
+
+
+SANDBOX_BACKENDS: Dict[str, Callable[[], Sandbox]] = {
+    'e2b': E2BSandbox,
+    'local': _local_sandbox,
+    'subprocess': SubprocessSandbox,
+}
+
+
+class _Session:
+    def __init__(self, sandbox: Sandbox):
+        self.sandbox = sandbox
+        self.in_use = True
+        self.last_used = time.monotonic()
+
+
+class SandboxPool:
+    """
+    Bounded pool of pre-warmed sandboxes.
+
+    Sandboxes checked out without a session id are reset before they go
+    back to the pool. A session id pins a sandbox to that session, so
+    consecutive executions share interpreter state, until end_session()
+    is called or the session sits idle longer than idle_timeout. A
+    background reaper closes idle sandboxes above min_size and keeps
+    min_size sandboxes warm.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Sandbox],
+        min_size: int = DEFAULT_MIN_SIZE,
+        max_size: int = DEFAULT_MAX_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        reap_interval: Optional[float] = None
+    ):
+        """
+        Initialize the sandbox pool.
+
+        Args:
+            factory (Callable[[], Sandbox]): Creates a new sandbox
+            min_size (int): Sandboxes kept warm even when idle
+            max_size (int): Upper bound on live sandboxes
+            idle_timeout (float): Seconds before an idle sandbox or session
+                                  is closed
+            reap_interval (Optional[float]): Seconds between reaper passes,
+                                             defaults to idle_timeout / 4
+        """
+        if max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._idle: List[Tuple[Sandbox, float]] = []
+        self._sessions: Dict[str, _Session] = {}
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self._reaper = threading.Thread(
+            target=self._reap_loop,
+            args=(reap_interval or max(idle_timeout / 4, 0.05),),
+            daemon=True
+        )
+        self._reaper.start()
+
+    @contextmanager
+    def session(self, session_id: Optional[str] = None, timeout: Optional[float] = None):
+        """Check out a sandbox for the duration of a with block."""
+        with tracing.span('sandbox.acquire', session=session_id is not None):
+            sandbox = self.acquire(session_id, timeout)
+        try:
+            yield sandbox
+        finally:
+            self.release(sandbox, session_id)
+
+    def acquire(self, session_id: Optional[str] = None, timeout: Optional[float] = None) -> Sandbox:
+        """
+        Check out a sandbox, waiting up to timeout seconds if the pool is full.
+
+        Raises:
+            SandboxError: If the pool is closed or no sandbox became available
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise SandboxError("Sandbox pool is closed")
+
+                if session_id is not None and session_id in self._sessions:
+                    entry = self._sessions[session_id]
+                    if not entry.in_use:
+                        if entry.sandbox.is_healthy():
+                            entry.in_use = True
+                            return entry.sandbox
+                        del self._sessions[session_id]
+                        self._discard(entry.sandbox)
+                        continue
+                elif self._idle:
+                    sandbox, _ = self._idle.pop()
+                    if not sandbox.is_healthy():
+                        self._discard(sandbox)
+                        continue
+                    self._bind(sandbox, session_id)
+                    return sandbox
+                elif self._size < self.max_size:
+                    self._size += 1
+                    break
+                elif self._evict_idle_session():
+                    continue
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise SandboxError("Timed out waiting for a sandbox")
+                self._cond.wait(remaining)
+
+        # Create outside the lock; sandbox start-up can take seconds
+        try:
+            with tracing.span('sandbox.start'):
+                sandbox = self.factory()
+            tracing.incr('sandbox_starts_total', reason='demand')
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._bind(sandbox, session_id)
+        return sandbox
+
+    def release(self, sandbox: Sandbox, session_id: Optional[str] = None) -> None:
+        """Return a sandbox checked out with acquire()."""
+        healthy = sandbox.is_healthy()
+        if healthy and session_id is None:
+            try:
+                sandbox.reset()
+            except Exception:
+                healthy = False
+
+        with self._cond:
+            if session_id is not None and session_id in self._sessions:
+                entry = self._sessions[session_id]
+                if healthy and not self._closed:
+                    entry.in_use = False
+                    entry.last_used = time.monotonic()
+                else:
+                    del self._sessions[session_id]
+                    self._discard(sandbox)
+            elif healthy and not self._closed:
+                self._idle.append((sandbox, time.monotonic()))
+            else:
+                self._discard(sandbox)
+            self._cond.notify()
+
+    def end_session(self, session_id: str) -> None:
+        """Close the sandbox pinned to a session, discarding its state."""
+        with self._cond:
+            entry = self._sessions.get(session_id)
+            if entry is None or entry.in_use:
+                return
+            del self._sessions[session_id]
+            self._discard(entry.sandbox)
+            self._cond.notify()
+
+    def warmup(self) -> None:
+        """Start sandboxes until min_size are available."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                sandbox = self.factory()
+                tracing.incr('sandbox_starts_total', reason='warmup')
+            except Exception as e:
+                with self._cond:
+                    self._size -= 1
+                print(f"Sandbox warmup failed: {e}")
+                return
+            with self._cond:
+                self._idle.append((sandbox, time.monotonic()))
+                self._cond.notify()
+
+    def close(self) -> None:
+        """Close every idle sandbox and stop handing out new ones."""
+        with self._cond:
+            self._closed = True
+            idle = [sandbox for sandbox, _ in self._idle]
+            idle += [entry.sandbox for entry in self._sessions.values() if not entry.in_use]
+            self._idle.clear()
+            self._sessions = {
+                session_id: entry for session_id, entry in self._sessions.items() if entry.in_use
+            }
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for sandbox in idle:
+            self._close_quietly(sandbox)
+
+    @property
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'sessions': len(self._sessions),
+            }
+
+    def _bind(self, sandbox: Sandbox, session_id: Optional[str]) -> None:
+        if session_id is not None:
+            self._sessions[session_id] = _Session(sandbox)
+
+    def _discard(self, sandbox: Sandbox) -> None:
+        """Drop a sandbox from the pool. Must be called with the lock held."""
+        self._size -= 1
+        threading.Thread(target=self._close_quietly, args=(sandbox,), daemon=True).start()
+
+    def _evict_idle_session(self) -> bool:
+        """Free the least recently used idle session. Must be called with the lock held."""
+        idle_sessions = [
+            (entry.last_used, session_id)
+            for session_id, entry in self._sessions.items() if not entry.in_use
+        ]
+        if not idle_sessions:
+            return False
+        _, session_id = min(idle_sessions)
+        self._discard(self._sessions.pop(session_id).sandbox)
+        return True
+
+    def _reap_loop(self, interval: float) -> None:
+        while True:
+            time.sleep(interval)
+            with self._cond:
+                if self._closed:
+                    return
+                cutoff = time.monotonic() - self.idle_timeout
+                for session_id, entry in list(self._sessions.items()):
+                    if not entry.in_use and (entry.last_used < cutoff or not entry.sandbox.is_healthy()):
+                        del self._sessions[session_id]
+                        self._discard(entry.sandbox)
+                keep = []
+                for sandbox, last_used in self._idle:
+                    if not sandbox.is_healthy():
+                        self._discard(sandbox)
+                    elif last_used < cutoff and self._size > self.min_size:
+                        self._discard(sandbox)
+                    else:
+                        keep.append((sandbox, last_used))
+                self._idle = keep
+                self._cond.notify_all()
+            self.warmup()
+
+    @staticmethod
+    def _close_quietly(sandbox: Sandbox) -> None:
+        try:
+            sandbox.close()
+        except Exception as e:
+            print(f"Error closing sandbox: {e}")
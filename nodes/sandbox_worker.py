@@ -0,0 +1,212 @@
+"""
+Worker process for the local Python sandbox.
+
+Runs as a standalone script in one of two modes:
+
+    sandbox_worker.py CONFIG
+        Serve one sandbox over stdin/stdout.
+
+    sandbox_worker.py --fork-server FD CONFIG
+        Preload modules once, then fork a sandbox for every socket received
+        on the control socket FD. Forked sandboxes start in milliseconds
+        because the heavy imports are already done.
+
+The protocol is one JSON request per line and one JSON response per
+line; code runs in a namespace that persists between requests. This
+file deliberately imports nothing from the project so it can start from
+any working directory.
+"""
+import ast
+import base64
+import contextlib
+import importlib
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import traceback
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+class CPUTimeExceeded(BaseException):
+    """Raised inside user code when its CPU time budget runs out.
+
+    Derives from BaseException so `except Exception` in user code does not
+    swallow it.
+    """
+
+
+def _on_cpu_limit(signum, frame):
+    raise CPUTimeExceeded("CPU time limit exceeded")
+
+
+def _preload(config):
+    # Headless plotting and single-threaded BLAS keep forked workers safe
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    os.environ.setdefault('OPENBLAS_NUM_THREADS', '1')
+    for name in config.get('preload', []):
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+
+def _apply_limits(config):
+    if resource is None:
+        return
+    memory_limit = config.get('memory_limit')
+    if memory_limit:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard))
+    if config.get('cpu_time'):
+        signal.signal(signal.SIGXCPU, _on_cpu_limit)
+
+
+@contextlib.contextmanager
+def _cpu_budget(seconds):
+    """Limit the CPU time the enclosed block may use."""
+    if resource is None or not seconds:
+        yield
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = usage.ru_utime + usage.ru_stime
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    limit = int(used + seconds) + 1
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _collect_figures():
+    """Render and close any open matplotlib figures as base64 PNGs."""
+    pyplot = sys.modules.get('matplotlib.pyplot')
+    if pyplot is None:
+        return []
+    images = []
+    for number in pyplot.get_fignums():
+        buffer = io.BytesIO()
+        pyplot.figure(number).savefig(buffer, format='png')
+        images.append(base64.b64encode(buffer.getvalue()).decode('ascii'))
+    pyplot.close('all')
+    return images
+
+
+def _execute(code, namespace, config):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    error = None
+    result = None
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            tree = ast.parse(code, '<sandbox>', 'exec')
+            # Like a REPL, report the value of a trailing expression
+            last = None
+            if tree.body and isinstance(tree.body[-1], ast.Expr):
+                last = ast.Expression(tree.body.pop().value)
+            with _cpu_budget(config.get('cpu_time')):
+                exec(compile(tree, '<sandbox>', 'exec'), namespace)
+                if last is not None:
+                    value = eval(compile(last, '<sandbox>', 'eval'), namespace)
+                    if value is not None:
+                        result = repr(value)
+        except BaseException:
+            error = traceback.format_exc()
+    try:
+        images = _collect_figures()
+    except Exception:
+        images = []
+    return {
+        'stdout': stdout.getvalue(),
+        'stderr': stderr.getvalue(),
+        'error': error,
+        'result': result,
+        'images': images,
+    }
+
+
+def serve(reader, writer, config):
+    """Answer requests from reader until it is closed."""
+    namespace = {'__name__': '__main__'}
+    _apply_limits(config)
+    writer.write(json.dumps({'ready': True, 'pid': os.getpid()}) + '\n')
+    writer.flush()
+
+    for line in reader:
+        request = json.loads(line)
+        op = request.get('op', 'run')
+        if op == 'run':
+            response = _execute(request['code'], namespace, config)
+        elif op == 'reset':
+            namespace = {'__name__': '__main__'}
+            response = {'ok': True}
+        elif op == 'ping':
+            response = {'ok': True}
+        else:
+            response = {'error': f"Unknown operation: {op}"}
+        writer.write(json.dumps(response) + '\n')
+        writer.flush()
+
+
+def fork_server(control_fd, config):
+    """Fork a preloaded sandbox for every connection sent over the control socket."""
+    # Let the kernel reap exited sandboxes
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    _preload(config)
+
+    control = socket.socket(fileno=control_fd)
+    control.sendall(b'{"ready": true}\n')
+    while True:
+        try:
+            message, fds, _, _ = socket.recv_fds(control, 16, 1)
+        except OSError:
+            break
+        if not message:
+            # The parent went away
+            break
+        if not fds:
+            continue
+
+        pid = os.fork()
+        if pid == 0:
+            control.close()
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            connection = socket.socket(fileno=fds[0])
+            try:
+                serve(
+                    connection.makefile('r', encoding='utf-8'),
+                    connection.makefile('w', encoding='utf-8'),
+                    config
+                )
+            finally:
+                os._exit(0)
+
+        os.close(fds[0])
+        control.sendall((json.dumps({'pid': pid}) + '\n').encode('utf-8'))
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--fork-server':
+        fork_server(int(sys.argv[2]), json.loads(sys.argv[3]))
+        return
+
+    config = json.loads(sys.argv[1]) if len(sys.argv) > 1 else {}
+    # Keep the protocol on a private copy of stdout and point fd 1 at
+    # stderr, so output written below the sys.stdout level (subprocesses,
+    # C extensions) cannot corrupt the response stream
+    protocol = os.fdopen(os.dup(1), 'w', encoding='utf-8')
+    os.dup2(2, 1)
+    _preload(config)
+    serve(sys.stdin, protocol, config)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+"""
+Response cache with request deduplication for the web search tool.
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+import tracing
+
+# Default lifetime and size of cached search responses
+DEFAULT_TTL = 300
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class _InFlight:
+    """
+    A pending upstream call that concurrent callers can wait on.
+
+    Threads wait on an event; coroutines wait on a future of their own
+    event loop, so waiting does not take a thread from the loop's executor.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    def outcome(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    async def wait(self) -> Any:
+        """Wait for the call from a coroutine and return its outcome."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.event.is_set():
+                return self.outcome()
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+        await future
+        return self.outcome()
+
+    def finish(self) -> None:
+        """Wake every waiting thread and coroutine."""
+        with self._lock:
+            self.event.set()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                # The waiter's event loop is already closed
+                pass
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class SearchCache:
+    """
+    TTL cache for search responses with single-flight deduplication.
+
+    Responses live in an in-memory LRU. When db_path is given, they are
+    also written through to a SQLite table, so they survive restarts and
+    can be shared between processes. Concurrent lookups of the same key
+    while it is being computed wait for the one upstream call instead of
+    issuing their own.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        db_path: Optional[str] = None
+    ):
+        """
+        Initialize the search cache.
+
+        Args:
+            ttl (float): Seconds a response stays valid; 0 disables caching
+                         but keeps request deduplication
+            max_entries (int): Maximum number of responses kept in memory
+            db_path (Optional[str]): SQLite file for persistent storage
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: dict = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(query: str, **settings) -> str:
+        """
+        Build a cache key from a query and the provider settings.
+
+        The query is normalized (case and whitespace) so trivially different
+        spellings of the same query share an entry.
+        """
+        normalized = " ".join(query.lower().split())
+        payload = json.dumps({'query': normalized, 'settings': settings}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a cached, unexpired response or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+
+        if self._db is None:
+            return None
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] <= now:
+            return None
+        value = json.loads(row[0])
+        self._store_memory(key, value, row[1])
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a response for the configured TTL."""
+        if self.ttl <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        self._store_memory(key, value, expires_at)
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO search_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at)
+                )
+                self._db.execute("DELETE FROM search_cache WHERE expires_at <= ?", (time.time(),))
+                self._db.commit()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached response for key, computing it at most once.
+
+        If another thread is already computing the same key, wait for its
+        result. Exceptions from compute are propagated to every waiter and
+        nothing is cached.
+        """
+        value, call, leader = self._join(key)
+        if call is None:
+            return value
+        if not leader:
+            call.event.wait()
+            return call.outcome()
+
+        try:
+            call.result = compute()
+            self.set(key, call.result)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            self._finish(key, call)
+
+    async def aget_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async variant of get_or_compute.
+
+        In-flight calls are shared with synchronous callers, so a query being
+        computed on a worker thread is not repeated from the event loop.
+        Waiters await the call on their event loop rather than blocking an
+        executor thread, which the leading call may need for its search.
+        """
+        value, call, leader = self._join(key)
+        if call is None:
+            return value
+        if not leader:
+            return await call.wait()
+
+        try:
+            call.result = await compute()
+            self.set(key, call.result)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            self._finish(key, call)
+
+    def clear(self) -> None:
+        """Drop all cached responses and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM search_cache")
+                self._db.commit()
+
+    @property
+    def stats(self) -> dict:
+        """Hit/miss counters and the number of responses held in memory."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+    def _join(self, key: str):
+        """
+        Look up key, or register interest in computing it.
+
+        Returns (value, None, False) on a cache hit, otherwise the in-flight
+        call for the key and whether this caller is the one to compute it.
+        """
+        value = self.get(key)
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+                tracing.incr('cache_lookups_total', cache='search', result='hit')
+                return value, None, False
+            call = self._inflight.get(key)
+            if call is not None:
+                # Deduplicated onto an in-flight request
+                self.hits += 1
+                tracing.incr('cache_lookups_total', cache='search', result='deduplicated')
+                return None, call, False
+            call = self._inflight[key] = _InFlight()
+            self.misses += 1
+            tracing.incr('cache_lookups_total', cache='search', result='miss')
+            return None, call, True
+
+    def _finish(self, key: str, call: _InFlight) -> None:
+        with self._lock:
+            del self._inflight[key]
+        call.finish()
+
+    def _store_memory(self, key: str, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,89 @@
+"""
+Search provider adapters used by the web search tool.
+"""
+import asyncio
+from typing import List
+
+
+class SearchProvider:
+    """
+    Base class for web search providers.
+
+    Subclasses implement search() returning a list of result dicts with
+    'title', 'url' and 'content' keys, and raise on failure. asearch()
+    runs the blocking call in a worker thread unless overridden with a
+    native async implementation.
+    """
+    name: str = "provider"
+
+    def search(self, query: str) -> List[dict]:
+        raise NotImplementedError
+
+    async def asearch(self, query: str) -> List[dict]:
+        return await asyncio.to_thread(self.search, query)
+
+    def settings(self) -> dict:
+        """Settings that affect results, used to key the response cache."""
+        return {}
+
+
+class TavilyProvider(SearchProvider):
+    name = "tavily"
+
+    def __init__(self, max_results: int = 1, search_depth: str = "advanced"):
+        # Imported here so that importing the nodes package stays cheap
+        from langchain_community.tools.tavily_search import TavilySearchResults
+
+        self.max_results = max_results
+        self.search_depth = search_depth
+        self.client = TavilySearchResults(
+            max_results=max_results,
+            search_depth=search_depth,
+            include_answer=True,
+            include_raw_content=True
+        )
+
+    def search(self, query: str) -> List[dict]:
+        return self._format_results(self.client.invoke(query))
+
+    async def asearch(self, query: str) -> List[dict]:
+        return self._format_results(await self.client.ainvoke(query))
+
+    def _format_results(self, results) -> List[dict]:
+        if isinstance(results, str):
+            # The Tavily tool reports API errors as a string
+            raise RuntimeError(results)
+        return [
+            {
+                'title': result.get('title', 'No Title'),
+                'url': result.get('url', ''),
+                'content': result.get('content', '')
+            }
+            for result in results
+        ]
+
+    def settings(self) -> dict:
+        return {'max_results': self.max_results, 'search_depth': self.search_depth}
+
+
+class DuckDuckGoProvider(SearchProvider):
+    name = "duckduckgo"
+
+    def __init__(self, max_results: int = 5):
+        from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
+
+        self.max_results = max_results
+        self.client = DuckDuckGoSearchAPIWrapper()
+
+    def search(self, query: str) -> List[dict]:
+        return [
+            {
+                'title': result.get('title', 'No Title'),
+                'url': result.get('link', ''),
+                'content': result.get('snippet', '')
+            }
+            for result in self.client.results(query, self.max_results)
+        ]
+
+    def settings(self) -> dict:
+        return {'max_results': self.max_results}
@@ -0,0 +1,353 @@
+"""
+Columnar fast path for loading CSV and Excel files with pandas.
+"""
+import operator
+import re
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from langchain_core.documents import Document
+
+# Output modes of the fast path
+TABULAR_MODES = ('rows', 'summary', 'sample')
+# Rows parsed per chunk; bounds memory for very large files
+DEFAULT_CHUNK_ROWS = 50_000
+# Rows per Document in 'rows' mode
+DEFAULT_BATCH_ROWS = 500
+# Rows shown in 'sample' mode
+DEFAULT_SAMPLE_ROWS = 20
+# Distinct values tracked per text column in summaries
+MAX_TRACKED_VALUES = 1000
+# Comparison operators allowed in row filters
+FILTER_OPERATORS = {
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le,
+    '>': operator.gt, '>=': operator.ge
+}
+# Tokens of a row filter: operators, parentheses, quoted strings, numbers,
+# `quoted` column names and bare words
+_FILTER_TOKEN = re.compile(
+    r"\s*(?:(==|!=|<=|>=|<|>|\(|\))|('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\")"
+    r"|(-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)(?![\w.])|(`[^`]+`)|([A-Za-z_]\w*))"
+)
+
+def iter_frames(
+    file_path: str,
+    columns: Optional[List[str]] = None,
+    row_filter: Optional[str] = None,
+    encoding: Optional[str] = "utf-8",
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV or Excel file as a stream of DataFrame chunks.
+
+    Args:
+        file_path (str): Path to a .csv, .xlsx or .xls file
+        columns (Optional[List[str]]): Columns to keep; others are not parsed
+                                       for CSV files
+        row_filter (Optional[str]): Condition rows must match, see
+                                    parse_row_filter(), e.g.
+                                    "price > 10 and region == 'EU'"
+        encoding (Optional[str]): Encoding of CSV files
+        chunk_rows (int): Rows per chunk
+
+    Yields:
+        pd.DataFrame: Chunks in file order, with their original row index
+
+    Raises:
+        ValueError: If the format, a column or the row filter is invalid
+    """
+    # Parsed up front so an invalid filter fails before the file is read
+    mask = parse_row_filter(row_filter) if row_filter else None
+    suffix = Path(file_path).suffix.lower()
+    if suffix == '.csv':
+        if columns:
+            header = pd.read_csv(file_path, encoding=encoding or 'utf-8', nrows=0).columns
+            _check_columns(columns, list(header))
+        frames = pd.read_csv(
+            file_path,
+            usecols=columns,
+            encoding=encoding or 'utf-8',
+            chunksize=chunk_rows
+        )
+    elif suffix == '.xlsx':
+        frames = _iter_xlsx(file_path, columns, chunk_rows)
+    elif suffix == '.xls':
+        frame = pd.read_excel(file_path)
+        if columns:
+            _check_columns(columns, list(frame.columns))
+            frame = frame[columns]
+        frames = (frame.iloc[start:start + chunk_rows] for start in range(0, len(frame), chunk_rows))
+    else:
+        raise ValueError(f"Unsupported tabular format: {suffix}")
+
+    for frame in frames:
+        if mask is not None:
+            frame = frame[mask(frame)]
+        if len(frame):
+            yield frame
+
+def load_tabular(
+    file_path: str,
+    mode: str = 'rows',
+    columns: Optional[List[str]] = None,
+    row_filter: Optional[str] = None,
+    encoding: Optional[str] = "utf-8",
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    sample_rows: int = DEFAULT_SAMPLE_ROWS
+) -> Iterator[Document]:
+    """
+    Load a CSV or Excel file as a few compact documents.
+
+    Modes:
+        rows: one document per batch_rows rows, as CSV text
+        summary: one document with the row count and per-column statistics
+        sample: one document with the first sample_rows matching rows
+
+    Args:
+        file_path (str): Path to a .csv, .xlsx or .xls file
+        mode (str): One of TABULAR_MODES
+        columns (Optional[List[str]]): Columns to keep
+        row_filter (Optional[str]): Condition rows must match, see
+                                    parse_row_filter()
+        encoding (Optional[str]): Encoding of CSV files
+        batch_rows (int): Rows per document in 'rows' mode
+        sample_rows (int): Rows shown in 'sample' mode
+
+    Yields:
+        Document: Documents with the file path as source
+    """
+    if mode not in TABULAR_MODES:
+        raise ValueError(f"Unknown tabular mode: {mode}. Expected one of {TABULAR_MODES}")
+    chunk_rows = max(DEFAULT_CHUNK_ROWS // batch_rows, 1) * batch_rows
+    frames = iter_frames(file_path, columns, row_filter, encoding, chunk_rows)
+    if mode == 'rows':
+        yield from _row_batches(file_path, frames, batch_rows)
+    elif mode == 'summary':
+        yield _summarize(file_path, frames)
+    else:
+        yield _sample(file_path, frames, sample_rows)
+
+def parse_row_filter(expression: str) -> Callable[[pd.DataFrame], pd.Series]:
+    """
+    Parse a row filter into a function computing the boolean row mask.
+
+    Filters come from the model, so they are never evaluated as pandas
+    expressions. Only comparisons of a column with a literal are accepted,
+    combined with and, or, not and parentheses:
+
+        region == 'EU' and (price >= 10 or `unit price` < 2.5)
+
+    Literals are numbers, quoted strings, True, False and None.
+
+    Args:
+        expression (str): Row filter
+
+    Returns:
+        Callable[[pd.DataFrame], pd.Series]: Maps a frame to its row mask
+
+    Raises:
+        ValueError: If the expression is not a valid row filter
+    """
+    tokens = _tokenize_filter(expression)
+    mask, position = _parse_or(tokens, 0)
+    if position != len(tokens):
+        raise ValueError(f"Invalid row filter: unexpected {tokens[position][1]!r}")
+    return mask
+
+def _tokenize_filter(expression: str) -> List[Tuple[str, Any]]:
+    """Split a row filter into (kind, value) tokens."""
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _FILTER_TOKEN.match(expression, position)
+        if not match:
+            raise ValueError(f"Invalid row filter: unexpected {expression[position:position + 10]!r}")
+        symbol, string, number, quoted, word = match.groups()
+        if symbol:
+            tokens.append(('op', symbol))
+        elif string:
+            tokens.append(('literal', re.sub(r"\\(.)", r"\1", string[1:-1])))
+        elif number:
+            tokens.append(('literal', float(number) if re.search(r"[.eE]", number) else int(number)))
+        elif quoted:
+            tokens.append(('column', quoted[1:-1]))
+        elif word in ('and', 'or', 'not'):
+            tokens.append(('op', word))
+        elif word in ('True', 'False', 'None'):
+            tokens.append(('literal', {'True': True, 'False': False, 'None': None}[word]))
+        else:
+            tokens.append(('column', word))
+        position = match.end()
+    return tokens
+
+def _parse_or(tokens: List[Tuple[str, Any]], position: int) -> Tuple[Callable, int]:
+    left, position = _parse_and(tokens, position)
+    while position < len(tokens) and tokens[position] == ('op', 'or'):
+        right, position = _parse_and(tokens, position + 1)
+        left = (lambda a, b: lambda frame: a(frame) | b(frame))(left, right)
+    return left, position
+
+def _parse_and(tokens: List[Tuple[str, Any]], position: int) -> Tuple[Callable, int]:
+    left, position = _parse_condition(tokens, position)
+    while position < len(tokens) and tokens[position] == ('op', 'and'):
+        right, position = _parse_condition(tokens, position + 1)
+        left = (lambda a, b: lambda frame: a(frame) & b(frame))(left, right)
+    return left, position
+
+def _parse_condition(tokens: List[Tuple[str, Any]], position: int) -> Tuple[Callable, int]:
+    """A comparison, a negated condition or a parenthesized filter."""
+    if position >= len(tokens):
+        raise ValueError("Invalid row filter: unexpected end")
+    if tokens[position] == ('op', 'not'):
+        inner, position = _parse_condition(tokens, position + 1)
+        return (lambda frame: ~inner(frame)), position
+    if tokens[position] == ('op', '('):
+        inner, position = _parse_or(tokens, position + 1)
+        if position >= len(tokens) or tokens[position] != ('op', ')'):
+            raise ValueError("Invalid row filter: missing ')'")
+        return inner, position + 1
+
+    if len(tokens) - position < 3:
+        raise ValueError("Invalid row filter: expected <column> <operator> <value>")
+    (kind, column), (_, symbol), (value_kind, value) = tokens[position:position + 3]
+    if kind != 'column' or symbol not in FILTER_OPERATORS or value_kind != 'literal':
+        raise ValueError(
+            f"Invalid row filter: expected <column> <operator> <value> at {column!r}"
+        )
+    compare = FILTER_OPERATORS[symbol]
+
+    def mask(frame: pd.DataFrame) -> pd.Series:
+        if column not in frame.columns:
+            raise ValueError(f"Unknown column in row filter: {column}")
+        if value is None:
+            if symbol not in ('==', '!='):
+                raise ValueError("Invalid row filter: None only compares with == or !=")
+            return frame[column].isna() if symbol == '==' else frame[column].notna()
+        return compare(frame[column], value)
+
+    return mask, position + 3
+
+def _check_columns(columns: List[str], header: List[str]) -> None:
+    """Reject requested columns missing from the file's header."""
+    unknown = [name for name in columns if name not in header]
+    if unknown:
+        raise ValueError(f"Unknown column: {', '.join(unknown)}. Available columns: {', '.join(header)}")
+
+def _iter_xlsx(file_path: str, columns: Optional[List[str]], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Stream the first sheet of a workbook with openpyxl's read-only mode.
+
+    Column types are inferred from the first chunk and later chunks are
+    coerced to them, so statistics agree across chunks. Cells that do not
+    parse as a numeric or datetime column's type become missing.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(name) if name is not None else f"column_{i}" for i, name in enumerate(next(rows, ()))]
+        if columns:
+            _check_columns(columns, header)
+        dtypes = None
+        start = 0
+        while True:
+            batch = list(islice(rows, chunk_rows))
+            if not batch:
+                return
+            frame = pd.DataFrame(batch, columns=header, index=range(start, start + len(batch)))
+            if columns:
+                frame = frame[columns]
+            start += len(batch)
+            if dtypes is None:
+                dtypes = frame.dtypes
+            else:
+                frame = _coerce_dtypes(frame, dtypes)
+            yield frame
+    finally:
+        workbook.close()
+
+def _coerce_dtypes(frame: pd.DataFrame, dtypes: pd.Series) -> pd.DataFrame:
+    """Cast the columns of a chunk whose inferred type differs from dtypes."""
+    for name, dtype in dtypes.items():
+        series = frame[name]
+        if series.dtype == dtype:
+            continue
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            frame[name] = pd.to_numeric(series, errors='coerce')
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            frame[name] = pd.to_datetime(series, errors='coerce')
+        else:
+            frame[name] = series.astype(object)
+    return frame
+
+def _row_batches(file_path: str, frames: Iterator[pd.DataFrame], batch_rows: int) -> Iterator[Document]:
+    for frame in frames:
+        for start in range(0, len(frame), batch_rows):
+            batch = frame.iloc[start:start + batch_rows]
+            yield Document(
+                page_content=batch.to_csv(index=False).strip(),
+                metadata={
+                    'source': file_path,
+                    'first_row': int(batch.index[0]),
+                    'last_row': int(batch.index[-1]),
+                    'columns': list(batch.columns)
+                }
+            )
+
+def _sample(file_path: str, frames: Iterator[pd.DataFrame], sample_rows: int) -> Document:
+    """First matching rows; stops reading as soon as there are enough."""
+    taken = []
+    count = 0
+    for frame in frames:
+        taken.append(frame.iloc[:sample_rows - count])
+        count += len(taken[-1])
+        if count >= sample_rows:
+            break
+    sample = pd.concat(taken) if taken else pd.DataFrame()
+    return Document(
+        page_content=sample.to_csv(index=False).strip(),
+        metadata={'source': file_path, 'mode': 'sample', 'rows': len(sample)}
+    )
+
+def _summarize(file_path: str, frames: Iterator[pd.DataFrame]) -> Document:
+    """Row count and per-column statistics, accumulated chunk by chunk."""
+    rows = 0
+    stats: Dict[str, dict] = {}
+    for frame in frames:
+        rows += len(frame)
+        for name in frame.columns:
+            series = frame[name]
+            column = stats.setdefault(name, {
+                'dtype': str(series.dtype), 'non_null': 0, 'min': None, 'max': None, 'sum': 0.0, 'values': set()
+            })
+            non_null = series.dropna()
+            column['non_null'] += len(non_null)
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                if len(non_null):
+                    low, high = non_null.min(), non_null.max()
+                    column['min'] = low if column['min'] is None else min(column['min'], low)
+                    column['max'] = high if column['max'] is None else max(column['max'], high)
+                    column['sum'] += float(non_null.sum())
+            elif len(column['values']) < MAX_TRACKED_VALUES:
+                column['values'].update(non_null.astype(str).unique()[:MAX_TRACKED_VALUES])
+
+    lines = [f"Rows: {rows}", f"Columns: {len(stats)}"]
+    for name, column in stats.items():
+        line = f"- {name} ({column['dtype']}): {column['non_null']} non-null"
+        if column['min'] is not None:
+            mean = column['sum'] / column['non_null']
+            line += f", min {column['min']}, max {column['max']}, mean {mean:.4g}"
+        elif column['values']:
+            unique = len(column['values'])
+            examples = ", ".join(sorted(column['values'])[:5])
+            line += f", {unique}{'+' if unique >= MAX_TRACKED_VALUES else ''} distinct, e.g. {examples}"
+        lines.append(line)
+    return Document(
+        page_content="\n".join(lines),
+        metadata={'source': file_path, 'mode': 'summary', 'rows': rows}
+    )
@@ -5,6 +5,8 @@ from langchain_core.tools import BaseTool
 from pydantic import BaseModel, Field
 from typing import Type
 
+from .markdown_converter import convert_to_markdown
+
 class TextToMarkdownInput(BaseModel):
     text: str = Field(description="The text to convert to markdown")
 
@@ -21,15 +23,4 @@ class TextToMarkdownTool(BaseTool):
             return f"Error converting text to markdown: {str(e)}"
 
     def _convert_to_markdown(self, text: str) -> str:
-        paragraphs = text.split('\n\n')
-        
-        markdown_paragraphs = []
-        for para in paragraphs:
-            if para.startswith('#'):
-                markdown_paragraphs.append(para)
-            elif para.startswith('- ') or para.startswith('* '):
-                markdown_paragraphs.append(para)
-            else:
-                markdown_paragraphs.append(para)
-        
-        return '\n\n'.join(markdown_paragraphs) 
\ No newline at end of file
+        return convert_to_markdown(text)
@@ -1,16 +1,39 @@
 """
 Web search tool implementation using multiple search providers.
 """
+import asyncio
+import logging
 import os
-from typing import Optional, Type
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Type
 from pydantic import BaseModel, Field
 from langchain_core.tools import BaseTool
-from langchain_community.tools.tavily_search import TavilySearchResults
-from langchain_community.tools import DuckDuckGoSearchRun
+
+import tracing
+from utils import compact_text
+
+from .search_cache import SearchCache
+from .search_providers import SearchProvider, TavilyProvider, DuckDuckGoProvider
 
 # from settings import WEB_SEARCH_PROVIDER
 
-WEB_SEARCH_PROVIDER = 'tavily'
+WEB_SEARCH_PROVIDER = os.getenv('WEB_SEARCH_PROVIDER', 'tavily')
+
+logger = logging.getLogger(__name__)
+
+# How providers are combined:
+#   'fallback' - query providers one at a time until one returns results
+#   'first'    - query all providers concurrently, first good result wins
+#   'merge'    - query all providers concurrently, merge results by URL
+SEARCH_MODES = ('fallback', 'first', 'merge')
+DEFAULT_SEARCH_MODE = 'fallback'
+DEFAULT_PROVIDER_TIMEOUT = 15.0
+# Tokens of content kept per search result
+RESULT_TOKEN_BUDGET = 150
+
+# Process-wide response cache shared by every WebSearchTool instance
+_shared_cache = SearchCache()
 
 class WebSearchInput(BaseModel):
     query: str = Field(description="The search query")
@@ -20,56 +43,190 @@ class WebSearchTool(BaseTool):
     description: str = "Search the web for information"
     args_schema: Type[BaseModel] = WebSearchInput
 
-    tavily_api_wrapper: Optional[TavilySearchResults] = None
-    duckduckgo_api_wrapper: Optional[object] = None
+    providers: List[SearchProvider] = []
+    mode: str = DEFAULT_SEARCH_MODE
+    provider_timeout: float = DEFAULT_PROVIDER_TIMEOUT
+    cache: Optional[SearchCache] = None
+
+    def __init__(
+        self,
+        cache: Optional[SearchCache] = None,
+        providers: Optional[List[SearchProvider]] = None,
+        mode: str = DEFAULT_SEARCH_MODE,
+        provider_timeout: float = DEFAULT_PROVIDER_TIMEOUT
+    ):
+        """
+        Initialize the web search tool.
 
-    def __init__(self):
+        Args:
+            cache (Optional[SearchCache]): Response cache to use. Defaults to
+                                           a cache shared by all instances.
+            providers (Optional[List[SearchProvider]]): Providers to query, in
+                                                        order of preference.
+                                                        Defaults to Tavily (if
+                                                        TAVILY_API_KEY is set)
+                                                        and DuckDuckGo.
+            mode (str): One of 'fallback', 'first' or 'merge'
+            provider_timeout (float): Seconds to wait for each provider
+        """
         super().__init__()
-        
+
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unsupported search mode: {mode}")
+
+        self.cache = cache if cache is not None else _shared_cache
+        self.providers = providers if providers is not None else self._default_providers()
+        self.mode = mode
+        self.provider_timeout = provider_timeout
+
+    @staticmethod
+    def _default_providers() -> List[SearchProvider]:
+        providers = []
         if os.getenv('TAVILY_API_KEY'):
-            
-            self.tavily_api_wrapper = TavilySearchResults(
-                max_results=1,
-                search_depth="advanced",
-                include_answer=True,
-                include_raw_content=True
-            )
-        
-        if not self.tavily_api_wrapper:
-            self.duckduckgo_api_wrapper = DuckDuckGoSearchRun(max_results=5)
+            providers.append(TavilyProvider())
+        providers.append(DuckDuckGoProvider())
+        # The configured provider goes first
+        providers.sort(key=lambda provider: provider.name != WEB_SEARCH_PROVIDER)
+        return providers
 
     def _run(self, query: str) -> str:
         try:
             if not query or not query.strip():
                 return "Error: Empty search query provided"
-            
+
             search_results = self._search_web(query)
             return search_results
         except Exception as e:
             return f"Error performing web search: {str(e)}"
-    
+
+    async def _arun(self, query: str) -> str:
+        try:
+            if not query or not query.strip():
+                return "Error: Empty search query provided"
+
+            key = self.cache.make_key(query, **self._provider_settings())
+            try:
+                return await self.cache.aget_or_compute(key, lambda: self._aquery_providers(query))
+            except LookupError:
+                return "No search provider available"
+        except Exception as e:
+            return f"Error performing web search: {str(e)}"
+
     def _search_web(self, query: str) -> str:
-        if self.tavily_api_wrapper and WEB_SEARCH_PROVIDER == "tavily":
+        key = self.cache.make_key(query, **self._provider_settings())
+        try:
+            return self.cache.get_or_compute(key, lambda: self._query_providers(query))
+        except LookupError:
+            return "No search provider available"
+
+    def _provider_settings(self) -> dict:
+        return {
+            'mode': self.mode,
+            'providers': [[provider.name, provider.settings()] for provider in self.providers]
+        }
+
+    def _query_providers(self, query: str) -> str:
+        """
+        Query the providers from synchronous code.
+
+        Raises:
+            LookupError: If no provider returned a result
+        """
+        coroutine = self._aquery_providers(query)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        # Called from inside an event loop: run on a fresh loop in a thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+
+    async def _aquery_providers(self, query: str) -> str:
+        """
+        Query the providers according to the search mode.
+
+        Raises:
+            LookupError: If no provider returned a result
+        """
+        if self.mode == 'fallback':
+            for provider in self.providers:
+                results = await self._query_provider(provider, query)
+                if results:
+                    return self._format_results(results, query)
+
+        elif self.mode == 'first':
+            # Hedged requests: take the first provider to return results
+            pending = {
+                asyncio.ensure_future(self._query_provider(provider, query))
+                for provider in self.providers
+            }
             try:
-                results = self.tavily_api_wrapper.invoke(query)
-                
-                formatted_results = []
-                for result in results:
-                    formatted_results.append({
-                        'title': result.get('title', 'No Title'),
-                        'url': result.get('url', ''),
-                        'content': result.get('content', '')[:500] + '...'
-                    })
-                
-                return str(formatted_results)
-            except Exception as e:
-                print(f"Tavily search error: {e}")
-        
-        if self.duckduckgo_api_wrapper:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        results = task.result()
+                        if results:
+                            return self._format_results(results, query)
+            finally:
+                for task in pending:
+                    task.cancel()
+
+        else:
+            responses = await asyncio.gather(*(
+                self._query_provider(provider, query) for provider in self.providers
+            ))
+            merged = []
+            seen = set()
+            for results in responses:
+                for result in results or []:
+                    identity = result.get('url') or result.get('content')
+                    if identity in seen:
+                        continue
+                    seen.add(identity)
+                    merged.append(result)
+            if merged:
+                return self._format_results(merged, query)
+
+        raise LookupError("No search provider available")
+
+    async def _query_provider(self, provider: SearchProvider, query: str) -> Optional[List[dict]]:
+        """Query one provider, returning None if it fails or times out."""
+        with tracing.span('search.provider', provider=provider.name) as span:
+            started = time.perf_counter()
+            status = 'error'
             try:
-                return self.duckduckgo_api_wrapper.invoke(query)
-            except Exception as e:
-                print(f"DuckDuckGo search error: {e}")
-        
-        return "No search provider available"
-    
\ No newline at end of file
+                results = await asyncio.wait_for(provider.asearch(query), timeout=self.provider_timeout)
+                status = 'ok' if results else 'empty'
+                span.set(results=len(results or []))
+                return results
+            except asyncio.CancelledError:
+                # Another provider answered first
+                status = 'cancelled'
+                raise
+            except asyncio.TimeoutError:
+                status = 'timeout'
+                logger.warning("%s search timed out after %ss", provider.name, self.provider_timeout)
+            except Exception:
+                logger.exception("%s search failed", provider.name)
+            finally:
+                span.set(status=status)
+                tracing.incr('search_requests_total', provider=provider.name, status=status)
+                tracing.observe('search_request_seconds', time.perf_counter() - started, provider=provider.name)
+            return None
+
+    def _format_results(self, results: List[dict], query: Optional[str] = None) -> str:
+        """
+        Format results for the LLM, compacting each result's content to the
+        passages most relevant to the query and dropping passages already
+        seen in an earlier result.
+        """
+        formatted_results = []
+        seen = set()
+        for result in results:
+            formatted_results.append({
+                'title': result.get('title', 'No Title'),
+                'url': result.get('url', ''),
+                'content': compact_text(result.get('content') or '', RESULT_TOKEN_BUDGET, query, seen)
+            })
+
+        return str(formatted_results)
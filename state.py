@@ -0,0 +1,307 @@
+"""
+Persistent workflow state: per-step checkpoints for resuming runs.
+"""
+import asyncio
+import atexit
+import hashlib
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import tracing
+
+# Default location of the state database
+DEFAULT_STATE_PATH = Path.home() / '.cache' / 'ai_agents_tools' / 'state.db'
+# Checkpoints written per transaction by the background writer
+WRITE_BATCH_SIZE = 256
+
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+def fingerprint(inputs: Sequence[Any]) -> str:
+    """Stable digest of a step's inputs."""
+    data = json.dumps(list(inputs), sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+class Transient:
+    """
+    Step output that is returned but not checkpointed, e.g. that of a failed
+    tool call, so a resumed run retries the step instead of replaying it.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+class StateStore:
+    """
+    SQLite store of workflow step checkpoints.
+
+    Each checkpoint holds a step's output keyed by run id and step name,
+    together with the fingerprint of the inputs it was computed from. A
+    rerun with the same run id reuses every step whose inputs are
+    unchanged, so a run that died part way resumes after its last
+    completed step. Outputs are stored as zlib-compressed JSON. Writes are
+    queued to a background thread and committed in batches, so
+    checkpointing does not block the workflow; reads see queued writes
+    immediately. A batch that fails to commit, e.g. on a locked or full
+    database, is logged and stays readable from memory; the error is kept
+    in write_error.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the state store.
+
+        Args:
+            path (Optional[str]): SQLite file holding the checkpoints
+        """
+        self.path = Path(path) if path else DEFAULT_STATE_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Checkpoints queued but not yet committed, by (run_id, step)
+        self._pending: Dict[Tuple[str, str], Tuple[str, bytes]] = {}
+        self._queue: queue.Queue = queue.Queue()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS steps ("
+            "run_id TEXT NOT NULL, step TEXT NOT NULL, fingerprint TEXT NOT NULL, "
+            "output BLOB NOT NULL, updated REAL NOT NULL, PRIMARY KEY (run_id, step))"
+        )
+        self._db.commit()
+
+        self._closed = False
+        # Last exception raised while committing checkpoints, if any
+        self.write_error: Optional[Exception] = None
+        self._writer = threading.Thread(target=self._write_loop, name='state-writer', daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def get(self, run_id: str, step: str, step_fingerprint: Optional[str] = None) -> Any:
+        """
+        Return a step's checkpointed output.
+
+        Args:
+            run_id (str): Workflow run id
+            step (str): Step name
+            step_fingerprint (Optional[str]): Only match a checkpoint computed
+                                              from these inputs
+
+        Returns:
+            Any: The output, or None if there is no matching checkpoint
+        """
+        value = self._lookup(run_id, step, step_fingerprint)
+        return None if value is _MISSING else value
+
+    def put(self, run_id: str, step: str, step_fingerprint: str, output: Any) -> None:
+        """
+        Checkpoint a step's output. The write happens in the background.
+        """
+        record = (step_fingerprint, zlib.compress(json.dumps(output, default=str).encode('utf-8')))
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("State store is closed")
+            self._pending[(run_id, step)] = record
+        self._queue.put((run_id, step, record))
+
+    def step(self, run_id: str, step: str, inputs: Sequence[Any], compute: Callable[[], Any]) -> Any:
+        """
+        Run a step, or reuse its checkpoint if its inputs are unchanged.
+
+        Args:
+            run_id (str): Workflow run id
+            step (str): Step name, unique within the run
+            inputs (Sequence[Any]): Everything the step's output depends on
+            compute (Callable[[], Any]): Computes the output; it must be
+                                         JSON-serializable. Wrap it in
+                                         Transient to skip the checkpoint.
+
+        Returns:
+            Any: The checkpointed or freshly computed output
+        """
+        step_fingerprint = fingerprint(inputs)
+        value = self._lookup(run_id, step, step_fingerprint)
+        if value is not _MISSING:
+            tracing.incr('cache_lookups_total', cache='checkpoint', result='hit')
+            return value
+        tracing.incr('cache_lookups_total', cache='checkpoint', result='miss')
+        value = compute()
+        if isinstance(value, Transient):
+            return value.value
+        self.put(run_id, step, step_fingerprint, value)
+        return value
+
+    async def astep(
+        self,
+        run_id: str,
+        step: str,
+        inputs: Sequence[Any],
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Async variant of step(). The checkpoint lookup runs on a worker
+        thread, since it may wait on the database.
+        """
+        step_fingerprint = fingerprint(inputs)
+        value = await asyncio.to_thread(self._lookup, run_id, step, step_fingerprint)
+        if value is not _MISSING:
+            tracing.incr('cache_lookups_total', cache='checkpoint', result='hit')
+            return value
+        tracing.incr('cache_lookups_total', cache='checkpoint', result='miss')
+        value = await compute()
+        if isinstance(value, Transient):
+            return value.value
+        self.put(run_id, step, step_fingerprint, value)
+        return value
+
+    def steps(self, run_id: str) -> Dict[str, Any]:
+        """All checkpointed outputs of a run by step name."""
+        self.flush()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT step, output FROM steps WHERE run_id = ? ORDER BY updated", (run_id,)
+            ).fetchall()
+        return {step: json.loads(zlib.decompress(output)) for step, output in rows}
+
+    def delete_run(self, run_id: str) -> None:
+        """Drop every checkpoint of a run."""
+        self.flush()
+        with self._lock:
+            self._db.execute("DELETE FROM steps WHERE run_id = ?", (run_id,))
+            self._db.commit()
+
+    def flush(self) -> None:
+        """Block until every queued checkpoint is committed."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Commit queued checkpoints and stop the writer."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        self._db.close()
+        atexit.unregister(self.close)
+
+    def _lookup(self, run_id: str, step: str, step_fingerprint: Optional[str]) -> Any:
+        with self._lock:
+            record = self._pending.get((run_id, step))
+            if record is None:
+                record = self._db.execute(
+                    "SELECT fingerprint, output FROM steps WHERE run_id = ? AND step = ?", (run_id, step)
+                ).fetchone()
+        if record is None or (step_fingerprint is not None and record[0] != step_fingerprint):
+            return _MISSING
+        return json.loads(zlib.decompress(record[1]))
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            items = [item for item in batch if item is not None]
+            try:
+                if items:
+                    self._write(items)
+            except Exception as e:
+                # The checkpoints stay in _pending, so this process still sees them
+                logger.exception("Failed to commit %d checkpoints to %s", len(items), self.path)
+                self.write_error = e
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(items) < len(batch):
+                return
+
+    def _write(self, items: List[Tuple[str, str, Tuple[str, bytes]]]) -> None:
+        """Commit a batch of queued checkpoints."""
+        now = time.time()
+        with self._lock:
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO steps (run_id, step, fingerprint, output, updated) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(run_id, step, fp, output, now) for run_id, step, (fp, output) in items]
+                )
+                self._db.commit()
+            except Exception:
+                self._db.rollback()
+                raise
+            for run_id, step, record in items:
+                # A newer checkpoint for the step may have been queued since
+                if self._pending.get((run_id, step)) is record:
+                    del self._pending[(run_id, step)]
+
+class CheckpointedTool:
+    """
+    Proxy for a tool whose results are checkpointed per input.
+
+    Matches the factory interface used by the workflow planner: calling
+    the proxy's run() or arun() reuses a checkpoint for the same tool and input and
+    only builds and runs the real tool on a miss. Failed calls, raising or
+    returning an error message, are not checkpointed.
+    """
+
+    def __init__(self, factory: Callable[[], Any], state: StateStore, run_id: str, tool_id: str):
+        self.factory = factory
+        self.state = state
+        self.run_id = run_id
+        self.tool_id = tool_id
+
+    def run(self, tool_input: Any) -> str:
+        inputs = [self.tool_id, tool_input]
+        return self.state.step(
+            self.run_id, self._step(inputs), inputs,
+            lambda: _tool_result(str(self.factory().run(tool_input)))
+        )
+
+    async def arun(self, tool_input: Any) -> str:
+        inputs = [self.tool_id, tool_input]
+
+        async def compute():
+            tool = await asyncio.to_thread(self.factory)
+            if hasattr(tool, 'arun'):
+                return _tool_result(str(await tool.arun(tool_input)))
+            return _tool_result(str(await asyncio.to_thread(tool.run, tool_input)))
+        return await self.state.astep(self.run_id, self._step(inputs), inputs, compute)
+
+    def _step(self, inputs: List[Any]) -> str:
+        return f"tool:{self.tool_id}:{fingerprint(inputs)[:16]}"
+
+def checkpoint_if(value: Any, ok: bool) -> Any:
+    """Step output that is checkpointed if ok, and otherwise only returned."""
+    return value if ok else Transient(value)
+
+def _tool_result(output: str) -> Any:
+    """Checkpoint a tool output unless it reports an error."""
+    from nodes import is_tool_error
+    return checkpoint_if(output, not is_tool_error(output))
+
+def llm_identity(llm: Any) -> dict:
+    """Settings that identify an LLM client, for step fingerprints."""
+    return {
+        'type': type(llm).__name__,
+        'model': getattr(llm, 'model_name', None) or getattr(llm, 'model', None),
+        'temperature': getattr(llm, 'temperature', None),
+        'max_tokens': getattr(llm, 'max_tokens', None),
+    }
+
+@lru_cache(maxsize=None)
+def get_state_store() -> StateStore:
+    """Return the process-wide state store at the default path."""
+    return StateStore()
@@ -0,0 +1,114 @@
+"""
+Test suite for the two-tier LLM response cache.
+"""
+from collections import Counter
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+
+import workflows.basic as basic
+from llm.cache import LLMResponseCache
+from vectorstore import HashingEmbeddings
+
+calls = []
+
+
+class EchoChatModel(FakeListChatModel):
+    """Deterministic fake chat model answering with the last prompt line."""
+
+    def _call(self, messages, *args, **kwargs):
+        calls.append(messages)
+        return "answer: " + messages[-1].content.splitlines()[-1]
+
+
+class BagOfWordsEmbeddings(Embeddings):
+    """Deterministic embeddings over a fixed vocabulary."""
+    vocabulary = ['latest', 'recent', 'advancements', 'transformers', 'weather', 'forecast']
+
+    def embed_query(self, text):
+        counts = Counter(text.lower().replace('?', ' ').split())
+        return [float(counts[word]) for word in self.vocabulary]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+def test_llm_cache_exact_and_semantic(tmp_path, monkeypatch):
+    """
+    Repeat and near-identical inputs skip the model; others do not.
+    """
+    monkeypatch.setattr(basic, 'get_llm', lambda llm_type: EchoChatModel(responses=[""]))
+    cache = LLMResponseCache(
+        path=str(tmp_path / 'llm.db'),
+        embeddings=BagOfWordsEmbeddings(),
+        similarity_threshold=0.8
+    )
+    calls.clear()
+
+    def run(text):
+        return basic.create_workflow(text, cache=cache).run()
+
+    first = "answer: latest advancements in transformers"
+    assert run("latest advancements in transformers") == first
+    assert run("latest advancements in transformers") == first
+    assert run("Latest advancements in transformers?") == first
+    assert run("weather forecast") == "answer: weather forecast"
+    assert len(calls) == 2
+
+    stats = cache.stats
+    assert (stats['hits'], stats['semantic_hits'], stats['misses']) == (1, 1, 2)
+    assert stats['hit_rate'] == 0.5
+
+    # Eviction keeps the store under its size bound
+    cache.max_bytes = 0
+    cache.update("x", "y", [])
+    assert cache.stats['entries'] == 0
+
+
+def test_llm_cache_semantic_tier_ignores_prompt_template(tmp_path, monkeypatch):
+    """
+    Unrelated inputs under the same long workflow prompt are not confused.
+    """
+    monkeypatch.setattr(basic, 'get_llm', lambda llm_type: EchoChatModel(responses=[""]))
+    cache = LLMResponseCache(path=str(tmp_path / 'llm.db'), embeddings=HashingEmbeddings())
+
+    def run(text):
+        return basic.create_workflow(text, cache=cache).run()
+
+    assert run("What is the capital of France?") == "answer: What is the capital of France?"
+    assert run("How do I delete a remote git branch?") == "answer: How do I delete a remote git branch?"
+    assert cache.stats['semantic_hits'] == 0
+
+
+class CountingEmbeddings(HashingEmbeddings):
+    """Hashing embeddings that count the texts embedded."""
+    embedded = 0
+
+    def embed_query(self, text):
+        type(self).embedded += 1
+        return super().embed_query(text)
+
+
+def test_llm_cache_semantic_tier_is_scoped_by_system_prompt(tmp_path):
+    """
+    The same input under different system prompts is not a semantic hit,
+    and a miss is embedded once for both its lookup and its update.
+    """
+    cache = LLMResponseCache(path=str(tmp_path / 'llm.db'), embeddings=CountingEmbeddings())
+    llm = EchoChatModel(responses=[""], cache=cache)
+    question = HumanMessage("What are the latest advancements in transformers?")
+    calls.clear()
+    CountingEmbeddings.embedded = 0
+
+    llm.invoke([SystemMessage("You summarize research notes."), question])
+    assert CountingEmbeddings.embedded == 1
+    llm.invoke([SystemMessage("You decide whether to search the web."), question])
+    assert len(calls) == 2 and cache.stats['semantic_hits'] == 0
+
+    # Same instructions, near-identical input: served from the semantic tier
+    llm.invoke([
+        SystemMessage("You summarize research notes."),
+        HumanMessage("What are the latest advancements in transformers")
+    ])
+    assert len(calls) == 2 and cache.stats['semantic_hits'] == 1
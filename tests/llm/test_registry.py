@@ -0,0 +1,65 @@
+"""
+Test suite for the shared LLM client registry.
+"""
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from llm.registry import (
+    HTTP_MAX_CONNECTIONS,
+    HTTP_TIMEOUT,
+    clear_clients,
+    get_async_http_client,
+    get_client,
+    get_http_client
+)
+
+
+def test_registry_builds_each_client_once():
+    """
+    Concurrent lookups of the same settings share one client instance.
+    """
+    clear_clients()
+    built = []
+
+    def factory():
+        built.append(object())
+        return built[-1]
+
+    clients = []
+    threads = [
+        threading.Thread(target=lambda: clients.append(get_client('fake', 'model', 0.0, 10, factory)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(built) == 1
+    assert all(client is built[0] for client in clients)
+    assert get_client('fake', 'model', 0.5, 10, factory) is not built[0]
+    clear_clients()
+
+
+def test_registry_shares_tuned_sync_and_async_http_clients():
+    """
+    Sync and async calls each reuse one pooled client with the same tuning,
+    and importing the registry does not pull in httpx.
+    """
+    import httpx
+
+    sync_client = get_http_client()
+    async_client = get_async_http_client()
+
+    assert isinstance(async_client, httpx.AsyncClient)
+    assert get_async_http_client() is async_client
+    assert async_client.timeout == sync_client.timeout == httpx.Timeout(HTTP_TIMEOUT)
+    assert async_client._transport._pool._max_connections == HTTP_MAX_CONNECTIONS
+
+    result = subprocess.run(
+        [sys.executable, '-c', "import sys, llm.registry; print('httpx' in sys.modules)"],
+        cwd=Path(__file__).resolve().parents[2], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == 'False'
@@ -2,24 +2,26 @@
 Manual test script for File Loader Tool.
 """
 import os
+import signal
 import sys
+import time
 from pathlib import Path
 
 # Add project root to Python path
 project_root = str(Path(__file__).parent.parent.parent)
 sys.path.insert(0, project_root)
 
+import nodes.file_loader_tool as file_loader_tool
 from nodes.file_loader_tool import FileLoaderTool
+from nodes.document_cache import DocumentCache
+from benchmarks.pdf_support import write_pdf
 
-def test_file_loader():
+def test_file_loader(tmp_path):
     """
     Manually test the File Loader Tool with sample files.
     """
     tool = FileLoaderTool()
-
-    # Create example_data directory if it doesn't exist
-    data_dir = Path(project_root) / "example_data"
-    data_dir.mkdir(exist_ok=True)
+    data_dir = tmp_path
 
     # Create sample files for testing
     create_sample_files(data_dir)
@@ -61,6 +63,220 @@ def test_file_loader():
         else:
             print(f"File not found: {case['file']}")
 
+def test_file_loader_chunks(tmp_path):
+    """
+    Stream a CSV file in bounded chunks and check nothing is lost.
+    """
+    tool = FileLoaderTool()
+    csv_file = tmp_path / 'rows.csv'
+    csv_file.write_text("name,value\n" + "\n".join(f"row{i},{i}" for i in range(500)))
+
+    chunks = list(tool.iter_chunks(str(csv_file), max_bytes=2048))
+
+    assert len(chunks) > 1
+    assert all(len(chunk.encode('utf-8')) <= 2048 for chunk in chunks)
+    assert "\n".join(chunks) == tool._run(file_path=str(csv_file))
+
+def test_file_loader_cache(tmp_path):
+    """
+    Repeated loads of an unchanged file are served from the parse cache.
+    """
+    cache = DocumentCache(cache_dir=str(tmp_path / 'cache'), max_bytes=1024 * 1024)
+    tool = FileLoaderTool(cache=cache)
+    text_file = tmp_path / 'notes.txt'
+    text_file.write_text("Cached content")
+
+    first = tool._run(file_path=str(text_file))
+    second = tool._run(file_path=str(text_file))
+    assert first == second
+    assert cache.stats['hits'] == 1 and cache.stats['misses'] == 1
+
+    # Changing the content changes the key
+    text_file.write_text("New content")
+    assert "New content" in tool._run(file_path=str(text_file))
+    assert cache.stats['misses'] == 2
+
+    # Eviction keeps the cache under its size bound
+    cache.max_bytes = 1
+    cache._evict()
+    assert cache.stats['entries'] == 0
+
+def test_file_loader_cache_hit_names_requested_path(tmp_path):
+    """
+    A copy of a cached file is served from the cache under its own path.
+    """
+    import shutil
+
+    cache = DocumentCache(cache_dir=str(tmp_path / 'cache'))
+    tool = FileLoaderTool(cache=cache)
+    original = tmp_path / 'notes.txt'
+    original.write_text("Shared content")
+    (tmp_path / 'copies').mkdir()
+    copy = tmp_path / 'copies' / 'renamed.txt'
+    shutil.copy(original, copy)
+
+    assert tool.load_documents(str(original))[0].metadata['source'] == str(original)
+    documents = tool.load_documents(str(copy))
+    assert cache.stats['hits'] == 1
+    assert documents[0].metadata['source'] == str(copy)
+
+def test_file_loader_batch(tmp_path):
+    """
+    Load a directory in parallel with per-file error reporting.
+    """
+    tool = FileLoaderTool()
+    (tmp_path / 'b.txt').write_text("second file")
+    (tmp_path / 'a.txt').write_text("first file")
+    (tmp_path / 'broken.json').write_text("{not json")
+    (tmp_path / 'ignored.bin').write_bytes(b"\x00")
+
+    results = tool.load_batch(str(tmp_path), max_workers=2, timeout=30)
+
+    assert [Path(r.file_path).name for r in results] == ['a.txt', 'b.txt', 'broken.json']
+    assert "first file" in results[0].content and results[0].error is None
+    assert results[2].content is None and results[2].error
+
+def _stuck_worker(file_path, loader_args, cache_args=None, timeout=None):
+    """Batch worker that hangs where the in-process alarm cannot stop it."""
+    if file_path.endswith('stuck.txt'):
+        signal.signal(signal.SIGALRM, signal.SIG_IGN)
+        time.sleep(60)
+    return f"loaded {Path(file_path).name}"
+
+def test_file_loader_batch_kills_stuck_worker(tmp_path, monkeypatch):
+    """
+    A worker past its deadline is killed without losing the other files.
+    """
+    monkeypatch.setattr(file_loader_tool, '_load_file_worker', _stuck_worker)
+    monkeypatch.setattr(file_loader_tool, 'BATCH_TIMEOUT_MARGIN', 0.5)
+    for name in ('a.txt', 'b.txt', 'c.txt', 'stuck.txt'):
+        (tmp_path / name).write_text(name)
+
+    start = time.perf_counter()
+    results = FileLoaderTool().load_batch(str(tmp_path), max_workers=2, timeout=0.5)
+
+    assert time.perf_counter() - start < 10
+    assert [r.content for r in results[:3]] == ["loaded a.txt", "loaded b.txt", "loaded c.txt"]
+    assert results[3].error.startswith("TimeoutError")
+
+def test_file_loader_tabular_fast_path(tmp_path):
+    """
+    The columnar fast path batches rows, projects, filters and summarizes.
+    """
+    import pandas as pd
+
+    tool = FileLoaderTool()
+    frame = pd.DataFrame({
+        'region': ['EU', 'US'] * 600,
+        'price': [float(i) for i in range(1200)],
+        'note': ['x'] * 1200
+    })
+    csv_file = tmp_path / 'sales.csv'
+    frame.to_csv(csv_file, index=False)
+    excel_file = tmp_path / 'sales.xlsx'
+    frame.to_excel(excel_file, index=False)
+
+    for path in (csv_file, excel_file):
+        rows = tool.load_documents(str(path), mode='rows')
+        assert len(rows) == 3
+        assert rows[0].page_content.splitlines()[0] == "region,price,note"
+        assert (rows[-1].metadata['first_row'], rows[-1].metadata['last_row']) == (1000, 1199)
+
+        filtered = tool.load_documents(
+            str(path), columns=['region', 'price'], row_filter="region == 'EU' and price >= 1000"
+        )
+        lines = "\n".join(doc.page_content for doc in filtered).splitlines()
+        assert lines[0] == "region,price" and len(lines) == 1 + 100
+
+        summary = tool.load_documents(str(path), mode='summary')[0].page_content
+        assert "Rows: 1200" in summary and "mean 599.5" in summary
+
+        sample = tool.load_documents(str(path), mode='sample')[0]
+        assert sample.metadata['rows'] == 20
+
+    assert "Unknown tabular mode" in tool._run(file_path=str(csv_file), mode='bogus')
+
+def test_tabular_xlsx_columns_and_types_are_consistent(tmp_path):
+    """
+    Unknown Excel columns are reported like CSV ones, and chunks keep the
+    column types of the first chunk so the summary covers every row.
+    """
+    import pandas as pd
+    from nodes.tabular_loader import _summarize, iter_frames
+
+    frame = pd.DataFrame({'price': [1, 2, 'n/a', 4, None, 6], 'units': [1, 2, None, None, 5, 6]})
+    excel_file = tmp_path / 'stock.xlsx'
+    frame.to_excel(excel_file, index=False)
+    csv_file = tmp_path / 'stock.csv'
+    frame.to_csv(csv_file, index=False)
+
+    tool = FileLoaderTool()
+    for path in (csv_file, excel_file):
+        assert "Unknown column: cost" in tool._run(file_path=str(path), columns=['price', 'cost'])
+
+    chunks = list(iter_frames(str(excel_file), columns=['price', 'units'], chunk_rows=2))
+    assert len(chunks) == 3
+    assert all(pd.api.types.is_numeric_dtype(chunk[name]) for chunk in chunks for name in ('price', 'units'))
+    summary = _summarize(str(excel_file), iter(chunks)).page_content
+    assert "- price (int64): 4 non-null, min 1, max 6" in summary and "mean 3.25" in summary
+    assert "- units (int64): 4 non-null, min 1, max 6, mean 3.5" in summary
+
+def test_file_loader_row_filter_is_not_evaluated(tmp_path):
+    """
+    Row filters are parsed, never evaluated, so method calls are rejected.
+    """
+    import pandas as pd
+
+    csv_file = tmp_path / 'sales.csv'
+    pd.DataFrame({'region': ['EU', 'US', 'EU'], 'unit price': [1.0, 20.0, None]}).to_csv(csv_file, index=False)
+    target = tmp_path / 'leak.csv'
+    tool = FileLoaderTool()
+
+    for row_filter in (f"region.to_csv('{target}') != 0", "@pd.io", "region == 'EU' and"):
+        assert "Invalid row filter" in tool._run(file_path=str(csv_file), row_filter=row_filter)
+    assert not target.exists()
+
+    rows = tool.load_documents(
+        str(csv_file), mode='rows', row_filter="region == 'EU' and not `unit price` == None"
+    )
+    assert rows[0].page_content.splitlines()[1:] == ["EU,1.0"]
+
+def test_file_loader_pdf_pages(tmp_path):
+    """
+    PDF pages come back in order, in parallel or not, and can be selected.
+    """
+    from nodes.pdf_extract import iter_pdf_pages, parse_page_selection
+
+    pdf_file = tmp_path / 'report.pdf'
+    write_pdf(pdf_file, [f"Page number {i}" for i in range(1, 41)])
+
+    serial = list(iter_pdf_pages(str(pdf_file), max_workers=1))
+    parallel = list(iter_pdf_pages(str(pdf_file), max_workers=2, pages_per_task=4))
+    assert [doc.metadata['page'] for doc in parallel] == list(range(40))
+    assert [doc.page_content for doc in parallel] == [doc.page_content for doc in serial]
+    assert "Page number 40" in parallel[-1].page_content
+
+    assert parse_page_selection("3-5, 1, 39-", 40) == [0, 2, 3, 4, 38, 39]
+    selected = FileLoaderTool().load_documents(str(pdf_file), pages="10-12")
+    assert [doc.page_content.strip() for doc in selected] == [f"Page number {i}" for i in (10, 11, 12)]
+    assert "Invalid page selection" in FileLoaderTool()._run(file_path=str(pdf_file), pages="x-y")
+
+def test_pdf_pages_concurrent_extractions_share_pool(tmp_path):
+    """
+    Extractions asking for different worker counts can run at the same time.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from nodes.pdf_extract import iter_pdf_pages
+
+    pdf_file = tmp_path / 'report.pdf'
+    write_pdf(pdf_file, [f"Page number {i}" for i in range(1, 41)])
+
+    def extract(max_workers):
+        return len(list(iter_pdf_pages(str(pdf_file), max_workers=max_workers, pages_per_task=2)))
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(extract, [2, 3, 4, 5, 6, 7, 8, 9])) == [40] * 8
+
 def create_sample_files(data_dir: Path):
     """Create sample files for testing."""
     # Create CSV file
@@ -2,7 +2,10 @@
 Manual test script for Python Executor Tool.
 """
 import os
+import signal
+import time
 from nodes.python_executor import PythonExecutorTool
+from nodes.sandbox_pool import LocalSandbox, SandboxPool, SubprocessSandbox
 
 def test_python_executor():
     """
@@ -49,5 +52,64 @@ print(df.sum())
         result = python_tool._run(case['code'])
         print(result)
 
+def test_sandbox_pool_local():
+    """
+    Reuse warm local sandboxes, with state kept per session only.
+    """
+    pool = SandboxPool(SubprocessSandbox, min_size=1, max_size=2, idle_timeout=60)
+    pool.warmup()
+    tool = PythonExecutorTool(backend='local', pool=pool)
+    try:
+        assert tool._run('x = 21', session_id='a') == ''
+        assert tool._run('print(x * 2)', session_id='a') == '42\n'
+        # Other sessions and unbound executions start from a clean namespace
+        assert 'NameError' in tool._run('print(x)', session_id='b')
+        assert 'NameError' in tool._run('print(x)')
+        assert pool.stats['size'] <= 2
+
+        pool.end_session('a')
+        assert 'NameError' in tool._run('print(x)', session_id='a')
+    finally:
+        pool.close()
+
+def test_local_sandbox_limits():
+    """
+    Local sandboxes report rich output and enforce their resource limits.
+    """
+    sandbox = LocalSandbox(timeout=10, cpu_time=1, preload=())
+    try:
+        response = sandbox.execute('total = sum(range(10))\ntotal')
+        assert response['result'] == '45' and response['error'] is None
+        assert 'CPUTimeExceeded' in sandbox.run('while True: pass')
+        # The sandbox survives a CPU limit and keeps its state
+        assert sandbox.run('print(total)') == '45\n'
+    finally:
+        sandbox.close()
+
+    sandbox = LocalSandbox(timeout=0.5, preload=())
+    assert 'timed out' in PythonExecutorTool(
+        backend='local',
+        pool=SandboxPool(lambda: sandbox, min_size=0, max_size=1)
+    )._run('import time; time.sleep(5)')
+    assert not sandbox.is_healthy()
+
+def test_local_sandbox_health_follows_connection():
+    """
+    A sandbox that exited is unhealthy even if its pid is reused.
+    """
+    sandbox = LocalSandbox(timeout=10, preload=())
+    try:
+        assert sandbox.is_healthy()
+        os.kill(sandbox.pid, signal.SIGKILL)
+        deadline = time.monotonic() + 5
+        while sandbox.is_healthy() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # Stand-in for the pid being reused by a live process
+        sandbox.pid = os.getpid()
+        assert not sandbox.is_healthy()
+    finally:
+        # Must not signal the process now holding the pid
+        sandbox.close()
+
 if __name__ == "__main__":
     test_python_executor() 
\ No newline at end of file
@@ -2,8 +2,60 @@
 Test suite for the TextToMarkdownTool.
 """
 
+from nodes.markdown_converter import MarkdownConverter, iter_markdown
 from nodes.text_to_markdown_tool import TextToMarkdownTool
 
+def test_text_to_markdown_structure():
+    """
+    Headings, lists, tables, code blocks and links are detected in one pass.
+    """
+    text = (
+        "INTRODUCTION\n\n"
+        "See https://example.com/a. Or [docs](https://example.com/b) and `https://x.y`.\n\n"
+        "Results\n=======\n"
+        "• first\n1) second\n"
+        "name\tscore\nalice\t3\n\n\n\n"
+        "```\n• kept\ta\tb\n```\n"
+        "<h2>Html heading</h2>"
+    )
+    assert TextToMarkdownTool()._run(text) == "\n".join([
+        "## INTRODUCTION",
+        "",
+        "See <https://example.com/a>. Or [docs](https://example.com/b) and `https://x.y`.",
+        "",
+        "# Results",
+        "- first",
+        "1. second",
+        "",
+        "| name | score |",
+        "| --- | --- |",
+        "| alice | 3 |",
+        "",
+        "```",
+        "• kept\ta\tb",
+        "```",
+        "## Html heading",
+    ])
+
+def test_text_to_markdown_streams_lines():
+    """
+    Output is emitted while input is still being read.
+    """
+    converter = MarkdownConverter()
+    assert converter.feed("• item\n") == ["- item"]
+    # A paragraph line waits for the next line, which may underline it
+    assert converter.feed("Title\n") == []
+    assert converter.feed("-----\n") == ["## Title"]
+    assert list(iter_markdown(["a\tb\n"])) == ["a\tb"]
+
+def test_text_to_markdown_keeps_tabbed_code():
+    """
+    Indented code with tabs is not mistaken for a table.
+    """
+    code = ["\tif ready:\tgo()", "\t\treturn\t1", "    x =\t2\ty"]
+    assert list(iter_markdown(code)) == code
+    assert list(iter_markdown(["x\t1", "y\t2"])) == ["| x | 1 |", "| --- | --- |", "| y | 2 |"]
+
 if __name__ == "__main__":
     print("Running manual test for TextToMarkdown")
     tool = TextToMarkdownTool()
@@ -0,0 +1,48 @@
+"""
+Tests for the shared tool registry.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from nodes import get_tool_by_id
+from nodes.registry import ToolRegistry
+
+class CountingTool:
+    built = 0
+
+    def __init__(self):
+        type(self).built += 1
+        time.sleep(0.05)
+        self.warmed = False
+        self.closed = False
+
+    def warmup(self):
+        self.warmed = True
+
+    def close(self):
+        self.closed = True
+
+    def run(self, tool_input):
+        return tool_input
+
+def broken_tool():
+    raise ValueError("API key is required")
+
+def test_registry_builds_each_tool_once():
+    CountingTool.built = 0
+    registry = ToolRegistry([{'id': 'counting', 'tool': CountingTool}, {'id': 'broken', 'tool': broken_tool}])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        tools = list(pool.map(lambda _: registry.factories()['counting'](), range(16)))
+    assert CountingTool.built == 1 and all(tool is tools[0] for tool in tools)
+    assert registry.get('missing') is None
+
+    errors = registry.warmup()
+    assert tools[0].warmed and errors == {'broken': "API key is required"}
+
+    registry.close()
+    assert tools[0].closed
+    assert registry.get('counting') is not tools[0] and CountingTool.built == 2
+
+def test_get_tool_by_id_reuses_instance():
+    assert get_tool_by_id('text_to_markdown') is get_tool_by_id('text_to_markdown')
@@ -1,8 +1,125 @@
 """
 Test suite for the WebSearchTool.
 """
+import asyncio
+import threading
+import time
 
 from nodes.web_search import WebSearchTool
+from nodes.search_cache import SearchCache
+from nodes.search_providers import SearchProvider
+
+
+class CountingProvider(SearchProvider):
+    """Local provider that counts the searches reaching it."""
+    name = "counting"
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def search(self, query):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return [{'title': 'Result', 'url': 'https://example.com', 'content': f"results for {query}"}]
+
+
+def test_web_search_cache(tmp_path):
+    """
+    Concurrent identical queries share one upstream call and later
+    queries are answered from the cache, including after a restart.
+    """
+    db_path = str(tmp_path / 'search.db')
+    provider = CountingProvider()
+    tool = WebSearchTool(cache=SearchCache(ttl=60, db_path=db_path), providers=[provider])
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(tool._run("What is  LangChain?")))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 5 and len(set(results)) == 1
+    assert "results for What is  LangChain?" in results[0]
+    assert provider.calls == 1
+    assert tool._run("what is langchain?") == results[0]
+    assert provider.calls == 1
+
+    restarted_provider = CountingProvider()
+    restarted = WebSearchTool(cache=SearchCache(ttl=60, db_path=db_path), providers=[restarted_provider])
+    assert restarted._run("What is LangChain?") == results[0]
+    assert restarted_provider.calls == 0
+
+
+def test_web_search_async_dedup_beyond_executor_threads():
+    """
+    Identical async queries outnumbering the default executor's threads
+    wait on the event loop, leaving a thread for the one upstream search.
+    """
+    provider = CountingProvider(delay=0.2)
+    tool = WebSearchTool(cache=SearchCache(ttl=60), providers=[provider], provider_timeout=3)
+
+    async def search_all():
+        return await asyncio.gather(*(tool.arun("same query") for _ in range(100)))
+
+    start = time.perf_counter()
+    results = asyncio.run(search_all())
+    assert time.perf_counter() - start < 2
+    assert all("results for same query" in result for result in results)
+    assert provider.calls == 1
+
+
+class StubProvider(SearchProvider):
+    """Local provider returning canned results after a fixed delay."""
+
+    def __init__(self, name, results, delay=0.0, fail=False):
+        self.name = name
+        self.results = results
+        self.delay = delay
+        self.fail = fail
+
+    async def asearch(self, query):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} is down")
+        return self.results
+
+
+def test_web_search_providers(caplog):
+    """
+    Hedged and merged fan-out across stub providers, logging their failures.
+    """
+    slow = StubProvider('slow', [{'title': 'Slow', 'url': 'https://a.example', 'content': 'slow'}], delay=5)
+    fast = StubProvider('fast', [{'title': 'Fast', 'url': 'https://b.example', 'content': 'fast'}], delay=0.01)
+    broken = StubProvider('broken', [], fail=True)
+
+    hedged = WebSearchTool(cache=SearchCache(ttl=0), providers=[broken, slow, fast], mode='first')
+    start = time.perf_counter()
+    assert "'Fast'" in asyncio.run(hedged._arun("query"))
+    assert time.perf_counter() - start < 1
+
+    duplicate = StubProvider('dup', fast.results + slow.results)
+    merged = WebSearchTool(
+        cache=SearchCache(ttl=0),
+        providers=[fast, duplicate, broken, slow],
+        mode='merge',
+        provider_timeout=0.5
+    )
+    result = merged._run("query")
+    assert result.count('https://b.example') == 1
+    assert 'https://a.example' in result
+
+    nothing = WebSearchTool(cache=SearchCache(ttl=0), providers=[broken])
+    assert nothing._run("query") == "No search provider available"
+    failures = [record for record in caplog.records if record.name == 'nodes.web_search']
+    assert any(record.exc_info and "broken is down" in str(record.exc_info[1]) for record in failures)
+    assert any("slow search timed out" in record.getMessage() for record in failures)
 
 
 if __name__ == "__main__":
@@ -10,4 +127,4 @@ if __name__ == "__main__":
     tool = WebSearchTool()
     query = "Who is Kiran Silaych?"
     result = tool._run(query)
-    print(result)
\ No newline at end of file
+    print(result)
@@ -0,0 +1,32 @@
+"""
+Tests for the offline benchmark suite.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.run_suite import bench_generic_workflow, bench_web_search_workflow, compare
+
+
+def test_workflow_cases_run_offline():
+    """
+    Both workflows run end to end against the replaying fakes.
+    """
+    args = argparse.Namespace(iterations=3, latency_scale=0.0)
+    for case in (bench_generic_workflow, bench_web_search_workflow):
+        result = case(args)
+        assert result['samples'] == 3 and result['unit'] == "runs/s"
+        assert result['p50_ms'] <= result['p99_ms']
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = {'throughput': 10.0, 'p50_ms': 100.0, 'p99_ms': 200.0, 'peak_rss_mb': 100.0}
+    within = {'throughput': 9.0, 'p50_ms': 110.0, 'p99_ms': 220.0, 'peak_rss_mb': 110.0}
+    worse = {'throughput': 5.0, 'p50_ms': 200.0, 'p99_ms': 400.0, 'peak_rss_mb': 100.0}
+
+    assert compare(within, baseline, 0.25) == []
+    assert compare(worse, baseline, 0.25) == ['throughput', 'p50_ms', 'p99_ms']
+    assert compare({'error': "boom"}, baseline, 0.25) == ['failed']
+    assert compare({'skipped': "No module named 'docx'"}, baseline, 0.25) == []
@@ -0,0 +1,86 @@
+"""
+Test suite for compaction of tool outputs.
+"""
+from langchain_core.documents import Document
+
+from nodes.file_loader_tool import FileLoaderTool
+from nodes.web_search import WebSearchTool
+from utils import ELISION_MARKER, compact_text, count_tokens, select_passages
+from workflows.planner import ToolCall, ToolPlan, execute_plan
+
+
+def test_compaction_drops_repeated_passages_and_metadata():
+    """
+    A loader dump keeps each row once and only the metadata that changes.
+    """
+    documents = [
+        Document(page_content=content, metadata={'source': 'data.csv', 'row': row})
+        for row, content in enumerate(["name: Ada\nage: 36", "name: Alan\nage: 41", "name: Ada\nage: 36"])
+    ]
+    dump = FileLoaderTool()._format_documents(documents)
+    compacted = compact_text(dump, token_budget=10000)
+
+    assert compacted.count("name: Ada") == 1 and "name: Alan" in compacted
+    assert "{'source': 'data.csv', 'row': 0}" in compacted
+    assert "{'row': 1}" in compacted and compacted.count("data.csv") == 1
+    assert count_tokens(compacted) < count_tokens(dump)
+
+
+def test_compaction_selects_relevant_passages_within_budget():
+    """
+    Over budget, the passage matching the query is kept and the rest elided.
+    """
+    filler = [f"Paragraph {i} is about the weather and nothing else of note." for i in range(40)]
+    passages = filler[:25] + ["Quarterly revenue grew by 12 percent, driven by cloud sales."] + filler[25:]
+    text = "\n\n".join(passages)
+
+    compacted = compact_text(text, token_budget=60, query="How much did revenue grow?")
+    assert count_tokens(compacted) <= 60
+    assert "Quarterly revenue grew by 12 percent" in compacted
+    assert ELISION_MARKER in compacted
+    # Within the budget, only duplicates are removed
+    assert compact_text("a\n\nb\n\na", token_budget=100) == "a\n\nb"
+
+
+def test_selection_truncates_unpunctuated_passages_to_fit():
+    """
+    A passage over the budget with no sentence breaks is cut to fit with
+    its markers, rather than dropped entirely.
+    """
+    passage = " ".join(f"token{i}" for i in range(1800))
+    assert count_tokens(passage) > 900
+
+    selected = select_passages([passage], token_budget=150, query="token42")
+    assert selected.startswith("token0 token1")
+    assert count_tokens(selected) <= 150
+    # Too small a budget for any unit with its markers: the text start is kept
+    assert select_passages([passage], token_budget=3) == "token0 token"
+
+
+class EchoTool:
+    def run(self, tool_input):
+        return tool_input
+
+
+def test_outputs_are_compacted_between_tools_and_search_results():
+    """
+    Planner inputs taken from earlier tools and web search results are
+    compacted to their budgets.
+    """
+    large = "\n\n".join(f"Passage {i} on an unrelated topic, repeated at length." for i in range(200))
+    plan = ToolPlan(tool_calls=[
+        ToolCall(id='load', tool='echo', input=large),
+        ToolCall(id='format', tool='echo', input_from='load')
+    ])
+    results = execute_plan(plan, {'echo': EchoTool}, "response", token_budget=100)
+    # The final output is left whole; only the input passed on is compacted
+    assert results['load'] == large
+    assert count_tokens(results['format']) <= 100
+
+    tool = WebSearchTool.__new__(WebSearchTool)
+    formatted = tool._format_results([
+        {'title': 'A', 'url': 'https://a.example', 'content': "Shared intro.\n\nSolar output rose."},
+        {'title': 'B', 'url': 'https://b.example', 'content': "Shared intro.\n\n" + "Wind. " * 2000}
+    ], query="solar output")
+    assert formatted.count("Shared intro.") == 1
+    assert count_tokens(formatted) < 400
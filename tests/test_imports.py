@@ -0,0 +1,36 @@
+"""
+Import-time regression guard for the nodes and llm packages.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.bench_import_time import HEAVY_MODULES, PROBE
+
+
+def test_entry_modules_do_not_import_heavy_dependencies():
+    """
+    Importing the packages and main must not load tool or provider SDKs.
+    """
+    for module in ('nodes', 'llm', 'main'):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        assert json.loads(output.strip().splitlines()[-1])['heavy'] == [], module
+
+
+def test_lazy_tools_resolve_on_use():
+    import nodes
+
+    tool_config = next(config for config in nodes.AVAILABLE_TOOLS if config['id'] == 'text_to_markdown')
+    tool = tool_config['tool']()
+    assert type(tool) is tool_config['tool'].resolve() is nodes.TextToMarkdownTool
+    assert nodes.get_tool_by_id('text_to_markdown').name == tool.name
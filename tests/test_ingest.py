@@ -0,0 +1,53 @@
+"""
+Test suite for the incremental ingestion pipeline.
+"""
+import os
+
+from ingest import IngestPipeline
+from vectorstore import HashingEmbeddings
+
+
+class CountingEmbeddings(HashingEmbeddings):
+    """Hashing embeddings that record how many texts were embedded."""
+
+    def __init__(self):
+        super().__init__(dim=64)
+        self.embedded = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return super().embed_documents(texts)
+
+
+def test_ingest_only_changed_files(tmp_path):
+    """
+    Unchanged files are skipped, changed ones replaced and removed ones pruned.
+    """
+    docs = tmp_path / 'docs'
+    docs.mkdir()
+    (docs / 'apples.txt').write_text("Apples are red and crunchy.")
+    (docs / 'bananas.txt').write_text("Bananas are yellow and soft.")
+    (docs / 'cherries.txt').write_text("Cherries grow on trees.")
+    index_dir = str(tmp_path / 'index')
+
+    embedder = CountingEmbeddings()
+    stats = IngestPipeline(index_dir, embedder).ingest(str(docs))
+    assert (stats.added, stats.unchanged, stats.chunks) == (3, 0, 3)
+    assert embedder.embedded == 3
+
+    # Touching a file without changing it does not re-embed it
+    os.utime(docs / 'apples.txt', ns=(0, 0))
+    (docs / 'bananas.txt').write_text("Bananas are yellow, soft and sweet.")
+    (docs / 'cherries.txt').unlink()
+    embedder = CountingEmbeddings()
+    pipeline = IngestPipeline(index_dir, embedder)
+    stats = pipeline.ingest(str(docs))
+    assert (stats.added, stats.updated, stats.unchanged, stats.removed) == (0, 1, 1, 1)
+    assert embedder.embedded == 1
+    assert len(pipeline.store) == 2
+
+    stats = IngestPipeline(index_dir, embedder).ingest(str(docs))
+    assert stats.unchanged == 2 and stats.chunks == 0
+    top = IngestPipeline(index_dir, embedder).search("sweet bananas", k=1)[0]
+    assert top.metadata['file_path'].endswith('bananas.txt')
+    assert 'sweet' in top.page_content
@@ -0,0 +1,135 @@
+"""
+Test suite for workflow checkpoints and resume.
+"""
+import sqlite3
+import threading
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+import workflows.basic as basic
+from nodes.registry import ToolRegistry
+from state import StateStore, fingerprint
+
+calls = []
+
+
+class MarkdownChatModel(FakeListChatModel):
+    """Fake chat model that asks for the markdown tool."""
+
+    def _call(self, messages, *args, **kwargs):
+        calls.append(messages)
+        return "Findings. Use text_to_markdown on this."
+
+
+def test_state_store_background_writes(tmp_path):
+    """
+    Checkpoints are readable before and after the background commit.
+    """
+    path = str(tmp_path / 'state.db')
+    store = StateStore(path)
+    store.put('run', 'a', fingerprint([1]), {'x': [1, 2]})
+    assert store.get('run', 'a') == {'x': [1, 2]}
+    assert store.get('run', 'a', fingerprint([2])) is None
+    assert store.step('run', 'a', [1], lambda: 1 / 0) == {'x': [1, 2]}
+    assert store.step('run', 'b', [1], lambda: "fresh") == "fresh"
+    store.close()
+
+    store = StateStore(path)
+    assert store.steps('run') == {'a': {'x': [1, 2]}, 'b': "fresh"}
+    store.delete_run('run')
+    assert store.steps('run') == {}
+    store.close()
+
+
+class LockedConnection:
+    """SQLite connection whose writes fail as if the database were locked."""
+
+    def __init__(self, db):
+        self._db = db
+
+    def executemany(self, *args):
+        raise sqlite3.OperationalError("database is locked")
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+
+def test_state_store_survives_failed_writes(tmp_path):
+    """
+    A failed commit is recorded, the writer keeps going and flush() returns.
+    """
+    store = StateStore(str(tmp_path / 'state.db'))
+    store._db = LockedConnection(store._db)
+    store.put('run', 'a', fingerprint([1]), "kept")
+
+    flushed = threading.Thread(target=store.flush)
+    flushed.start()
+    flushed.join(timeout=5)
+    assert not flushed.is_alive()
+    assert isinstance(store.write_error, sqlite3.OperationalError)
+    assert store.get('run', 'a') == "kept"
+
+    # Once the database is writable again, later checkpoints are committed
+    store._db = store._db._db
+    store.put('run', 'b', fingerprint([1]), "written")
+    assert store.steps('run') == {'b': "written"}
+    store.close()
+
+
+def test_workflow_resume_skips_completed_steps(tmp_path, monkeypatch):
+    """
+    Rerunning a run id reuses the LLM and tool steps; new inputs recompute.
+    """
+    monkeypatch.setattr(basic, 'get_llm', lambda llm_type: MarkdownChatModel(responses=[""]))
+    store = StateStore(str(tmp_path / 'state.db'))
+    calls.clear()
+
+    output = basic.create_workflow("some research notes").run(run_id='r1', state=store)
+    assert output
+    assert len(calls) == 1
+    steps = store.steps('r1')
+    assert set(steps) == {'llm', 'tools', next(step for step in steps if step.startswith('tool:text_to_markdown'))}
+
+    # Simulate a crash after the LLM step: only the tools run again
+    store._db.execute("DELETE FROM steps WHERE run_id = 'r1' AND step = 'tools'")
+    assert basic.create_workflow("some research notes").run(run_id='r1', state=store) == output
+    assert len(calls) == 1
+
+    basic.create_workflow("other notes").run(run_id='r1', state=store)
+    assert len(calls) == 2
+    store.close()
+
+
+class FlakySearchTool:
+    """Fake search tool whose first call reports an error."""
+    calls = 0
+
+    def run(self, query):
+        type(self).calls += 1
+        if type(self).calls == 1:
+            return "Error performing web search: 503 Service Unavailable"
+        return f"results for {query}"
+
+
+def test_workflow_resume_retries_failed_tool_calls(tmp_path, monkeypatch):
+    """
+    A tool call that returned an error is not checkpointed, nor is the tools
+    step that used it, so resuming the run calls the tool again.
+    """
+    monkeypatch.setattr(
+        basic, 'get_llm',
+        lambda llm_type: FakeListChatModel(responses=["Use web_search for this."])
+    )
+    registry = ToolRegistry([{'id': 'web_search', 'tool': FlakySearchTool}])
+    store = StateStore(str(tmp_path / 'state.db'))
+    FlakySearchTool.calls = 0
+
+    workflow = basic.create_workflow("solar output", registry=registry)
+    assert workflow.run(run_id='r1', state=store).startswith("Error performing web search")
+    assert set(store.steps('r1')) == {'llm'}
+
+    output = workflow.run(run_id='r1', state=store)
+    assert output.startswith("results for")
+    assert workflow.run(run_id='r1', state=store) == output
+    assert FlakySearchTool.calls == 2
+    store.close()
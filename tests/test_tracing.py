@@ -0,0 +1,103 @@
+"""
+Test suite for tracing and metrics.
+"""
+import json
+import os
+import subprocess
+import sys
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+import tracing
+import workflows.basic as basic
+import workflows.web_search_workflow as web_search_workflow
+
+RESPONSE = """Formatted below.
+
+```json
+{"tool_calls": [{"id": "md", "tool": "text_to_markdown", "input": "TITLE\\n\\nBody"}]}
+```"""
+
+
+def test_workflow_spans_and_metrics(tmp_path, monkeypatch):
+    """
+    A run produces nested spans and tool metrics, served over HTTP.
+    """
+    monkeypatch.setattr(basic, 'get_llm', lambda llm_type: FakeListChatModel(responses=[RESPONSE]))
+    trace_path = tmp_path / 'trace.jsonl'
+    tracing.reset_metrics()
+    tracing.configure(trace_path=str(trace_path))
+    try:
+        basic.create_workflow("notes").run()
+        tracing.flush()
+        spans = {record['name']: record for record in map(json.loads, trace_path.read_text().splitlines())}
+
+        root = spans['workflow.run']
+        assert root['parent_id'] is None and root['attributes']['workflow'] == 'generic'
+        assert spans['workflow.llm']['parent_id'] == root['span_id']
+        # Tool calls run on the planner's thread pool but nest under the tools step
+        assert spans['tool.call']['parent_id'] == spans['workflow.tools']['span_id']
+        assert {span['trace_id'] for span in spans.values()} == {root['trace_id']}
+
+        server = tracing.start_metrics_server(0)
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            metrics = response.read().decode('utf-8')
+        assert 'tool_calls_total{status="ok",tool="text_to_markdown"} 1' in metrics
+        assert 'span_duration_seconds_bucket{span="workflow.run",le="+Inf"} 1' in metrics
+        server.shutdown()
+    finally:
+        tracing.configure(enabled=False)
+        tracing.reset_metrics()
+
+
+def test_disabled_tracing_records_nothing():
+    tracing.configure(enabled=False)
+    with tracing.span('ignored') as span:
+        span.set(size=1)
+    tracing.incr('ignored_total')
+    tracing.observe('ignored_seconds', 1.0)
+    assert tracing.render_prometheus() == "\n"
+
+
+def test_web_search_span_covers_only_the_search(tmp_path, monkeypatch):
+    """
+    Mentioning other tools opens no tool.call span; only the search has one.
+    """
+    monkeypatch.setattr(
+        web_search_workflow, 'get_openai_llm',
+        lambda *args, **kwargs: FakeListChatModel(responses=["Use web_search, then text_to_markdown."])
+    )
+
+    class SearchTool:
+        name = 'web_search'
+
+        def run(self, query):
+            return f"results for {query}"
+
+    trace_path = tmp_path / 'trace.jsonl'
+    tracing.configure(trace_path=str(trace_path))
+    try:
+        assert web_search_workflow.create_workflow("solar", tools=[SearchTool()]).run() == "results for solar"
+        tracing.flush()
+        records = [json.loads(line) for line in trace_path.read_text().splitlines()]
+        tool_spans = [record for record in records if record['name'] == 'tool.call']
+        assert [span['attributes']['tool'] for span in tool_spans] == ['web_search']
+    finally:
+        tracing.configure(enabled=False)
+        tracing.reset_metrics()
+
+
+def test_metrics_server_not_started_on_import():
+    """
+    Worker processes import tracing too; only configure() serves /metrics.
+    """
+    env = {**os.environ, 'METRICS_PORT': '0'}
+    output = subprocess.run(
+        [sys.executable, '-c', "import tracing; print(tracing._server is None)"],
+        cwd=Path(__file__).parent.parent, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "True"
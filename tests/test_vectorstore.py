@@ -0,0 +1,69 @@
+"""
+Test suite for the in-process vector store.
+"""
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from nodes.file_loader_tool import FileLoaderTool
+from vectorstore import VectorStore
+
+
+class KeywordEmbeddings(Embeddings):
+    """Deterministic embeddings counting a few keywords."""
+    vocabulary = ['apple', 'banana', 'cherry', 'durian']
+
+    def embed_query(self, text):
+        words = text.lower().split()
+        return [float(words.count(word)) + 0.01 for word in self.vocabulary]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+def test_vectorstore_exact_and_ivf(tmp_path):
+    """
+    IVF search finds the exact nearest neighbours on clustered data, and
+    deletes, adds after indexing and reloading from disk are honoured.
+    """
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(8, 16))
+    vectors = np.repeat(centers, 200, axis=0) + rng.normal(scale=0.05, size=(1600, 16))
+    store = VectorStore()
+    ids = store.add(vectors, ids=[f"v{i}" for i in range(1600)])
+    queries = centers + rng.normal(scale=0.05, size=centers.shape)
+
+    exact = [[vector_id for vector_id, _, _ in hits] for hits in store.search(queries, k=5)]
+    store.build_index(n_lists=8, n_probe=2)
+    approx = [[vector_id for vector_id, _, _ in hits] for hits in store.search(queries, k=5)]
+    assert approx == exact
+
+    best = exact[0][0]
+    assert store.delete([best, 'missing']) == 1
+    assert best not in [vector_id for vector_id, _, _ in store.search(queries[0], k=5)[0]]
+    store.add(queries[:1] * 10, ids=['new'])
+    assert store.search(queries[0], k=1)[0][0][0] == 'new'
+
+    store.save(str(tmp_path / 'store'))
+    loaded = VectorStore.load(str(tmp_path / 'store'))
+    assert isinstance(loaded._vectors, np.memmap)
+    assert len(loaded) == len(ids)
+    assert loaded.search(queries, k=5) == store.search(queries, k=5)
+    loaded.compact()
+    assert loaded.search(queries[0], k=1)[0][0][0] == 'new'
+
+
+def test_vectorstore_file_loader_documents(tmp_path):
+    """
+    Documents loaded by FileLoaderTool can be embedded and searched.
+    """
+    path = tmp_path / 'fruit.csv'
+    path.write_text("name,notes\nred,apple apple\nyellow,banana\ndark,cherry cherry cherry\n")
+    documents = FileLoaderTool().load_documents(str(path), source_column='name')
+
+    store = VectorStore(embedder=KeywordEmbeddings())
+    store.add_documents(documents, batch_size=2)
+    assert len(store) == 3
+
+    doc, score = store.similarity_search("banana", k=1)[0]
+    assert doc.metadata['source'] == 'yellow'
+    assert 'banana' in doc.page_content
@@ -0,0 +1,120 @@
+"""
+Test suite for the async workflow runs.
+"""
+import asyncio
+import threading
+import time
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+import workflows.basic as basic
+import workflows.web_search_workflow as web_search_workflow
+from nodes.registry import ToolRegistry
+from state import StateStore
+from workflows.planner import ToolCall, ToolPlan, aiter_plan_results
+
+RESPONSE = """Done.
+
+```json
+{"tool_calls": [
+  {"id": "a", "tool": "sleep", "input": "x"},
+  {"id": "b", "tool": "sleep", "input": "y"},
+  {"id": "c", "tool": "sleep", "input_from": "a"}
+]}
+```"""
+
+
+class AsyncSleepTool:
+    """Fake tool that waits without a thread, then echoes its input."""
+    calls = 0
+
+    def run(self, tool_input):
+        raise AssertionError("arun() should be used")
+
+    async def arun(self, tool_input):
+        type(self).calls += 1
+        await asyncio.sleep(0.2)
+        return f"sleep({tool_input})"
+
+
+def test_generic_workflow_arun_runs_concurrently(monkeypatch, tmp_path):
+    """
+    Many runs share one event loop; each run's independent calls overlap.
+    """
+    monkeypatch.setattr(basic, 'get_llm', lambda llm_type: FakeListChatModel(responses=[RESPONSE]))
+    registry = ToolRegistry([{'id': 'sleep', 'tool': AsyncSleepTool}])
+    workflows = [basic.create_workflow(f"notes {i}", registry=registry) for i in range(100)]
+
+    async def run_all():
+        return await asyncio.gather(*(workflow.arun() for workflow in workflows))
+
+    start = time.perf_counter()
+    outputs = asyncio.run(run_all())
+    elapsed = time.perf_counter() - start
+
+    assert all(output == "sleep(y)\n\nsleep(sleep(x))" for output in outputs)
+    # Two sequential tool steps per run, all runs in parallel
+    assert elapsed < 2.0
+
+    # A rerun with the same id reuses the checkpointed steps
+    state = StateStore(str(tmp_path / 'state.db'))
+    AsyncSleepTool.calls = 0
+    first = asyncio.run(workflows[0].arun(run_id='run', state=state))
+    assert asyncio.run(workflows[0].arun(run_id='run', state=state)) == first
+    assert AsyncSleepTool.calls == 3
+    state.close()
+
+
+def test_web_search_workflow_arun(monkeypatch):
+    monkeypatch.setattr(
+        web_search_workflow, 'get_openai_llm',
+        lambda *args, **kwargs: FakeListChatModel(responses=["Use web_search for this."])
+    )
+
+    class AsyncSearchTool:
+        name = 'web_search'
+
+        async def arun(self, query):
+            return f"results for {query}"
+
+    workflow = web_search_workflow.create_workflow("solar output", tools=[AsyncSearchTool()])
+    assert asyncio.run(workflow.arun()) == "results for solar output"
+
+
+class SlowTool:
+    """Fake tool that is built off the event loop and notes its cleanup."""
+    built_on = []
+    cleaned_up = 0
+
+    def __init__(self):
+        type(self).built_on.append(threading.current_thread())
+
+    async def arun(self, tool_input):
+        try:
+            await asyncio.sleep(0.1 if tool_input == "fast" else 10)
+            return tool_input
+        finally:
+            type(self).cleaned_up += 1
+
+
+def test_aiter_plan_results_builds_off_loop_and_awaits_cancelled_calls():
+    """
+    Tools are built on worker threads, and closing the iterator early waits
+    until the calls still running have been cancelled.
+    """
+    plan = ToolPlan(tool_calls=[
+        ToolCall(id='fast', tool='slow', input="fast"),
+        ToolCall(id='slow', tool='slow', input="slow")
+    ])
+    SlowTool.built_on.clear()
+    SlowTool.cleaned_up = 0
+
+    async def first_result():
+        results = aiter_plan_results(plan, {'slow': SlowTool}, "response")
+        async for call, output in results:
+            break
+        await results.aclose()
+        return call.id, SlowTool.cleaned_up
+
+    assert asyncio.run(first_result()) == ('fast', 2)
+    assert threading.main_thread() not in SlowTool.built_on
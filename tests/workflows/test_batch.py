@@ -0,0 +1,65 @@
+"""
+Test suite for batch workflow execution.
+"""
+import asyncio
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+import workflows.basic as basic
+from workflows.batch import BatchRunner, get_rate_limiter
+
+
+class FlakyChatModel(FakeListChatModel):
+    """Fake chat model that fails on every other call."""
+    calls: int = 0
+
+    def _call(self, *args, **kwargs):
+        self.calls += 1
+        if self.calls % 2 == 1:
+            raise RuntimeError("rate limited")
+        return super()._call(*args, **kwargs)
+
+
+def test_batch_runner_resumes_from_checkpoint(tmp_path, monkeypatch):
+    """
+    Items are retried, streamed out, checkpointed and skipped on resume.
+    """
+    llm = FlakyChatModel(responses=["done"])
+    monkeypatch.setattr(basic, 'get_llm', lambda llm_type: llm)
+    checkpoint = tmp_path / 'progress.jsonl'
+
+    runner = BatchRunner(
+        basic.create_workflow,
+        max_concurrency=1,
+        requests_per_second=1000,
+        max_retries=2,
+        retry_delay=0.01,
+        checkpoint_path=str(checkpoint)
+    )
+    first = list(runner.run(["one", "two", "three"]))
+    assert sorted(result.id for result in first) == [0, 1, 2]
+    assert all(result.output == "done" and result.error is None for result in first)
+    assert len(checkpoint.read_text().splitlines()) == 3
+
+    resumed = list(runner.run(["one", "two", "three", "four"]))
+    assert [result.id for result in resumed] == [3]
+
+    async def collect():
+        return [result async for result in runner.arun([("extra", "five")])]
+    assert [result.id for result in asyncio.run(collect())] == ["extra"]
+
+
+def test_rate_limiter_is_keyed_by_provider_and_rate(monkeypatch):
+    """
+    Runners against one provider share a limiter only when their rates match.
+    """
+    monkeypatch.setattr(basic, 'get_llm', lambda llm_type: FakeListChatModel(responses=["done"]))
+
+    slow = BatchRunner(basic.create_workflow, requests_per_second=2)
+    fast = BatchRunner(basic.create_workflow, requests_per_second=50)
+    also_slow = BatchRunner(basic.create_workflow, requests_per_second=2.0)
+
+    assert slow.rate_limiter is not fast.rate_limiter
+    assert slow.rate_limiter is also_slow.rate_limiter
+    assert fast.rate_limiter.requests_per_second == 50
+    assert get_rate_limiter('other', 2) is not slow.rate_limiter
@@ -0,0 +1,95 @@
+"""
+Test suite for the workflow tool planner.
+"""
+import time
+
+from workflows.planner import (
+    PLAN_INSTRUCTIONS,
+    execute_plan,
+    iter_plan_results,
+    parse_plan,
+    plan_from_mentions
+)
+
+
+class SleepTool:
+    """Fake tool that waits, then echoes its input."""
+
+    def __init__(self, name, delay=0.2, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+
+    def run(self, tool_input):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        return f"{self.name}({tool_input})"
+
+
+def test_planner_runs_independent_calls_in_parallel():
+    """
+    Independent calls overlap, so latency follows the critical path.
+    """
+    output = """Here is my answer.
+
+```json
+{"tool_calls": [
+  {"id": "a", "tool": "slow", "input": "x"},
+  {"id": "b", "tool": "slow", "input": "y"},
+  {"id": "c", "tool": "slow", "input": "z"},
+  {"id": "d", "tool": "slow", "input_from": "a", "depends_on": ["b"]}
+]}
+```"""
+    text, plan = parse_plan(output)
+    assert text == "Here is my answer."
+    assert [call.id for call in plan.sinks()] == ['c', 'd']
+
+    tools = {'slow': lambda: SleepTool('slow')}
+    start = time.perf_counter()
+    results = execute_plan(plan, tools, text, max_concurrency=4)
+    elapsed = time.perf_counter() - start
+
+    assert results['d'] == "slow(slow(x))"
+    assert elapsed < 0.6
+
+
+def test_planner_failures_and_fallback():
+    """
+    Failed calls skip their dependents; plain mentions become a chain.
+    """
+    _, plan = parse_plan('```json\n{"tool_calls": ['
+                         '{"id": "a", "tool": "bad"}, {"id": "b", "tool": "ok", "input_from": "a"},'
+                         '{"id": "c", "tool": "missing"}]}\n```')
+    tools = {'bad': lambda: SleepTool('bad', 0, fail=True), 'ok': lambda: SleepTool('ok', 0)}
+    results = dict((call.id, output) for call, output in iter_plan_results(plan, tools, ""))
+    assert results['a'] == "Tool bad failed: boom"
+    assert results['b'] == "Skipped: dependency a failed"
+    assert results['c'] == "Unknown tool: missing"
+
+    chain = plan_from_mentions("use text_to_markdown then web_search", ['web_search', 'text_to_markdown'])
+    assert [(call.tool, call.input_from) for call in chain.tool_calls] == [
+        ('web_search', 'response'), ('text_to_markdown', 'web_search')
+    ]
+    assert '{{"tool_calls"' in PLAN_INSTRUCTIONS
+
+
+def test_workflow_keeps_response_when_tool_fails(monkeypatch):
+    """
+    A failing final call reports its error after the answer instead of replacing it.
+    """
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    import workflows.basic as basic
+    from nodes.registry import ToolRegistry
+
+    response = ('Paris is the capital of France.\n\n```json\n{"tool_calls": ['
+                '{"id": "search", "tool": "web_search", "input": "capital of France"}]}\n```')
+    monkeypatch.setattr(basic, 'get_llm', lambda llm_type: FakeListChatModel(responses=[response]))
+
+    class FailingSearch:
+        def run(self, tool_input):
+            raise RuntimeError("transient 503")
+
+    workflow = basic.create_workflow("notes", registry=ToolRegistry([{'id': 'web_search', 'tool': FailingSearch}]))
+    assert workflow.run() == "Paris is the capital of France.\n\nTool web_search failed: transient 503"
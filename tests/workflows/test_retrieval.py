@@ -0,0 +1,60 @@
+"""
+Test suite for retrieval mode in the generic workflow.
+"""
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+import workflows.basic as basic
+from utils import count_tokens
+from workflows.retrieval import BM25Index, select_context
+
+prompts = []
+
+
+class RecordingChatModel(FakeListChatModel):
+    """Fake chat model that records the prompts it receives."""
+
+    def _call(self, messages, *args, **kwargs):
+        prompts.append(messages[-1].content)
+        return "done"
+
+
+def make_document(sections):
+    filler = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 30
+    return "\n\n".join(
+        f"{filler}\nSection {i} notes." if i != 37 else f"{filler}\nThe quarterly revenue grew by 42 percent."
+        for i in range(sections)
+    )
+
+
+def test_bm25_ranks_matching_chunks_first():
+    index = BM25Index([
+        "cats and dogs",
+        "revenue grew this quarter",
+        "quarterly revenue and revenue forecasts",
+    ])
+    ranked = [chunk_id for chunk_id, _ in index.search("revenue forecast quarter")]
+    assert ranked[0] in (1, 2) and set(ranked) == {1, 2}
+    assert index.search("unknown words") == []
+
+
+def test_generic_workflow_retrieval_bounds_prompt(monkeypatch):
+    """
+    Prompt size is bounded by the budget, not the input, and keeps the
+    relevant chunk.
+    """
+    monkeypatch.setattr(basic, 'get_llm', lambda llm_type: RecordingChatModel(responses=[""]))
+    prompts.clear()
+
+    small, large = make_document(50), make_document(500)
+    assert select_context(small, "revenue", token_budget=100000) == small
+
+    for text in (small, large):
+        workflow = basic.create_workflow(
+            text, retrieval=True, query="How much did quarterly revenue grow?", top_k=4, token_budget=800
+        )
+        assert workflow.run() == "done"
+
+    small_prompt, large_prompt = prompts
+    assert "grew by 42 percent" in small_prompt and "grew by 42 percent" in large_prompt
+    assert count_tokens(large_prompt) < count_tokens(large) / 10
+    assert abs(count_tokens(large_prompt) - count_tokens(small_prompt)) < 200
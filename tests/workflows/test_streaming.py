@@ -0,0 +1,50 @@
+"""
+Test suite for workflow streaming.
+"""
+import asyncio
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+import workflows.basic as basic
+from workflows.planner import PlanBlockFilter
+
+RESPONSE = """Here are the notes.
+
+```python
+print("kept")
+```
+
+```json
+{"tool_calls": [{"id": "md", "tool": "text_to_markdown", "input": "Title\\n\\nBody"}]}
+```"""
+
+
+def test_plan_block_filter_holds_back_plan():
+    response = PlanBlockFilter()
+    released = [response.feed(char) for char in RESPONSE]
+    rest, text, plan = response.finish()
+    streamed = "".join(released) + rest
+    assert streamed.rstrip() == text
+    assert 'print("kept")' in streamed and "tool_calls" not in streamed
+    assert [call.tool for call in plan.tool_calls] == ['text_to_markdown']
+    # Text before the plan was released while streaming, not at the end
+    assert "".join(released).startswith("Here are the notes.")
+
+
+def test_generic_workflow_stream(monkeypatch):
+    """
+    Tokens arrive one by one, followed by the tool output.
+    """
+    monkeypatch.setattr(basic, 'get_llm', lambda llm_type: FakeListChatModel(responses=[RESPONSE]))
+    workflow = basic.create_workflow("notes")
+
+    pieces = list(workflow.stream())
+    assert len(pieces) > 10
+    tool_output = workflow._run_tools(RESPONSE)[0]
+    assert pieces[-1] == "\n\n" + tool_output
+    assert "".join(pieces[:-1]).startswith("Here are the notes.")
+
+    async def collect():
+        return [piece async for piece in workflow.astream()]
+
+    assert asyncio.run(collect()) == pieces
@@ -0,0 +1,301 @@
+"""
+Lightweight tracing and metrics for workflows, tools and caches.
+
+Spans time nested steps, such as a workflow run, its LLM call and each
+tool call, and are appended to a JSONL trace file. Counters and latency
+histograms are kept in memory and exported in the Prometheus text format,
+optionally over HTTP at /metrics.
+
+Everything is off by default. While disabled, span(), incr() and observe()
+return after a single flag check. Enable it by setting TRACE_PATH, which
+also applies to worker processes, or by calling configure(). The /metrics
+server is only started by configure(), from the entry point: see main.py
+and METRICS_PORT.
+"""
+import atexit
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Upper bounds in seconds of the latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_enabled = False
+_trace_file = None
+_trace_lock = threading.Lock()
+_metrics_lock = threading.Lock()
+_counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+_histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], "_Histogram"] = {}
+_current_span: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+_server = None
+
+class Span:
+    """
+    Timed, nested unit of work. Use through span() or traced().
+    """
+    __slots__ = ('name', 'attributes', 'trace_id', 'span_id', 'parent_id', 'start', '_started', '_token')
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+
+    def set(self, **attributes: Any) -> None:
+        """Add attributes, e.g. a result size, before the span ends."""
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        parent = _current_span.get()
+        self.span_id = os.urandom(8).hex()
+        self.trace_id = parent.trace_id if parent is not None else self.span_id
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start = time.time()
+        self._token = _current_span.set(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration = time.perf_counter() - self._started
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Ended in another context than it started in, e.g. across a generator
+            pass
+        observe('span_duration_seconds', duration, span=self.name)
+        record = {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start': self.start,
+            'duration_ms': duration * 1000,
+            'attributes': self.attributes
+        }
+        if exc_type is not None:
+            record['error'] = f"{exc_type.__name__}: {exc}"
+        _write(record, flush=self.parent_id is None)
+        return False
+
+class _NoopSpan:
+    """Stand-in returned by span() while tracing is disabled."""
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+_NOOP_SPAN = _NoopSpan()
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # One count per bucket plus +Inf, not cumulative
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+def enabled() -> bool:
+    return _enabled
+
+def configure(
+    enabled: bool = True,
+    trace_path: Optional[str] = None,
+    metrics_port: Optional[int] = None
+) -> None:
+    """
+    Turn tracing on or off.
+
+    Args:
+        enabled (bool): Record spans and metrics
+        trace_path (Optional[str]): JSONL file spans are appended to; without
+                                    it only metrics are recorded
+        metrics_port (Optional[int]): Serve /metrics on this port
+    """
+    global _enabled, _trace_file
+    with _trace_lock:
+        if _trace_file is not None:
+            _trace_file.close()
+            _trace_file = None
+        if enabled and trace_path:
+            Path(trace_path).parent.mkdir(parents=True, exist_ok=True)
+            _trace_file = open(trace_path, 'a', encoding='utf-8')
+    _enabled = enabled
+    if enabled and metrics_port is not None:
+        start_metrics_server(metrics_port)
+
+def span(name: str, **attributes: Any):
+    """
+    Time a block as a span nested in the current one.
+
+    Args:
+        name (str): Span name, e.g. 'tool.call'
+        **attributes: Attributes recorded with the span
+
+    Returns:
+        Context manager yielding the span; set() adds attributes
+    """
+    if not _enabled:
+        return _NOOP_SPAN
+    return Span(name, attributes)
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator running each call of a function in a span."""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def incr(name: str, value: float = 1.0, **labels: Any) -> None:
+    """Add to a counter, e.g. incr('cache_lookups_total', cache='search', result='hit')."""
+    if not _enabled:
+        return
+    key = (name, _label_key(labels))
+    with _metrics_lock:
+        _counters[key] = _counters.get(key, 0.0) + value
+
+def observe(name: str, value: float, **labels: Any) -> None:
+    """Record a value, in seconds for latencies, in a histogram."""
+    if not _enabled:
+        return
+    key = (name, _label_key(labels))
+    with _metrics_lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = _Histogram(DEFAULT_BUCKETS)
+        histogram.observe(value)
+
+def record_llm_usage(message: Any, model: Optional[str]) -> None:
+    """Count the tokens reported in an LLM response's usage metadata."""
+    usage = getattr(message, 'usage_metadata', None)
+    if not _enabled or not usage:
+        return
+    for kind in ('input', 'output'):
+        incr('llm_tokens_total', usage.get(f'{kind}_tokens', 0), model=model or 'unknown', kind=kind)
+
+def render_prometheus() -> str:
+    """Current metrics in the Prometheus text exposition format."""
+    with _metrics_lock:
+        counters = sorted(_counters.items())
+        histograms = sorted(
+            (key, (list(h.counts), h.sum, h.count)) for key, h in _histograms.items()
+        )
+    lines = []
+    previous = None
+    for (name, labels), value in counters:
+        if name != previous:
+            lines.append(f"# TYPE {name} counter")
+            previous = name
+        lines.append(f"{name}{_format_labels(labels)} {value:g}")
+    for (name, labels), (counts, total, count) in histograms:
+        if name != previous:
+            lines.append(f"# TYPE {name} histogram")
+            previous = name
+        cumulative = 0
+        for bound, bucket_count in zip(DEFAULT_BUCKETS + (float('inf'),), counts):
+            cumulative += bucket_count
+            le = '+Inf' if bound == float('inf') else f"{bound:g}"
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {total:g}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+def reset_metrics() -> None:
+    """Clear all counters and histograms."""
+    with _metrics_lock:
+        _counters.clear()
+        _histograms.clear()
+
+def flush() -> None:
+    """Write buffered spans to the trace file."""
+    with _trace_lock:
+        if _trace_file is not None:
+            _trace_file.flush()
+
+def start_metrics_server(port: int, host: str = '127.0.0.1'):
+    """
+    Serve the metrics at http://host:port/metrics from a daemon thread.
+
+    Args:
+        port (int): Port to listen on; 0 picks a free one
+        host (str): Interface to bind
+
+    Returns:
+        ThreadingHTTPServer: The running server, e.g. for server_address
+    """
+    global _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+    _server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
+
+def _write(record: dict, flush: bool) -> None:
+    if _trace_file is None:
+        return
+    line = json.dumps(record, default=str) + "\n"
+    with _trace_lock:
+        if _trace_file is not None:
+            _trace_file.write(line)
+            # Flush when a trace completes rather than on every span
+            if flush:
+                _trace_file.flush()
+
+def _label_key(labels: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        f'{key}="' + value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for key, value in labels
+    )
+    return "{" + ",".join(escaped) + "}"
+
+atexit.register(flush)
+
+# Not the metrics server: every process importing this module, including
+# worker processes, would try to bind its port
+if os.getenv('TRACE_PATH'):
+    configure(trace_path=os.getenv('TRACE_PATH'))
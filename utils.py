@@ -0,0 +1,226 @@
+"""
+Helper functions shared by workflows and tools.
+"""
+import ast
+import math
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+# Tokenizer used for token estimates
+TOKEN_ENCODING = 'cl100k_base'
+# Characters per token assumed when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+# Put where compaction dropped passages
+ELISION_MARKER = "[...]"
+
+# Blank lines, or separator lines such as the ones between loaded documents
+PASSAGE_SPLIT_PATTERN = re.compile(r"\n\s*\n|^[^\w\s]{10,}$", re.MULTILINE)
+SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?])\s+")
+WORD_PATTERN = re.compile(r"\w+")
+LABEL_PATTERN = re.compile(r"^\w[\w ]*:$")
+
+@lru_cache(maxsize=None)
+def get_tokenizer(encoding: str = TOKEN_ENCODING):
+    """
+    Return the tiktoken encoding, loaded once per process.
+
+    Returns:
+        Optional[tiktoken.Encoding]: None if tiktoken or the encoding
+                                     files are unavailable
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(encoding)
+    except Exception:
+        return None
+
+def count_tokens(text: str, encoding: Optional[str] = None) -> int:
+    """
+    Count the tokens in a text.
+
+    Args:
+        text (str): Text to measure
+        encoding (Optional[str]): tiktoken encoding name
+
+    Returns:
+        int: Exact token count, or an estimate from the text length when
+             no tokenizer is available
+    """
+    tokenizer = get_tokenizer(encoding or TOKEN_ENCODING)
+    if tokenizer is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(tokenizer.encode(text, disallowed_special=()))
+
+def truncate_tokens(text: str, max_tokens: int, encoding: Optional[str] = None) -> str:
+    """Cut a text to at most max_tokens tokens."""
+    tokenizer = get_tokenizer(encoding or TOKEN_ENCODING)
+    if tokenizer is None:
+        return text[:max_tokens * CHARS_PER_TOKEN]
+    tokens = tokenizer.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return tokenizer.decode(tokens[:max_tokens])
+
+def dedupe_passages(text: str, seen: Optional[Set[str]] = None) -> List[str]:
+    """
+    Split a text into passages, dropping repeated passages and metadata.
+
+    Passages are separated by blank lines or long separator lines. A
+    passage equal to an earlier one, ignoring case and whitespace, is
+    dropped. A line holding a dict literal, such as the metadata of a
+    loaded document, keeps only the keys whose values differ from the
+    previous such line, and is dropped along with its label when none do.
+
+    Args:
+        text (str): Text to split
+        seen (Optional[Set[str]]): Keys of passages already kept elsewhere,
+                                   e.g. in other search results; updated
+                                   in place
+
+    Returns:
+        List[str]: The remaining passages, in order
+    """
+    seen = set() if seen is None else seen
+    previous_metadata = None
+    passages = []
+    for passage in PASSAGE_SPLIT_PATTERN.split(text):
+        lines = []
+        for line in passage.splitlines():
+            metadata = _parse_metadata(line)
+            if metadata is not None:
+                changed = {
+                    key: value for key, value in metadata.items()
+                    if previous_metadata is None or key not in previous_metadata or previous_metadata[key] != value
+                }
+                previous_metadata = metadata
+                if not changed:
+                    if lines and LABEL_PATTERN.match(lines[-1].strip()):
+                        lines.pop()
+                    continue
+                line = repr(changed)
+            lines.append(line)
+        passage = "\n".join(lines).strip()
+        key = " ".join(passage.lower().split())
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        passages.append(passage)
+    return passages
+
+def select_passages(passages: List[str], token_budget: int, query: Optional[str] = None) -> str:
+    """
+    Extract the passages most relevant to a query within a token budget.
+
+    Passages that do not fit the budget with their elision markers are
+    split into sentences, cut to fit if still too large. Units are ranked
+    by the IDF-weighted query terms they contain and taken greedily while
+    they fit; without a query, or among equal scores, earlier units come
+    first. The kept units stay in their original order, with an elision
+    marker where units were dropped.
+    If no unit fits, the start of the text is kept instead.
+
+    Args:
+        passages (List[str]): Passages in document order
+        token_budget (int): Maximum tokens of output
+        query (Optional[str]): What the output should be relevant to
+
+    Returns:
+        str: The selected text
+    """
+    separator_tokens = count_tokens(f"\n\n{ELISION_MARKER}\n\n")
+    # Largest unit that fits with a marker on either side
+    unit_budget = max(token_budget - 2 * separator_tokens, 1)
+
+    # (passage index, text) per selectable unit
+    units: List[Tuple[int, str]] = []
+    for passage_id, passage in enumerate(passages):
+        if count_tokens(passage) <= unit_budget:
+            units.append((passage_id, passage))
+            continue
+        for sentence in SENTENCE_SPLIT_PATTERN.split(passage):
+            if sentence:
+                units.append((passage_id, truncate_tokens(sentence, unit_budget)))
+    if not units:
+        return ""
+
+    unit_terms = [set(WORD_PATTERN.findall(unit.lower())) for _, unit in units]
+    scores = [0.0] * len(units)
+    if query:
+        document_frequency: Dict[str, int] = {}
+        for terms in unit_terms:
+            for term in terms:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+        for term in set(WORD_PATTERN.findall(query.lower())):
+            if term not in document_frequency:
+                continue
+            weight = math.log(1 + len(units) / document_frequency[term])
+            for unit_id, terms in enumerate(unit_terms):
+                if term in terms:
+                    scores[unit_id] += weight
+
+    # Room for a trailing marker
+    used = separator_tokens
+    selected = []
+    for unit_id in sorted(range(len(units)), key=lambda unit_id: (-scores[unit_id], unit_id)):
+        cost = count_tokens(units[unit_id][1]) + separator_tokens
+        if used + cost > token_budget:
+            continue
+        selected.append(unit_id)
+        used += cost
+    if not selected:
+        # The budget is too small for any unit with its markers
+        return truncate_tokens("\n\n".join(passages), token_budget)
+    selected.sort()
+
+    parts = []
+    previous = -1
+    for unit_id in selected:
+        if unit_id != previous + 1:
+            parts.append(f"\n\n{ELISION_MARKER}\n\n" if parts else f"{ELISION_MARKER}\n\n")
+        elif parts:
+            parts.append(" " if units[unit_id][0] == units[previous][0] else "\n\n")
+        parts.append(units[unit_id][1])
+        previous = unit_id
+    if previous != len(units) - 1:
+        parts.append(f"\n\n{ELISION_MARKER}" if parts else ELISION_MARKER)
+    return "".join(parts)
+
+def compact_text(
+    text: str,
+    token_budget: int,
+    query: Optional[str] = None,
+    seen: Optional[Set[str]] = None
+) -> str:
+    """
+    Shrink a tool output before it is passed on, e.g. to the LLM.
+
+    Repeated passages and metadata are dropped first; if the text is still
+    over the budget, the passages most relevant to the query are selected.
+
+    Args:
+        text (str): Text to compact
+        token_budget (int): Maximum tokens of output
+        query (Optional[str]): What the output should be relevant to
+        seen (Optional[Set[str]]): Passages already kept elsewhere, see
+                                   dedupe_passages
+
+    Returns:
+        str: The compacted text
+    """
+    passages = dedupe_passages(text, seen)
+    compacted = "\n\n".join(passages)
+    if count_tokens(compacted) <= token_budget:
+        return compacted
+    return select_passages(passages, token_budget, query)
+
+def _parse_metadata(line: str) -> Optional[dict]:
+    line = line.strip()
+    if not (line.startswith("{") and line.endswith("}")):
+        return None
+    try:
+        value = ast.literal_eval(line)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+    return value if isinstance(value, dict) else None
@@ -0,0 +1,469 @@
+"""
+In-process vector store used for similarity search and context retrieval.
+
+Vectors live in one contiguous float32 matrix and are searched by batched
+inner product. For large corpora an IVF (inverted file) index restricts
+each query to the vectors in the clusters closest to it. Stores can be
+saved to a directory and loaded back memory-mapped, so a restart does
+not re-embed anything.
+"""
+import hashlib
+import json
+import os
+import re
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+# Rows scored per block in exact search; bounds the size of the score matrix
+SEARCH_BLOCK_ROWS = 65536
+# Documents embedded per embedder call in add_documents
+EMBED_BATCH_SIZE = 64
+# Default IVF parameters
+DEFAULT_N_PROBE = 8
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLES_PER_LIST = 64
+
+SearchResult = Tuple[str, float, Optional[Document]]
+
+class VectorStore:
+    """
+    Vector store with exact and IVF approximate inner-product search.
+
+    Vectors are L2-normalized on insert by default, so scores are cosine
+    similarities. Deletes are tombstones; compact() reclaims their space.
+    Vectors added after build_index() are searched exactly until the index
+    is rebuilt.
+    """
+
+    def __init__(
+        self,
+        dim: Optional[int] = None,
+        embedder: Optional[Embeddings] = None,
+        normalize: bool = True
+    ):
+        """
+        Initialize an empty vector store.
+
+        Args:
+            dim (Optional[int]): Vector dimension, inferred from the first add
+            embedder (Optional[Embeddings]): Embeddings model for documents
+                                             and text queries
+            normalize (bool): L2-normalize vectors and queries
+        """
+        self.dim = dim
+        self.embedder = embedder
+        self.normalize = normalize
+        self._vectors = np.zeros((0, dim or 0), dtype=np.float32)
+        self._count = 0
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._documents: List[Optional[dict]] = []
+        # IVF index: centroids and rows grouped by list (CSR layout)
+        self._centroids: Optional[np.ndarray] = None
+        self._list_offsets: Optional[np.ndarray] = None
+        self._list_rows: Optional[np.ndarray] = None
+        self._indexed_count = 0
+        self.n_probe = DEFAULT_N_PROBE
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def deleted_ratio(self) -> float:
+        """Share of stored rows that are deleted and await compact()."""
+        return 1 - len(self._rows) / self._count if self._count else 0.0
+
+    def add(
+        self,
+        vectors,
+        documents: Optional[Sequence[Document]] = None,
+        ids: Optional[Sequence[str]] = None
+    ) -> List[str]:
+        """
+        Add vectors with optional documents and ids.
+
+        Adding an id that already exists replaces the old entry.
+
+        Args:
+            vectors: Array-like of shape (n, dim)
+            documents (Optional[Sequence[Document]]): Document per vector
+            ids (Optional[Sequence[str]]): Id per vector, generated if omitted
+
+        Returns:
+            List[str]: Ids of the added vectors
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[None, :]
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}")
+        n = vectors.shape[0]
+        if documents is not None and len(documents) != n:
+            raise ValueError("Number of documents does not match number of vectors")
+        ids = [str(uuid.uuid4()) for _ in range(n)] if ids is None else [str(i) for i in ids]
+        if len(ids) != n:
+            raise ValueError("Number of ids does not match number of vectors")
+
+        self.delete([i for i in ids if i in self._rows])
+        if self.normalize:
+            vectors = _normalize(vectors)
+
+        self._reserve(self._count + n)
+        start = self._count
+        self._vectors[start:start + n] = vectors
+        self._alive[start:start + n] = True
+        self._count += n
+        for offset, vector_id in enumerate(ids):
+            self._ids.append(vector_id)
+            self._rows[vector_id] = start + offset
+            doc = documents[offset] if documents is not None else None
+            self._documents.append(
+                {'page_content': doc.page_content, 'metadata': doc.metadata} if doc is not None else None
+            )
+        return ids
+
+    def add_documents(
+        self,
+        documents: Iterable[Document],
+        embedder: Optional[Embeddings] = None,
+        ids: Optional[Sequence[str]] = None,
+        batch_size: int = EMBED_BATCH_SIZE
+    ) -> List[str]:
+        """
+        Embed and add documents, e.g. those loaded by FileLoaderTool.
+
+        Args:
+            documents (Iterable[Document]): Documents to add
+            embedder (Optional[Embeddings]): Embeddings model, defaults to the
+                                             store's embedder
+            ids (Optional[Sequence[str]]): Id per document
+            batch_size (int): Documents embedded per embedder call
+
+        Returns:
+            List[str]: Ids of the added documents
+        """
+        embedder = embedder or self.embedder
+        if embedder is None:
+            raise ValueError("An embedder is required to add documents")
+        added = []
+        batch: List[Document] = []
+        id_iter = iter(ids) if ids is not None else None
+
+        def flush():
+            vectors = embedder.embed_documents([doc.page_content for doc in batch])
+            batch_ids = [next(id_iter) for _ in batch] if id_iter is not None else None
+            added.extend(self.add(vectors, batch, batch_ids))
+            batch.clear()
+
+        for doc in documents:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+        return added
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """
+        Delete vectors by id.
+
+        Returns:
+            int: Number of vectors deleted
+        """
+        deleted = 0
+        for vector_id in ids:
+            row = self._rows.pop(str(vector_id), None)
+            if row is None:
+                continue
+            self._alive[row] = False
+            self._documents[row] = None
+            deleted += 1
+        return deleted
+
+    def get(self, vector_id: str) -> Optional[Document]:
+        """Return the document stored with a vector, if any."""
+        row = self._rows.get(vector_id)
+        return self._document(row) if row is not None else None
+
+    def search(self, queries, k: int = 4) -> List[List[SearchResult]]:
+        """
+        Find the k best matches for each query vector.
+
+        Uses the IVF index when one has been built, exact search otherwise.
+
+        Args:
+            queries: Array-like of shape (n, dim) or (dim,)
+            k (int): Number of results per query
+
+        Returns:
+            List[List[SearchResult]]: (id, score, document) per query, best first
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[None, :]
+        if self._count == 0 or k <= 0:
+            return [[] for _ in range(len(queries))]
+        if queries.shape[1] != self.dim:
+            raise ValueError(f"Expected queries of dimension {self.dim}, got {queries.shape[1]}")
+        if self.normalize:
+            queries = _normalize(queries)
+
+        if self._centroids is None:
+            scores, rows = self._exact_search(queries, k)
+        else:
+            scores, rows = self._ivf_search(queries, k)
+        return [
+            [
+                (self._ids[row], float(score), self._document(row))
+                for score, row in zip(query_scores, query_rows) if row >= 0
+            ]
+            for query_scores, query_rows in zip(scores, rows)
+        ]
+
+    def similarity_search(self, query: str, k: int = 4) -> List[Tuple[Document, float]]:
+        """
+        Embed a text query and return the k most similar documents.
+        """
+        if self.embedder is None:
+            raise ValueError("An embedder is required for text queries")
+        results = self.search(self.embedder.embed_query(query), k)[0]
+        return [(doc, score) for _, score, doc in results if doc is not None]
+
+    def build_index(self, n_lists: Optional[int] = None, n_probe: int = DEFAULT_N_PROBE, seed: int = 0) -> None:
+        """
+        Build an IVF index over the current vectors.
+
+        Vectors are clustered with spherical k-means on a sample; a query
+        then scores only the vectors in its n_probe closest clusters.
+
+        Args:
+            n_lists (Optional[int]): Number of clusters, defaults to sqrt(n)
+            n_probe (int): Clusters searched per query
+            seed (int): Random seed for sampling and initialization
+        """
+        live_rows = np.flatnonzero(self._alive[:self._count])
+        if len(live_rows) == 0:
+            self._centroids = None
+            return
+        n_lists = n_lists or max(1, int(np.sqrt(len(live_rows))))
+        n_lists = min(n_lists, len(live_rows))
+        rng = np.random.default_rng(seed)
+
+        sample_size = min(len(live_rows), n_lists * KMEANS_SAMPLES_PER_LIST)
+        sample = self._vectors[rng.choice(live_rows, sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = _nearest(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=n_lists)
+            empty = counts == 0
+            # Reseed empty clusters from random sample points
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            centroids = _normalize(sums)
+
+        assignment = np.full(self._count, -1, dtype=np.int64)
+        for start in range(0, len(live_rows), SEARCH_BLOCK_ROWS):
+            block = live_rows[start:start + SEARCH_BLOCK_ROWS]
+            assignment[block] = _nearest(self._vectors[block], centroids)
+        order = live_rows[np.argsort(assignment[live_rows], kind='stable')]
+        counts = np.bincount(assignment[live_rows], minlength=n_lists)
+
+        self._centroids = np.ascontiguousarray(centroids)
+        self._list_offsets = np.concatenate([[0], np.cumsum(counts)])
+        self._list_rows = order
+        self._indexed_count = self._count
+        self.n_probe = n_probe
+
+    def compact(self) -> None:
+        """Drop deleted vectors from storage. Invalidates the IVF index."""
+        live_rows = np.flatnonzero(self._alive[:self._count])
+        self._vectors = np.ascontiguousarray(self._vectors[live_rows])
+        self._alive = np.ones(len(live_rows), dtype=bool)
+        self._ids = [self._ids[row] for row in live_rows]
+        self._documents = [self._documents[row] for row in live_rows]
+        self._rows = {vector_id: row for row, vector_id in enumerate(self._ids)}
+        self._count = len(live_rows)
+        self._centroids = self._list_offsets = self._list_rows = None
+        self._indexed_count = 0
+
+    def save(self, directory: str) -> None:
+        """
+        Save the store to a directory.
+
+        Layout: vectors.npy (float32 matrix), alive.npy (tombstones),
+        records.jsonl (id and document per row) and, if built, ivf.npz.
+        """
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        # Each file is written aside and renamed into place, so a store that
+        # is memory-mapped from this directory keeps reading the old files
+        with _replace(path / 'vectors.npy') as f:
+            np.save(f, np.ascontiguousarray(self._vectors[:self._count]))
+        with _replace(path / 'alive.npy') as f:
+            np.save(f, self._alive[:self._count])
+        with _replace(path / 'records.jsonl') as f:
+            for vector_id, doc in zip(self._ids, self._documents):
+                f.write((json.dumps({'id': vector_id, 'document': doc}, default=str) + '\n').encode('utf-8'))
+        if self._centroids is not None:
+            with _replace(path / 'ivf.npz') as f:
+                np.savez(
+                    f,
+                    centroids=self._centroids,
+                    offsets=self._list_offsets,
+                    rows=self._list_rows,
+                    indexed_count=self._indexed_count,
+                    n_probe=self.n_probe
+                )
+        elif (path / 'ivf.npz').exists():
+            (path / 'ivf.npz').unlink()
+        with _replace(path / 'meta.json') as f:
+            f.write(json.dumps({'dim': self.dim, 'normalize': self.normalize}).encode('utf-8'))
+
+    @classmethod
+    def load(cls, directory: str, embedder: Optional[Embeddings] = None, mmap: bool = True) -> "VectorStore":
+        """
+        Load a store saved with save().
+
+        With mmap, the vector matrix is memory-mapped rather than read, so
+        loading is fast and pages are only read as searches touch them. The
+        first add copies the matrix into memory.
+        """
+        path = Path(directory)
+        with open(path / 'meta.json', encoding='utf-8') as f:
+            meta = json.load(f)
+        store = cls(dim=meta['dim'], embedder=embedder, normalize=meta['normalize'])
+        store._vectors = np.load(path / 'vectors.npy', mmap_mode='r' if mmap else None)
+        store._alive = np.load(path / 'alive.npy').copy()
+        store._count = store._vectors.shape[0]
+        with open(path / 'records.jsonl', encoding='utf-8') as f:
+            for row, line in enumerate(f):
+                record = json.loads(line)
+                store._ids.append(record['id'])
+                store._documents.append(record['document'])
+                if store._alive[row]:
+                    store._rows[record['id']] = row
+        if (path / 'ivf.npz').exists():
+            with np.load(path / 'ivf.npz') as ivf:
+                store._centroids = ivf['centroids']
+                store._list_offsets = ivf['offsets']
+                store._list_rows = ivf['rows']
+                store._indexed_count = int(ivf['indexed_count'])
+                store.n_probe = int(ivf['n_probe'])
+        return store
+
+    def _reserve(self, size: int) -> None:
+        """Grow storage geometrically so appends are amortized O(1)."""
+        capacity = self._vectors.shape[0]
+        if size <= capacity and self._vectors.flags.writeable:
+            return
+        new_capacity = max(size, capacity * 2, 1024)
+        vectors = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        vectors[:self._count] = self._vectors[:self._count]
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:self._count] = self._alive[:self._count]
+        self._vectors, self._alive = vectors, alive
+
+    def _document(self, row: int) -> Optional[Document]:
+        record = self._documents[row]
+        return Document(**record) if record is not None else None
+
+    def _exact_search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, self._count, SEARCH_BLOCK_ROWS):
+            end = min(start + SEARCH_BLOCK_ROWS, self._count)
+            scores = queries @ self._vectors[start:end].T
+            scores[:, ~self._alive[start:end]] = -np.inf
+            rows = np.broadcast_to(np.arange(start, end), scores.shape)
+            best_scores, best_rows = _merge_top_k(best_scores, best_rows, scores, rows, k)
+        return best_scores, np.where(np.isfinite(best_scores), best_rows, -1)
+
+    def _ivf_search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        n_probe = min(self.n_probe, len(self._centroids))
+        probes = np.argpartition(-(queries @ self._centroids.T), n_probe - 1, axis=1)[:, :n_probe]
+        tail = np.arange(self._indexed_count, self._count)
+
+        all_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        all_rows = np.full((len(queries), k), -1, dtype=np.int64)
+        for i, query in enumerate(queries):
+            candidates = np.concatenate(
+                [self._list_rows[self._list_offsets[p]:self._list_offsets[p + 1]] for p in probes[i]] + [tail]
+            )
+            if len(candidates) == 0:
+                continue
+            scores = self._vectors[candidates] @ query
+            scores[~self._alive[candidates]] = -np.inf
+            top_scores, top_rows = _merge_top_k(
+                all_scores[i:i + 1, :0], all_rows[i:i + 1, :0], scores[None, :], candidates[None, :], k
+            )
+            all_scores[i, :top_scores.shape[1]] = top_scores[0]
+            all_rows[i, :top_rows.shape[1]] = np.where(np.isfinite(top_scores[0]), top_rows[0], -1)
+        return all_scores, all_rows
+
+class HashingEmbeddings(Embeddings):
+    """
+    Deterministic local embeddings using the hashing trick on word tokens.
+
+    No model or network access is needed, which makes it suitable for tests
+    and offline indexing; similarity reflects shared vocabulary only.
+    """
+
+    def __init__(self, dim: int = 256):
+        """
+        Args:
+            dim (int): Embedding dimension
+        """
+        self.dim = dim
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in re.findall(r"\w+", text.lower()):
+            digest = hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+            value = int.from_bytes(digest, 'little')
+            vector[value % self.dim] += 1.0 if value >> 63 else -1.0
+        return vector.tolist()
+
+@contextmanager
+def _replace(path: Path):
+    """Open a temporary file that atomically replaces path on success."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    return np.argmax(vectors @ centroids.T, axis=1)
+
+def _merge_top_k(scores_a, rows_a, scores_b, rows_b, k):
+    """Merge two sets of candidates per query and keep the k best, sorted."""
+    scores = np.concatenate([scores_a, scores_b], axis=1)
+    rows = np.concatenate([rows_a, rows_b], axis=1)
+    if scores.shape[1] > k:
+        keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(scores, keep, axis=1)
+        rows = np.take_along_axis(rows, keep, axis=1)
+    order = np.argsort(-scores, axis=1, kind='stable')
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(rows, order, axis=1)
@@ -1,66 +1,351 @@
 """
 Generic workflow for processing text with available tools.
 """
-from typing import List, Any, Optional
+from functools import partial
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Any, Optional, Tuple
+from langchain_core.caches import BaseCache
 from langchain_core.tools import BaseTool
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough, RunnableParallel
+from langchain_core.runnables import Runnable, RunnableLambda, RunnablePassthrough, RunnableParallel
 
+import tracing
 from llm import get_llm
-from nodes import AVAILABLE_TOOLS 
+from nodes import AVAILABLE_TOOLS, ToolRegistry, get_tool_registry, is_tool_error
+from state import CheckpointedTool, StateStore, checkpoint_if, get_state_store, llm_identity
+from workflows.chain import ainvoke_chain, invoke_chain
+from workflows.planner import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_STEP_TOKEN_BUDGET,
+    PLAN_INSTRUCTIONS,
+    PlanBlockFilter,
+    PlanResults,
+    ToolPlan,
+    aexecute_plan,
+    aiter_plan_results,
+    execute_plan,
+    iter_plan_results,
+    parse_plan,
+    plan_from_mentions,
+    plan_output
+)
+from workflows.retrieval import DEFAULT_TOKEN_BUDGET, DEFAULT_TOP_K, select_context
 
 class GenericWorkflow:
     def __init__(
         self, 
         input_text: str, 
-        llm: str
+        llm: str,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        cache: Optional[BaseCache] = None,
+        retrieval: bool = False,
+        query: Optional[str] = None,
+        top_k: int = DEFAULT_TOP_K,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        registry: Optional[ToolRegistry] = None,
+        step_token_budget: Optional[int] = DEFAULT_STEP_TOKEN_BUDGET
     ):
         self.llm = get_llm(llm)
+        if cache is not None:
+            # The LLM client is shared; give this workflow its own copy
+            self.llm = self.llm.model_copy(update={'cache': cache})
         
         self.input_text = input_text
+        self.max_concurrency = max_concurrency
+        # Retrieval mode: only the input chunks most relevant to the query,
+        # up to top_k and token_budget, are put in the prompt
+        self.retrieval = retrieval
+        self.query = query
+        self.top_k = top_k
+        self.token_budget = token_budget
+        # Tool outputs passed on to another tool are compacted to this many
+        # tokens; None disables compaction
+        self.step_token_budget = step_token_budget
+        # Tool instances are shared across runs and workflows
+        self.registry = registry or get_tool_registry()
 
         tools_description = "\n".join([
             f"- {tool_config['id']}: {tool_config['description']}" 
             for tool_config in AVAILABLE_TOOLS
         ])
         
-        self.prompt = ChatPromptTemplate.from_template(
-            "You are an AI assistant helping an intern at an AI firm process research data.\n\n"
-            f"Available tools:\n{tools_description}\n\n"
-            "Context: You are helping process and structure research data. Some tools are available for post-processing.\n\n"
-            "Guidelines:\n"
-            "1. Carefully analyze the input text\n"
-            "2. Provide a comprehensive and structured response\n"
-            "3. If a tool can help improve the output, explicitly mention the tool's name\n"
-            "4. Focus on clarity, coherence, and research-oriented formatting\n\n"
-            "Input text:\n{text}"
-        )
+        # Fixed instructions go in the system message and only the input in
+        # the human message, which the LLM cache's semantic tier embeds
+        self.prompt = ChatPromptTemplate.from_messages([
+            ("system", (
+                "You are an AI assistant helping an intern at an AI firm process research data.\n\n"
+                f"Available tools:\n{tools_description}\n\n"
+                "Context: You are helping process and structure research data. Some tools are available for post-processing.\n\n"
+                "Guidelines:\n"
+                "1. Carefully analyze the input text\n"
+                "2. Provide a comprehensive and structured response\n"
+                "3. If a tool can help improve the output, request it with a tool plan\n"
+                "4. Focus on clarity, coherence, and research-oriented formatting\n\n"
+                f"{PLAN_INSTRUCTIONS}"
+            )),
+            ("human", "Input text:\n{text}")
+        ])
     
-    def run(self) -> str:
-        workflow = (
-            RunnablePassthrough.assign(
-                llm_output=self.prompt | self.llm
+    def build_chain(self, llm: Optional[Runnable] = None) -> Runnable:
+        """
+        Build the prompt/LLM chain of the workflow.
+
+        Args:
+            llm (Optional[Runnable]): Replacement for the workflow's LLM step,
+                                      e.g. one wrapped with retries
+
+        Returns:
+            Runnable: Maps {"text": ...} to the input plus "llm_output"
+        """
+        prompt = self.prompt
+        if self.retrieval:
+            prompt = RunnableLambda(self._select_context) | prompt
+        return RunnablePassthrough.assign(
+            llm_output=prompt | (llm or self.llm)
+        )
+
+    def postprocess(self, result: dict) -> str:
+        """Turn the chain result into the workflow output by running tools."""
+        return self._run_tools(result['llm_output'].content)[0]
+
+    async def apostprocess(self, result: dict) -> str:
+        """Async variant of postprocess()."""
+        return (await self._arun_tools(result['llm_output'].content))[0]
+
+    def run(self, run_id: Optional[str] = None, state: Optional[StateStore] = None) -> str:
+        """
+        Run the workflow.
+
+        Args:
+            run_id (Optional[str]): Checkpoint each step under this id. A rerun
+                                    with the same id reuses every step whose
+                                    inputs are unchanged.
+            state (Optional[StateStore]): Checkpoint store, defaults to the
+                                          shared one
+
+        Returns:
+            str: Workflow output
+        """
+        with tracing.span('workflow.run', workflow='generic', run_id=run_id):
+            if run_id is None:
+                result = invoke_chain(self.build_chain(), self.input_text, self.llm)
+                with tracing.span('workflow.tools'):
+                    return self.postprocess(result)
+
+            state = state or get_state_store()
+            llm_output = state.step(
+                run_id, 'llm', self._llm_step_inputs(),
+                lambda: invoke_chain(self.build_chain(), self.input_text, self.llm)['llm_output'].content
             )
+            with tracing.span('workflow.tools'):
+                # Not checkpointed if a tool call failed, so a rerun retries it
+                return state.step(
+                    run_id, 'tools', [llm_output, self.step_token_budget],
+                    lambda: checkpoint_if(*self._run_tools(llm_output, self._tool_factories(state, run_id)))
+                )
+
+    async def arun(self, run_id: Optional[str] = None, state: Optional[StateStore] = None) -> str:
+        """
+        Async variant of run().
+
+        The LLM is called with ainvoke and the tool calls run as tasks on
+        the event loop, so a run does not hold a thread while it waits.
+        """
+        with tracing.span('workflow.run', workflow='generic', run_id=run_id):
+            if run_id is None:
+                result = await ainvoke_chain(self.build_chain(), self.input_text, self.llm)
+                with tracing.span('workflow.tools'):
+                    return await self.apostprocess(result)
+
+            state = state or get_state_store()
+
+            async def invoke_llm():
+                return (await ainvoke_chain(self.build_chain(), self.input_text, self.llm))['llm_output'].content
+
+            llm_output = await state.astep(run_id, 'llm', self._llm_step_inputs(), invoke_llm)
+
+            async def run_tools():
+                return checkpoint_if(*await self._arun_tools(llm_output, self._tool_factories(state, run_id)))
+
+            with tracing.span('workflow.tools'):
+                return await state.astep(run_id, 'tools', [llm_output, self.step_token_budget], run_tools)
+
+    def stream(self) -> Iterator[str]:
+        """
+        Run the workflow, yielding output as it becomes available.
+
+        LLM tokens are yielded as they arrive, except for the tool plan
+        block. The outputs of the requested tools follow, each as soon as
+        it finishes.
+
+        Yields:
+            str: Pieces of the response, then tool outputs
+        """
+        response = PlanBlockFilter()
+        for chunk in self.build_chain().stream({"text": self.input_text}):
+            if 'llm_output' in chunk:
+                text = response.feed(chunk['llm_output'].content)
+                if text:
+                    yield text
+        rest, text, plan = response.finish()
+        if rest:
+            yield rest
+        plan = self._complete_plan(text, plan)
+        if plan is not None:
+            for output in self._iter_tool_outputs(text, plan):
+                yield "\n\n" + output
+
+    async def astream(self) -> AsyncIterator[str]:
+        """
+        Async variant of stream().
+        """
+        response = PlanBlockFilter()
+        async for chunk in self.build_chain().astream({"text": self.input_text}):
+            if 'llm_output' in chunk:
+                text = response.feed(chunk['llm_output'].content)
+                if text:
+                    yield text
+        rest, text, plan = response.finish()
+        if rest:
+            yield rest
+        plan = self._complete_plan(text, plan)
+        if plan is not None:
+            async for output in self._aiter_tool_outputs(text, plan):
+                yield "\n\n" + output
+
+    def _iter_tool_outputs(self, text: str, plan: ToolPlan) -> Iterator[str]:
+        """Outputs of the plan's final tool calls, in completion order."""
+        sinks = {call.id for call in plan.sinks()}
+        for call, output in iter_plan_results(
+            plan, self._tool_factories(), text, self.max_concurrency, self.step_token_budget
+        ):
+            if call.id in sinks:
+                yield output
+
+    async def _aiter_tool_outputs(self, text: str, plan: ToolPlan) -> AsyncIterator[str]:
+        """Async variant of _iter_tool_outputs()."""
+        sinks = {call.id for call in plan.sinks()}
+        async for call, output in aiter_plan_results(
+            plan, self._tool_factories(), text, self.max_concurrency, self.step_token_budget
+        ):
+            if call.id in sinks:
+                yield output
+
+    def _llm_step_inputs(self) -> List[Any]:
+        """Everything the LLM step's output depends on, for checkpoints."""
+        return [
+            self.prompt.pretty_repr(), self.input_text, llm_identity(self.llm),
+            self.retrieval, self.query, self.top_k, self.token_budget
+        ]
+
+    def _select_context(self, inputs: dict) -> dict:
+        """Replace the input text with its most relevant chunks."""
+        with tracing.span('workflow.select_context') as span:
+            text = select_context(inputs['text'], self.query, self.top_k, self.token_budget)
+            span.set(output_bytes=len(text.encode('utf-8')))
+        return {**inputs, 'text': text}
+
+    def _tool_factories(
+        self,
+        state: Optional[StateStore] = None,
+        run_id: Optional[str] = None
+    ) -> Dict[str, Callable[[], Any]]:
+        """Factories of the registry's tools by id, checkpointing each call when state is given."""
+        tools = self.registry.factories()
+        if state is None:
+            return tools
+        return {
+            tool_id: partial(CheckpointedTool, factory, state, run_id, tool_id)
+            for tool_id, factory in tools.items()
+        }
+
+    def _complete_plan(self, text: str, plan: Optional[ToolPlan]) -> Optional[ToolPlan]:
+        """
+        The plan to execute for an LLM response.
+
+        Responses without a structured plan fall back to chaining the tools
+        they mention by name.
+
+        Args:
+            text (str): Response text without the plan block
+            plan (Optional[ToolPlan]): The response's plan, if any
+
+        Returns:
+            Optional[ToolPlan]: The plan, or None if there are no valid calls
+        """
+        if plan is None:
+            plan = plan_from_mentions(text, [tool_config['id'] for tool_config in AVAILABLE_TOOLS])
+        if not plan.tool_calls:
+            return None
+        try:
+            plan.validate_graph()
+        except ValueError as e:
+            print(f"Invalid tool plan: {e}")
+            return None
+        return plan
+
+    def _run_tools(
+        self,
+        output: str,
+        tools: Optional[Dict[str, Callable[[], Any]]] = None
+    ) -> Tuple[str, bool]:
+        """
+        Run the tool calls requested in the LLM output.
+
+        A structured plan is executed as a dependency graph with independent
+        calls in parallel.
+
+        Args:
+            output (str): LLM response
+            tools (Optional[Dict[str, Callable[[], Any]]]): Tool factories by
+                                                            id, defaults to
+                                                            the registry's
+
+        Returns:
+            Tuple[str, bool]: The workflow output, and whether every tool
+                              call succeeded
+        """
+        text, plan = parse_plan(output)
+        plan = self._complete_plan(text, plan)
+        if plan is None:
+            return text, True
+        results = execute_plan(
+            plan, tools or self._tool_factories(), text, self.max_concurrency, self.step_token_budget
         )
-        
-        result = workflow.invoke({
-            "text": self.input_text
-        })
-        
-        output = result['llm_output'].content
-        
-        for tool_config in AVAILABLE_TOOLS:
-            tool_name = tool_config['id']
-            if tool_name in output.lower():
-                try:
-                    tool = tool_config['tool']()
-                    output = tool.run(output)
-                except Exception as e:
-                    print(f"Tool {tool_name} failed: {e}")
-        return output
+        return plan_output(text, plan, results), _plan_succeeded(results)
+
+    async def _arun_tools(
+        self,
+        output: str,
+        tools: Optional[Dict[str, Callable[[], Any]]] = None
+    ) -> Tuple[str, bool]:
+        """Async variant of _run_tools()."""
+        text, plan = parse_plan(output)
+        plan = self._complete_plan(text, plan)
+        if plan is None:
+            return text, True
+        results = await aexecute_plan(
+            plan, tools or self._tool_factories(), text, self.max_concurrency, self.step_token_budget
+        )
+        return plan_output(text, plan, results), _plan_succeeded(results)
+
+def _plan_succeeded(results: PlanResults) -> bool:
+    """Whether no call of an executed plan failed, was skipped or returned an error."""
+    return not results.failed and not any(is_tool_error(output) for output in results.values())
 
 def create_workflow(
     input_text: str, 
     llm: str = 'openai',
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    cache: Optional[BaseCache] = None,
+    retrieval: bool = False,
+    query: Optional[str] = None,
+    top_k: int = DEFAULT_TOP_K,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    registry: Optional[ToolRegistry] = None,
+    step_token_budget: Optional[int] = DEFAULT_STEP_TOKEN_BUDGET
 ):
-    return GenericWorkflow(input_text, llm)
\ No newline at end of file
+    return GenericWorkflow(
+        input_text, llm, max_concurrency, cache,
+        retrieval=retrieval, query=query, top_k=top_k, token_budget=token_budget,
+        registry=registry, step_token_budget=step_token_budget
+    )
\ No newline at end of file
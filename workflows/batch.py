@@ -0,0 +1,219 @@
+"""
+Batch execution of workflows over many inputs.
+"""
+import json
+import os
+import threading
+from itertools import islice
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from pydantic import BaseModel, Field
+from langchain_core.rate_limiters import InMemoryRateLimiter
+from langchain_core.runnables import Runnable, RunnableLambda
+
+# Defaults for batch runs
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 3
+# First retry delay in seconds; later retries back off exponentially
+DEFAULT_RETRY_DELAY = 1.0
+# Inputs handed to LangChain at a time; bounds memory for very large runs
+DEFAULT_WINDOW_SIZE = 256
+
+# Rate limiters shared by every batch run against the same LLM provider and rate
+_rate_limiters: Dict[Tuple[str, float], InMemoryRateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+InputItem = Union[str, Tuple[Any, str]]
+
+def get_rate_limiter(provider: str, requests_per_second: float) -> InMemoryRateLimiter:
+    """
+    Return the process-wide rate limiter for an LLM provider and rate.
+
+    Args:
+        provider (str): Provider name, e.g. the LLM's _llm_type
+        requests_per_second (float): Allowed request rate
+
+    Returns:
+        InMemoryRateLimiter: Limiter shared by all runs against the provider
+                             at this rate
+    """
+    key = (provider, float(requests_per_second))
+    with _rate_limiters_lock:
+        if key not in _rate_limiters:
+            _rate_limiters[key] = InMemoryRateLimiter(
+                requests_per_second=requests_per_second,
+                max_bucket_size=max(1, requests_per_second)
+            )
+        return _rate_limiters[key]
+
+class BatchResult(BaseModel):
+    id: Union[int, str] = Field(description="Id of the input item")
+    output: Optional[str] = Field(description="Workflow output, if the item succeeded", default=None)
+    error: Optional[str] = Field(description="Error raised for the item, if any", default=None)
+
+class BatchRunner:
+    """
+    Run a workflow over many inputs with bounded concurrency.
+
+    LLM calls go through LangChain's batch_as_completed/abatch_as_completed
+    with max_concurrency, a per-provider rate limiter, and retries with
+    exponential backoff. Results are yielded as soon as each item finishes
+    and appended to an optional JSONL checkpoint; items already completed
+    in the checkpoint are skipped when the run is resumed.
+    """
+
+    def __init__(
+        self,
+        workflow_factory: Callable[[str], Any],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        requests_per_second: Optional[float] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        checkpoint_path: Optional[str] = None,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        retry_delay: float = DEFAULT_RETRY_DELAY
+    ):
+        """
+        Initialize the batch runner.
+
+        Args:
+            workflow_factory (Callable[[str], Any]): Workflow constructor such
+                                                     as create_workflow
+            max_concurrency (int): Maximum number of items in flight
+            requests_per_second (Optional[float]): LLM request rate limit for
+                                                   the workflow's provider
+            max_retries (int): Retries per item after the first failure
+            checkpoint_path (Optional[str]): JSONL file recording finished items
+            window_size (int): Inputs submitted to LangChain at a time
+            retry_delay (float): Initial retry backoff in seconds
+        """
+        self.workflow = workflow_factory("")
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.window_size = max(window_size, max_concurrency)
+        self.rate_limiter = None
+        if requests_per_second:
+            provider = getattr(self.workflow.llm, '_llm_type', type(self.workflow.llm).__name__)
+            self.rate_limiter = get_rate_limiter(provider, requests_per_second)
+        self.chain = self._build_chain()
+
+    def _build_chain(self) -> Runnable:
+        llm: Runnable = self.workflow.llm
+        if self.rate_limiter is not None:
+            limiter = self.rate_limiter
+
+            def acquire(value):
+                limiter.acquire()
+                return value
+
+            async def aacquire(value):
+                await limiter.aacquire()
+                return value
+
+            llm = RunnableLambda(acquire, afunc=aacquire) | llm
+        if self.max_retries:
+            llm = llm.with_retry(
+                stop_after_attempt=self.max_retries + 1,
+                wait_exponential_jitter=True,
+                exponential_jitter_params={'initial': self.retry_delay, 'jitter': self.retry_delay}
+            )
+        postprocess = RunnableLambda(
+            self.workflow.postprocess, afunc=getattr(self.workflow, 'apostprocess', None)
+        )
+        return self.workflow.build_chain(llm) | postprocess
+
+    def run(self, inputs: Iterable[InputItem]) -> Iterator[BatchResult]:
+        """
+        Run the workflow over inputs, yielding results as they complete.
+
+        Args:
+            inputs (Iterable[InputItem]): Input texts, or (id, text) pairs.
+                                          Plain texts are identified by their
+                                          position.
+
+        Yields:
+            BatchResult: One result per item not already in the checkpoint
+        """
+        done = self._load_checkpoint()
+        with self._open_checkpoint() as checkpoint:
+            for window in self._windows(inputs, done):
+                ids = [item_id for item_id, _ in window]
+                for index, output in self.chain.batch_as_completed(
+                    [{"text": text} for _, text in window],
+                    config={'max_concurrency': self.max_concurrency},
+                    return_exceptions=True
+                ):
+                    result = self._to_result(ids[index], output)
+                    self._record(checkpoint, result)
+                    yield result
+
+    async def arun(self, inputs: Iterable[InputItem]) -> AsyncIterator[BatchResult]:
+        """
+        Async variant of run(), built on abatch_as_completed.
+        """
+        done = self._load_checkpoint()
+        with self._open_checkpoint() as checkpoint:
+            for window in self._windows(inputs, done):
+                ids = [item_id for item_id, _ in window]
+                async for index, output in self.chain.abatch_as_completed(
+                    [{"text": text} for _, text in window],
+                    config={'max_concurrency': self.max_concurrency},
+                    return_exceptions=True
+                ):
+                    result = self._to_result(ids[index], output)
+                    self._record(checkpoint, result)
+                    yield result
+
+    def _windows(self, inputs: Iterable[InputItem], done: Set) -> Iterator[List[Tuple[Any, str]]]:
+        items = (
+            item if isinstance(item, tuple) else (position, item)
+            for position, item in enumerate(inputs)
+        )
+        pending = (item for item in items if item[0] not in done)
+        while True:
+            window = list(islice(pending, self.window_size))
+            if not window:
+                return
+            yield window
+
+    def _to_result(self, item_id, output) -> BatchResult:
+        if isinstance(output, Exception):
+            return BatchResult(id=item_id, error=f"{type(output).__name__}: {output}")
+        return BatchResult(id=item_id, output=output)
+
+    def _load_checkpoint(self) -> Set:
+        """Ids of the items that already completed successfully."""
+        done = set()
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return done
+        with open(self.checkpoint_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Partial line from an interrupted run
+                    continue
+                if record.get('error') is None:
+                    done.add(record['id'])
+        return done
+
+    def _open_checkpoint(self):
+        if self.checkpoint_path is None:
+            return open(os.devnull, 'a', encoding='utf-8')
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        return open(self.checkpoint_path, 'a', encoding='utf-8')
+
+    def _record(self, checkpoint, result: BatchResult) -> None:
+        checkpoint.write(result.model_dump_json() + '\n')
+        checkpoint.flush()
+
+def run_batch(
+    workflow_factory: Callable[[str], Any],
+    inputs: Iterable[InputItem],
+    **options
+) -> Iterator[BatchResult]:
+    """
+    Shortcut for BatchRunner(workflow_factory, **options).run(inputs).
+    """
+    return BatchRunner(workflow_factory, **options).run(inputs)
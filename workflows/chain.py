@@ -0,0 +1,33 @@
+"""
+LLM step shared by the workflows.
+"""
+from typing import Any
+
+from langchain_core.runnables import Runnable
+
+import tracing
+from state import llm_identity
+
+def invoke_chain(chain: Runnable, input_text: str, llm: Any) -> dict:
+    """
+    Invoke a workflow's prompt/LLM chain in a span and count the tokens used.
+
+    Args:
+        chain (Runnable): The workflow's build_chain()
+        input_text (str): Workflow input
+        llm (Any): The chain's LLM client, for the usage metrics
+
+    Returns:
+        dict: The chain result, with the response as "llm_output"
+    """
+    with tracing.span('workflow.llm', input_bytes=len(input_text.encode('utf-8'))):
+        result = chain.invoke({"text": input_text})
+    tracing.record_llm_usage(result['llm_output'], llm_identity(llm)['model'])
+    return result
+
+async def ainvoke_chain(chain: Runnable, input_text: str, llm: Any) -> dict:
+    """Async variant of invoke_chain()."""
+    with tracing.span('workflow.llm', input_bytes=len(input_text.encode('utf-8'))):
+        result = await chain.ainvoke({"text": input_text})
+    tracing.record_llm_usage(result['llm_output'], llm_identity(llm)['model'])
+    return result
@@ -0,0 +1,519 @@
+"""
+Structured tool planning and parallel execution for workflows.
+"""
+import asyncio
+import contextvars
+import json
+import re
+import time
+from contextlib import aclosing, contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from pydantic import BaseModel, Field, ValidationError
+
+import tracing
+from utils import compact_text, count_tokens
+
+# Maximum number of tool calls running at the same time
+DEFAULT_MAX_CONCURRENCY = 4
+
+# Tokens of a tool output passed on to the next call
+DEFAULT_STEP_TOKEN_BUDGET = 2000
+
+# Reference to the LLM response text in ToolCall.input_from
+RESPONSE_REF = 'response'
+
+PLAN_BLOCK_PATTERN = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+PLAN_INSTRUCTIONS = (
+    "If tools should post-process your answer, end your response with a JSON block "
+    "listing the tool calls, for example:\n"
+    "```json\n"
+    '{{"tool_calls": [\n'
+    '  {{"id": "search", "tool": "web_search", "input": "query to search"}},\n'
+    '  {{"id": "format", "tool": "text_to_markdown", "input_from": "search"}}\n'
+    "]}}\n"
+    "```\n"
+    "Each call takes either a literal \"input\" or \"input_from\": the id of an earlier "
+    "call, or \"response\" for your answer text. Calls that do not depend on each other "
+    "run in parallel; add \"depends_on\": [ids] to order calls explicitly."
+)
+
+class ToolCall(BaseModel):
+    id: str = Field(description="Unique id of the call within the plan")
+    tool: str = Field(description="Id of the tool to invoke")
+    input: Optional[Union[str, Dict[str, Any]]] = Field(description="Literal tool input", default=None)
+    input_from: Optional[str] = Field(
+        description="Id of the call whose output is the input, or 'response'",
+        default=None
+    )
+    depends_on: List[str] = Field(description="Calls that must finish first", default_factory=list)
+
+    def dependencies(self) -> List[str]:
+        deps = list(self.depends_on)
+        if self.input_from and self.input_from != RESPONSE_REF and self.input_from not in deps:
+            deps.append(self.input_from)
+        return deps
+
+class ToolPlan(BaseModel):
+    tool_calls: List[ToolCall] = Field(default_factory=list)
+
+    def sinks(self) -> List[ToolCall]:
+        """Calls whose output no other call consumes."""
+        used = {dep for call in self.tool_calls for dep in call.dependencies()}
+        return [call for call in self.tool_calls if call.id not in used]
+
+    def validate_graph(self) -> None:
+        """
+        Check ids are unique, references resolve and there are no cycles.
+
+        Raises:
+            ValueError: If the plan is not a valid DAG
+        """
+        ids = [call.id for call in self.tool_calls]
+        if len(ids) != len(set(ids)):
+            raise ValueError("Duplicate tool call ids in plan")
+        known = set(ids)
+        for call in self.tool_calls:
+            for dep in call.dependencies():
+                if dep not in known:
+                    raise ValueError(f"Tool call {call.id} depends on unknown call {dep}")
+
+        # Kahn's algorithm: every call must eventually become ready
+        remaining = {call.id: set(call.dependencies()) for call in self.tool_calls}
+        while remaining:
+            ready = [call_id for call_id, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Cycle between tool calls: {sorted(remaining)}")
+            for call_id in ready:
+                del remaining[call_id]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+def parse_plan(output: str) -> Tuple[str, Optional[ToolPlan]]:
+    """
+    Extract a tool plan from an LLM response.
+
+    Args:
+        output (str): Raw LLM response
+
+    Returns:
+        Tuple[str, Optional[ToolPlan]]: The response with the plan block
+                                        removed, and the plan if one was found
+    """
+    for match in PLAN_BLOCK_PATTERN.finditer(output):
+        try:
+            data = json.loads(match.group(1))
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(data, dict) or 'tool_calls' not in data:
+            continue
+        try:
+            plan = ToolPlan.model_validate(data)
+        except ValidationError:
+            continue
+        text = (output[:match.start()] + output[match.end():]).strip()
+        return text, plan
+    return output, None
+
+class PlanBlockFilter:
+    """
+    Pass a streamed LLM response through while holding back its tool plan.
+
+    Text is released as it arrives, except from a code fence that may open
+    a JSON plan onwards; that part is held until the response is complete
+    and released by finish() if it turned out not to be a valid plan.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._emitted = 0
+        self._scan = 0
+        self._held = False
+
+    def feed(self, token: str) -> str:
+        """Add a streamed token and return the text that can be shown now."""
+        self.text += token
+        if self._held:
+            return ""
+        end = len(self.text)
+        while True:
+            fence = self.text.find("```", self._scan)
+            if fence == -1:
+                # Trailing backticks may be the start of a fence
+                end = max(len(self.text.rstrip("`")), self._emitted)
+                break
+            rest = self.text[fence + 3:]
+            if "json".startswith(rest):
+                end = fence
+                break
+            if rest.startswith("json"):
+                rest = rest[4:]
+            stripped = rest.lstrip()
+            if not stripped:
+                end = fence
+                break
+            if stripped[0] == "{":
+                end = fence
+                self._held = True
+                break
+            # An ordinary code block; keep streaming after its fence
+            self._scan = fence + 3
+        end = max(end, self._emitted)
+        released = self.text[self._emitted:end]
+        self._emitted = end
+        return released
+
+    def finish(self) -> Tuple[str, str, Optional[ToolPlan]]:
+        """
+        Complete the response.
+
+        Returns:
+            Tuple[str, str, Optional[ToolPlan]]: Text not yet released, the
+                                                 full response without the
+                                                 plan, and the plan if any
+        """
+        text, plan = parse_plan(self.text)
+        emitted = self.text[:self._emitted]
+        rest = text[len(emitted):] if text.startswith(emitted) else ""
+        return rest, text, plan
+
+def plan_from_mentions(output: str, tool_ids: Iterable[str]) -> ToolPlan:
+    """
+    Build a plan for a response that names tools instead of returning a plan.
+
+    Mentioned tools are chained in registry order, each one consuming the
+    previous output, which matches how the workflows used to dispatch tools.
+    """
+    calls = []
+    previous = RESPONSE_REF
+    for tool_id in tool_ids:
+        if tool_id in output.lower():
+            calls.append(ToolCall(id=tool_id, tool=tool_id, input_from=previous))
+            previous = tool_id
+    return ToolPlan(tool_calls=calls)
+
+class _PlanRun:
+    """
+    Dependency bookkeeping of one plan execution, shared by the thread
+    pool and asyncio executors.
+    """
+
+    def __init__(self, plan: ToolPlan, response: str, token_budget: Optional[int]):
+        plan.validate_graph()
+        self.calls = {call.id: call for call in plan.tool_calls}
+        self.pending_deps = {call.id: set(call.dependencies()) for call in plan.tool_calls}
+        self.results: Dict[str, str] = {}
+        self.failed = set()
+        self.response = response
+        self.token_budget = token_budget
+
+    def complete(self, call_id: str, ok: bool, output: str) -> None:
+        if not ok:
+            self.failed.add(call_id)
+        self.results[call_id] = output
+        for deps in self.pending_deps.values():
+            deps.discard(call_id)
+
+    def ready(self) -> Tuple[List[ToolCall], List[ToolCall]]:
+        """
+        Take every call whose dependencies are done.
+
+        Returns:
+            Tuple[List[ToolCall], List[ToolCall]]: The calls to run, and the
+                calls skipped because a dependency failed
+        """
+        to_run = []
+        skipped = []
+        ready = [call_id for call_id, deps in self.pending_deps.items() if not deps]
+        while ready:
+            for call_id in ready:
+                del self.pending_deps[call_id]
+                call = self.calls[call_id]
+                failed_deps = [dep for dep in call.dependencies() if dep in self.failed]
+                if failed_deps:
+                    self.complete(call_id, False, f"Skipped: dependency {failed_deps[0]} failed")
+                    skipped.append(call)
+                    continue
+                to_run.append(call)
+            ready = [call_id for call_id, deps in self.pending_deps.items() if not deps]
+        return to_run, skipped
+
+    def input_for(self, call: ToolCall) -> Any:
+        """Input of a ready call, compacted if it is a large output."""
+        return _resolve_input(call, self.results, self.response, self.token_budget)
+
+    def may_compact(self, call: ToolCall) -> bool:
+        """Whether input_for() may have to count and compact tokens."""
+        return self.token_budget is not None and call.input_from not in (None, RESPONSE_REF)
+
+class PlanResults(dict):
+    """
+    Outputs of a plan's tool calls by call id.
+
+    Attributes:
+        failed (Set[str]): Ids of the calls that failed or were skipped
+    """
+
+    def __init__(self, outputs: Dict[str, str], failed: Iterable[str] = ()):
+        super().__init__(outputs)
+        self.failed: Set[str] = set(failed)
+
+def iter_plan_results(
+    plan: ToolPlan,
+    tools: Dict[str, Callable[[], Any]],
+    response: str,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    token_budget: Optional[int] = None
+) -> Iterator[Tuple[ToolCall, str]]:
+    """
+    Run a plan's tool calls as a DAG, yielding results as calls finish.
+
+    Calls run on a thread pool as soon as their dependencies are done, so
+    independent calls overlap. A failing call yields an error message and
+    the calls depending on it are skipped.
+
+    Args:
+        plan (ToolPlan): Plan to execute
+        tools (Dict[str, Callable[[], Any]]): Tool factories by tool id
+        response (str): LLM response text, referenced as 'response'
+        max_concurrency (int): Maximum number of concurrent tool calls
+        token_budget (Optional[int]): Compact outputs over this many tokens
+                                      before they become another call's
+                                      input; None passes them on whole
+
+    Yields:
+        Tuple[ToolCall, str]: Each call with its output, in completion order
+    """
+    plan_run = _PlanRun(plan, response, token_budget)
+    for call_id in _run_plan(plan_run, tools, max_concurrency):
+        yield plan_run.calls[call_id], plan_run.results[call_id]
+
+async def aiter_plan_results(
+    plan: ToolPlan,
+    tools: Dict[str, Callable[[], Any]],
+    response: str,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    token_budget: Optional[int] = None
+) -> AsyncIterator[Tuple[ToolCall, str]]:
+    """
+    Async variant of iter_plan_results().
+
+    Calls run as tasks on the event loop through the tools' arun(), with a
+    semaphore bounding how many run at once, so waiting on a tool does not
+    hold a thread. Tools without arun() run on a worker thread.
+    """
+    plan_run = _PlanRun(plan, response, token_budget)
+    # Closing this iterator early closes the plan run, cancelling its calls
+    async with aclosing(_arun_plan(plan_run, tools, max_concurrency)) as call_ids:
+        async for call_id in call_ids:
+            yield plan_run.calls[call_id], plan_run.results[call_id]
+
+def execute_plan(
+    plan: ToolPlan,
+    tools: Dict[str, Callable[[], Any]],
+    response: str,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    token_budget: Optional[int] = None
+) -> PlanResults:
+    """
+    Run a plan to completion and return every call's output by call id.
+    """
+    plan_run = _PlanRun(plan, response, token_budget)
+    for _ in _run_plan(plan_run, tools, max_concurrency):
+        pass
+    return PlanResults(plan_run.results, plan_run.failed)
+
+async def aexecute_plan(
+    plan: ToolPlan,
+    tools: Dict[str, Callable[[], Any]],
+    response: str,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    token_budget: Optional[int] = None
+) -> PlanResults:
+    """
+    Async variant of execute_plan().
+    """
+    plan_run = _PlanRun(plan, response, token_budget)
+    async for _ in _arun_plan(plan_run, tools, max_concurrency):
+        pass
+    return PlanResults(plan_run.results, plan_run.failed)
+
+def plan_output(response: str, plan: ToolPlan, results: PlanResults) -> str:
+    """
+    Combine the outputs of a plan's final calls into the workflow output.
+
+    If a final call failed or was skipped, the response is kept in front of
+    the outputs, so a failing tool reports its error next to the answer
+    instead of replacing it.
+    """
+    sinks = plan.sinks()
+    outputs = [results[call.id] for call in sinks]
+    if any(call.id in results.failed for call in sinks):
+        outputs.insert(0, response)
+    return "\n\n".join(outputs)
+
+def _run_plan(plan_run: _PlanRun, tools: Dict[str, Callable[[], Any]], max_concurrency: int) -> Iterator[str]:
+    """Execute a plan on a thread pool, yielding call ids as calls finish."""
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        running = {}
+
+        def schedule_ready() -> List[ToolCall]:
+            """Submit every ready call; return the calls skipped on the way."""
+            to_run, skipped = plan_run.ready()
+            for call in to_run:
+                # Run in a copy of the caller's context so tool spans nest under its span
+                context = contextvars.copy_context()
+                future = executor.submit(context.run, _invoke_tool, tools, call, plan_run.input_for(call))
+                running[future] = call.id
+            return skipped
+
+        for call in schedule_ready():
+            yield call.id
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                call_id = running.pop(future)
+                ok, output = future.result()
+                plan_run.complete(call_id, ok, output)
+                yield call_id
+                for call in schedule_ready():
+                    yield call.id
+
+async def _arun_plan(
+    plan_run: _PlanRun,
+    tools: Dict[str, Callable[[], Any]],
+    max_concurrency: int
+) -> AsyncIterator[str]:
+    """Execute a plan as asyncio tasks, yielding call ids as calls finish."""
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    running: Dict[asyncio.Future, str] = {}
+
+    async def invoke(call: ToolCall) -> Tuple[bool, str]:
+        async with semaphore:
+            if plan_run.may_compact(call):
+                # Counting and compacting tokens would block the event loop
+                tool_input = await asyncio.to_thread(plan_run.input_for, call)
+            else:
+                tool_input = plan_run.input_for(call)
+            return await _ainvoke_tool(tools, call, tool_input)
+
+    def schedule_ready() -> List[ToolCall]:
+        to_run, skipped = plan_run.ready()
+        for call in to_run:
+            # Tasks run in a copy of the current context, so tool spans nest
+            running[asyncio.ensure_future(invoke(call))] = call.id
+        return skipped
+
+    try:
+        for call in schedule_ready():
+            yield call.id
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                call_id = running.pop(task)
+                ok, output = task.result()
+                plan_run.complete(call_id, ok, output)
+                yield call_id
+                for call in schedule_ready():
+                    yield call.id
+    finally:
+        # The consumer stopped early or was cancelled: stop the calls still
+        # running and wait until they have unwound
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+def _resolve_input(call: ToolCall, results: Dict[str, str], response: str, token_budget: Optional[int] = None):
+    if call.input_from == RESPONSE_REF:
+        return response
+    if call.input_from:
+        output = results[call.input_from]
+        if token_budget is None:
+            return output
+        tokens = count_tokens(output)
+        if tokens <= token_budget:
+            return output
+        # Keep what the response, which requested the calls, is about
+        with tracing.span('tool.compact', call=call.id, input_tokens=tokens) as span:
+            output = compact_text(output, token_budget, query=response)
+            if tracing.enabled():
+                span.set(output_tokens=count_tokens(output))
+        return output
+    return call.input if call.input is not None else response
+
+def _invoke_tool(tools: Dict[str, Callable[[], Any]], call: ToolCall, tool_input) -> Tuple[bool, str]:
+    factory = tools.get(call.tool)
+    if factory is None:
+        return False, f"Unknown tool: {call.tool}"
+    with track_tool_call(call.tool, tool_input, call=call.id) as record:
+        record.output = str(factory().run(tool_input))
+    return record.ok, record.output
+
+async def _ainvoke_tool(tools: Dict[str, Callable[[], Any]], call: ToolCall, tool_input) -> Tuple[bool, str]:
+    factory = tools.get(call.tool)
+    if factory is None:
+        return False, f"Unknown tool: {call.tool}"
+    with track_tool_call(call.tool, tool_input, call=call.id) as record:
+        # Building a tool may be slow, e.g. starting a sandbox
+        tool = await asyncio.to_thread(factory)
+        if hasattr(tool, 'arun'):
+            record.output = str(await tool.arun(tool_input))
+        else:
+            record.output = str(await asyncio.to_thread(tool.run, tool_input))
+    return record.ok, record.output
+
+class ToolCallRecord:
+    """
+    Outcome of a tool call run in track_tool_call().
+
+    Attributes:
+        ok (bool): Whether the call completed without raising
+        output (str): The tool output, or an error message if it raised
+    """
+    __slots__ = ('ok', 'output')
+
+    def __init__(self):
+        self.ok = False
+        self.output = ""
+
+@contextmanager
+def track_tool_call(tool_id: str, tool_input: Any, **attributes: Any) -> Iterator[ToolCallRecord]:
+    """
+    Run a tool call in a 'tool.call' span and record its metrics.
+
+    The block sets the output on the yielded record. An exception raised in
+    it is not propagated: it is reported and counted as a failed call, and
+    the record's output becomes the error message.
+
+    Args:
+        tool_id (str): Id of the tool
+        tool_input (Any): Input of the call, for the byte metrics
+        **attributes: Further span attributes, e.g. the plan's call id
+
+    Yields:
+        ToolCallRecord: Record whose output the block sets
+    """
+    record = ToolCallRecord()
+    with tracing.span('tool.call', tool=tool_id, **attributes) as span:
+        started = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            print(f"Tool {tool_id} failed: {e}")
+            tracing.incr('tool_calls_total', tool=tool_id, status='error')
+            span.set(error=str(e))
+            record.output = f"Tool {tool_id} failed: {e}"
+            return
+        record.ok = True
+        record_tool_call(tool_id, tool_input, record.output, time.perf_counter() - started)
+        span.set(output_bytes=len(record.output))
+
+def record_tool_call(tool_id: str, tool_input: Any, output: str, seconds: float) -> None:
+    """Update the call, latency and byte metrics of a successful tool call."""
+    if not tracing.enabled():
+        return
+    tracing.incr('tool_calls_total', tool=tool_id, status='ok')
+    tracing.observe('tool_call_seconds', seconds, tool=tool_id)
+    tracing.incr('tool_bytes_total', len(str(tool_input).encode('utf-8')), tool=tool_id, direction='in')
+    tracing.incr('tool_bytes_total', len(output.encode('utf-8')), tool=tool_id, direction='out')
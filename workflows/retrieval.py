@@ -0,0 +1,161 @@
+"""
+Lexical retrieval over large workflow inputs.
+"""
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from utils import count_tokens
+
+# Chunking and selection defaults, in tokens
+DEFAULT_CHUNK_TOKENS = 256
+DEFAULT_CHUNK_OVERLAP = 32
+DEFAULT_TOP_K = 8
+DEFAULT_TOKEN_BUDGET = 2000
+# Okapi BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+CHUNK_SEPARATOR = "\n\n[...]\n\n"
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens used for indexing and queries."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+class BM25Index:
+    """
+    Okapi BM25 over an inverted index of text chunks.
+
+    Each term maps to the chunks containing it and its frequency in each,
+    so a query only touches the postings of its own terms.
+    """
+
+    def __init__(self, chunks: Sequence[str], k1: float = BM25_K1, b: float = BM25_B):
+        """
+        Build the index.
+
+        Args:
+            chunks (Sequence[str]): Texts to index
+            k1 (float): Term frequency saturation
+            b (float): Length normalization strength
+        """
+        self.chunks = list(chunks)
+        self.k1 = k1
+        self.b = b
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        lengths = np.zeros(len(self.chunks), dtype=np.float32)
+        for chunk_id, chunk in enumerate(self.chunks):
+            terms = Counter(tokenize(chunk))
+            lengths[chunk_id] = sum(terms.values())
+            for term, frequency in terms.items():
+                chunk_ids, frequencies = postings.setdefault(term, ([], []))
+                chunk_ids.append(chunk_id)
+                frequencies.append(frequency)
+
+        self._postings = {
+            term: (np.asarray(chunk_ids), np.asarray(frequencies, dtype=np.float32))
+            for term, (chunk_ids, frequencies) in postings.items()
+        }
+        average = lengths.mean() if len(lengths) and lengths.mean() > 0 else 1.0
+        self._length_norm = k1 * (1 - b + b * lengths / average)
+
+    def idf(self, term: str) -> float:
+        n = len(self.chunks)
+        df = len(self._postings[term][0]) if term in self._postings else 0
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, k: int = DEFAULT_TOP_K) -> List[Tuple[int, float]]:
+        """
+        Rank chunks against a query.
+
+        Returns:
+            List[Tuple[int, float]]: Up to k (chunk index, score) pairs with a
+                                     positive score, best first
+        """
+        scores = np.zeros(len(self.chunks), dtype=np.float32)
+        for term, count in Counter(tokenize(query)).items():
+            if term not in self._postings:
+                continue
+            chunk_ids, frequencies = self._postings[term]
+            weight = self.idf(term) * count
+            scores[chunk_ids] += weight * frequencies * (self.k1 + 1) / (frequencies + self._length_norm[chunk_ids])
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        ranked = sorted(candidates, key=lambda chunk_id: (-scores[chunk_id], chunk_id))
+        return [(int(chunk_id), float(scores[chunk_id])) for chunk_id in ranked]
+
+def split_text(
+    text: str,
+    chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+    chunk_overlap: int = DEFAULT_CHUNK_OVERLAP
+) -> List[str]:
+    """Split text into chunks of at most chunk_tokens tokens."""
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_tokens,
+        chunk_overlap=chunk_overlap,
+        length_function=count_tokens
+    )
+    return splitter.split_text(text)
+
+def select_context(
+    text: str,
+    query: Optional[str] = None,
+    top_k: int = DEFAULT_TOP_K,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    chunk_tokens: int = DEFAULT_CHUNK_TOKENS
+) -> str:
+    """
+    Reduce a large text to the chunks most relevant to a query.
+
+    Texts within the budget are returned unchanged. Otherwise the text is
+    chunked and indexed with BM25, and the best chunks are taken greedily
+    while they fit in the budget, up to top_k; chunks not matching the query
+    only fill leftover room. Selected chunks keep their original order.
+    Without a query, the first chunk, which usually carries the instruction,
+    is used as the query and always kept.
+
+    Args:
+        text (str): Input text
+        query (Optional[str]): What the context should be relevant to
+        top_k (int): Maximum number of chunks to keep
+        token_budget (int): Maximum tokens of context to keep
+        chunk_tokens (int): Chunk size in tokens
+
+    Returns:
+        str: The selected chunks joined with an elision marker
+    """
+    if count_tokens(text) <= token_budget:
+        return text
+    chunk_tokens = min(chunk_tokens, token_budget)
+    chunks = split_text(text, chunk_tokens, min(DEFAULT_CHUNK_OVERLAP, chunk_tokens // 4))
+    if not chunks:
+        return text
+
+    index = BM25Index(chunks)
+    ranked = [chunk_id for chunk_id, _ in index.search(query or chunks[0], len(chunks))]
+    if query is None:
+        ranked = [0] + [chunk_id for chunk_id in ranked if chunk_id != 0]
+    # Fill any remaining room with unmatched chunks in document order
+    matched = set(ranked)
+    ranked += [chunk_id for chunk_id in range(len(chunks)) if chunk_id not in matched]
+    separator_tokens = count_tokens(CHUNK_SEPARATOR)
+
+    selected = []
+    used = 0
+    for chunk_id in ranked:
+        if len(selected) >= top_k:
+            break
+        cost = count_tokens(chunks[chunk_id]) + (separator_tokens if selected else 0)
+        if used + cost > token_budget:
+            continue
+        selected.append(chunk_id)
+        used += cost
+    return CHUNK_SEPARATOR.join(chunks[chunk_id] for chunk_id in sorted(selected))
@@ -1,73 +1,217 @@
 """
 Workflow for performing web searches using available search tools.
 """
-from typing import Optional, List
+import asyncio
+from typing import AsyncIterator, Iterator, Optional, List, Tuple
+from langchain_core.caches import BaseCache
+from langchain_core.messages import AIMessage
 from langchain_core.tools import BaseTool
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough, RunnableParallel
+from langchain_core.runnables import Runnable, RunnablePassthrough, RunnableParallel
 
+import tracing
 from llm.openai import get_openai_llm
 import nodes
+from state import StateStore, checkpoint_if, get_state_store, llm_identity
+from workflows.chain import ainvoke_chain, invoke_chain
+from workflows.planner import ToolCallRecord, track_tool_call
+
+# The only tool this workflow runs, when the LLM response mentions it
+SEARCH_TOOL_ID = 'web_search'
 
 class WebSearchWorkflow:
     def __init__(
         self, 
         input_text: str, 
-        tools: Optional[List[BaseTool]] = None
+        tools: Optional[List[BaseTool]] = None,
+        cache: Optional[BaseCache] = None,
+        registry: Optional[nodes.ToolRegistry] = None
     ):
         self.llm = get_openai_llm()
+        if cache is not None:
+            # The LLM client is shared; give this workflow its own copy
+            self.llm = self.llm.model_copy(update={'cache': cache})
         
         self.input_text = input_text
+        # Tool instances are shared across runs and workflows
+        self.registry = registry or nodes.get_tool_registry()
         
-        self.tools = tools or [
-            tool_config['tool']() for tool_config in nodes.AVAILABLE_TOOLS 
-            if tool_config['id'] == 'web_search'
-        ]
+        self.tools = tools or [self.registry.get('web_search')]
         
         tools_description = "\n".join([
             f"- {tool_config['id']}: {tool_config['description']}" 
             for tool_config in nodes.AVAILABLE_TOOLS
         ])
         
-        self.prompt = ChatPromptTemplate.from_template(
-            "You are an AI research assistant tasked with gathering web information.\n\n"
-            f"Available tools:\n{tools_description}\n\n"
-            "Context: You need to find relevant web information based on the input query.\n\n"
-            "Guidelines:\n"
-            "1. Carefully analyze the input query\n"
-            "2. Determine if web search would be helpful\n"
-            "3. If web search is appropriate, explicitly mention 'web_search'\n"
-            "4. Provide context for why web search is needed\n\n"
-            "Input query:\n{text}"
-        )
+        # Fixed instructions go in the system message and only the input in
+        # the human message, which the LLM cache's semantic tier embeds
+        self.prompt = ChatPromptTemplate.from_messages([
+            ("system", (
+                "You are an AI research assistant tasked with gathering web information.\n\n"
+                f"Available tools:\n{tools_description}\n\n"
+                "Context: You need to find relevant web information based on the input query.\n\n"
+                "Guidelines:\n"
+                "1. Carefully analyze the input query\n"
+                "2. Determine if web search would be helpful\n"
+                "3. If web search is appropriate, explicitly mention 'web_search'\n"
+                "4. Provide context for why web search is needed"
+            )),
+            ("human", "Input query:\n{text}")
+        ])
     
-    def run(self) -> str:
-        workflow = (
-            RunnablePassthrough.assign(
-                llm_output=self.prompt | self.llm
-            )
+    def build_chain(self, llm: Optional[Runnable] = None) -> Runnable:
+        """
+        Build the prompt/LLM chain of the workflow.
+
+        Args:
+            llm (Optional[Runnable]): Replacement for the workflow's LLM step,
+                                      e.g. one wrapped with retries
+
+        Returns:
+            Runnable: Maps {"text": ...} to the input plus "llm_output"
+        """
+        return RunnablePassthrough.assign(
+            llm_output=self.prompt | (llm or self.llm)
         )
-        
-        result = workflow.invoke({
-            "text": self.input_text
-        })
-        
+
+    def postprocess(self, result: dict) -> str:
+        """Turn the chain result into the workflow output, searching if the response asks for it."""
+        return self._search(result)[0]
+
+    async def apostprocess(self, result: dict) -> str:
+        """Async variant of postprocess(). The search runs through the tool's arun()."""
+        return (await self._asearch(result))[0]
+
+    def _search(self, result: dict) -> Tuple[str, bool]:
+        """postprocess() that also returns whether no tool call failed."""
         output = result['llm_output'].content
-        
-        for tool_config in nodes.AVAILABLE_TOOLS:
-            tool_name = tool_config['id']
-            if tool_name in output.lower():
-                try:
-                    tool = tool_config['tool']()
-                    if tool_name == 'web_search':
-                        output = tool.run(self.input_text)
-                except Exception as e:
-                    print(f"Tool {tool_name} failed: {e}")
-        
-        return output
+        if SEARCH_TOOL_ID not in output.lower():
+            return output, True
+        with track_tool_call(SEARCH_TOOL_ID, result['text']) as record:
+            record.output = str(self._search_tool().run(result['text']))
+        return _search_output(output, record)
+
+    async def _asearch(self, result: dict) -> Tuple[str, bool]:
+        """Async variant of _search()."""
+        output = result['llm_output'].content
+        if SEARCH_TOOL_ID not in output.lower():
+            return output, True
+        with track_tool_call(SEARCH_TOOL_ID, result['text']) as record:
+            tool = await asyncio.to_thread(self._search_tool)
+            record.output = str(await tool.arun(result['text']))
+        return _search_output(output, record)
+
+    def _search_tool(self):
+        """The workflow's search tool, or the registry's."""
+        tools = {tool.name: tool for tool in self.tools}
+        return tools.get(SEARCH_TOOL_ID) or self.registry.get(SEARCH_TOOL_ID)
+
+    def run(self, run_id: Optional[str] = None, state: Optional[StateStore] = None) -> str:
+        """
+        Run the workflow.
+
+        Args:
+            run_id (Optional[str]): Checkpoint each step under this id. A rerun
+                                    with the same id reuses every step whose
+                                    inputs are unchanged.
+            state (Optional[StateStore]): Checkpoint store, defaults to the
+                                          shared one
+
+        Returns:
+            str: Workflow output
+        """
+        with tracing.span('workflow.run', workflow='web_search', run_id=run_id):
+            if run_id is None:
+                result = invoke_chain(self.build_chain(), self.input_text, self.llm)
+                with tracing.span('workflow.tools'):
+                    return self.postprocess(result)
+
+            state = state or get_state_store()
+            llm_output = state.step(
+                run_id, 'llm', [self.prompt.pretty_repr(), self.input_text, llm_identity(self.llm)],
+                lambda: invoke_chain(self.build_chain(), self.input_text, self.llm)['llm_output'].content
+            )
+            result = {"text": self.input_text, "llm_output": AIMessage(content=llm_output)}
+            with tracing.span('workflow.tools'):
+                # Not checkpointed if the search failed, so a rerun retries it
+                return state.step(
+                    run_id, 'tools', [self.input_text, llm_output],
+                    lambda: checkpoint_if(*self._search(result))
+                )
+
+    async def arun(self, run_id: Optional[str] = None, state: Optional[StateStore] = None) -> str:
+        """
+        Async variant of run(), calling the LLM with ainvoke and searching
+        through the tool's arun(), so a run does not hold a thread.
+        """
+        with tracing.span('workflow.run', workflow='web_search', run_id=run_id):
+            if run_id is None:
+                result = await ainvoke_chain(self.build_chain(), self.input_text, self.llm)
+                with tracing.span('workflow.tools'):
+                    return await self.apostprocess(result)
+
+            state = state or get_state_store()
+
+            async def invoke_llm():
+                return (await ainvoke_chain(self.build_chain(), self.input_text, self.llm))['llm_output'].content
+
+            llm_output = await state.astep(
+                run_id, 'llm', [self.prompt.pretty_repr(), self.input_text, llm_identity(self.llm)],
+                invoke_llm
+            )
+            result = {"text": self.input_text, "llm_output": AIMessage(content=llm_output)}
+
+            async def search():
+                return checkpoint_if(*await self._asearch(result))
+
+            with tracing.span('workflow.tools'):
+                return await state.astep(run_id, 'tools', [self.input_text, llm_output], search)
+
+    def stream(self) -> Iterator[str]:
+        """
+        Run the workflow, yielding LLM tokens as they arrive and then the
+        search result, if a search was requested.
+
+        Yields:
+            str: Pieces of the response, then the tool output
+        """
+        tokens = []
+        for chunk in self.build_chain().stream({"text": self.input_text}):
+            if 'llm_output' in chunk:
+                tokens.append(chunk['llm_output'].content)
+                yield tokens[-1]
+        response = "".join(tokens)
+        output = self.postprocess({"text": self.input_text, "llm_output": AIMessage(content=response)})
+        if output != response:
+            yield "\n\n" + output
+
+    async def astream(self) -> AsyncIterator[str]:
+        """
+        Async variant of stream().
+        """
+        tokens = []
+        async for chunk in self.build_chain().astream({"text": self.input_text}):
+            if 'llm_output' in chunk:
+                tokens.append(chunk['llm_output'].content)
+                yield tokens[-1]
+        response = "".join(tokens)
+        output = await self.apostprocess({"text": self.input_text, "llm_output": AIMessage(content=response)})
+        if output != response:
+            yield "\n\n" + output
+
+def _search_output(response: str, record: ToolCallRecord) -> Tuple[str, bool]:
+    """
+    The workflow output of a search, and whether it succeeded. A search
+    that raised leaves the LLM response as the output.
+    """
+    if not record.ok:
+        return response, False
+    return record.output, not nodes.is_tool_error(record.output)
 
 def create_workflow(
     input_text: str, 
-    tools: Optional[List[BaseTool]] = None
+    tools: Optional[List[BaseTool]] = None,
+    cache: Optional[BaseCache] = None,
+    registry: Optional[nodes.ToolRegistry] = None
 ):
-    return WebSearchWorkflow(input_text, tools) 
\ No newline at end of file
+    return WebSearchWorkflow(input_text, tools, cache, registry) 
\ No newline at end of file